@@ -0,0 +1,98 @@
+"""Benchmark objective analysis throughput before and after the compiled matcher.
+
+Run from the repository root:
+
+    python benchmarks/bench_matcher.py [--seconds 2]
+"""
+
+from typing import Any, Callable, Dict, List
+import argparse
+import re
+import time
+
+from learning_objectives_chatbot.utils import (
+    BLOOMS_TAXONOMY_VERBS,
+    analyze_objective,
+    get_sample_objectives,
+)
+
+
+def legacy_analyze_objective(objective: str) -> Dict[str, Any]:
+    """Reference copy of the per-verb regex implementation, for comparison."""
+    analysis: Dict[str, Any] = {
+        "blooms_level": "Unknown",
+        "measurable": False,
+        "clarity_score": 0,
+        "suggestions": [],
+    }
+
+    for level, verbs in BLOOMS_TAXONOMY_VERBS.items():
+        for verb in verbs:
+            pattern = r"\b" + re.escape(verb) + r"\b"
+            if re.search(pattern, objective.lower()):
+                analysis["blooms_level"] = level
+                break
+
+    all_verbs = [verb for verbs in BLOOMS_TAXONOMY_VERBS.values() for verb in verbs]
+    if any(
+        re.search(r"\b" + re.escape(verb) + r"\b", objective.lower())
+        for verb in all_verbs
+    ):
+        analysis["measurable"] = True
+
+    clarity = 5
+    if analysis["measurable"]:
+        clarity += 2
+    if len(objective.split()) >= 10:
+        clarity += 1
+    if "will be able to" in objective.lower():
+        clarity += 1
+    if any(c in objective.lower() for c in ["using", "through", "by", "with"]):
+        clarity += 1
+    if len(objective.split()) > 30:
+        clarity -= 1
+    if objective.count(",") > 2:
+        clarity -= 1
+    analysis["clarity_score"] = max(1, min(10, clarity))
+    return analysis
+
+
+def objectives_per_second(
+    func: Callable[[str], Any], objectives: List[str], seconds: float
+) -> float:
+    """Run func over the objectives repeatedly for roughly `seconds`."""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for objective in objectives:
+            func(objective)
+        count += len(objectives)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Print objectives/sec for the legacy and compiled implementations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    objectives = [
+        f"After completing this course, students will be able to {obj[0].lower()}{obj[1:]}"
+        for group in get_sample_objectives().values()
+        for obj in group
+    ]
+    objectives.append("Students will learn about the topic in general terms.")
+
+    for objective in objectives:
+        assert legacy_analyze_objective(objective) == analyze_objective(objective)
+
+    before = objectives_per_second(legacy_analyze_objective, objectives, args.seconds)
+    after = objectives_per_second(analyze_objective, objectives, args.seconds)
+    print(f"legacy per-verb regex : {before:12,.0f} objectives/sec")
+    print(f"compiled matcher      : {after:12,.0f} objectives/sec")
+    print(f"speedup               : {after / before:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
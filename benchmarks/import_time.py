@@ -0,0 +1,137 @@
+"""Import-time budget check for the modules that worker processes load.
+
+Run from the repository root:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --scale 2 -o import_times.json
+
+Each module is imported in a fresh interpreter with ``python -X importtime``,
+several times, and the fastest cumulative import time is compared with its
+budget. The check exits with status 1 if any module is over budget or pulls
+in one of the heavy dependencies that only optional features may load.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import argparse
+import json
+import subprocess
+import sys
+
+# Cumulative import time budgets in milliseconds. They leave headroom over
+# a typical developer machine; scale them with --scale on slow CI runners.
+BUDGETS_MS = {
+    "learning_objectives_chatbot.utils": 100.0,
+    "learning_objectives_chatbot.cache": 100.0,
+    "learning_objectives_chatbot.cli": 120.0,
+    # Sessions await the reply backend, so they load it and asyncio too
+    "learning_objectives_chatbot.sessions": 150.0,
+    "learning_objectives_chatbot.backends": 150.0,
+    "learning_objectives_chatbot.server": 250.0,
+}
+
+# Dependencies that must only be imported by the features that need them
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "streamlit")
+
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, float], Set[str]]:
+    """Parse ``-X importtime`` output.
+
+    Args:
+        stderr: The interpreter's standard error
+
+    Returns:
+        Tuple of (cumulative milliseconds of each top-level import, names of
+        every module imported)
+    """
+    top_level: Dict[str, float] = {}
+    imported: Set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        imported.add(name.strip())
+        # Nested imports are indented by two spaces per level
+        if not name.startswith("  ", 1):
+            top_level[name.strip()] = int(fields[1]) / 1000
+    return top_level, imported
+
+
+def measure(module: str, repeat: int = 5) -> Dict[str, Any]:
+    """Import a module in fresh interpreters and return its fastest import.
+
+    Returns:
+        Dictionary with the best cumulative import time in milliseconds and
+        the heavy dependencies it imported
+    """
+    times: List[float] = []
+    heavy: Set[str] = set()
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        top_level, imported = parse_importtime(result.stderr)
+        times.append(top_level[module])
+        heavy.update(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+    return {
+        "import_ms": min(times),
+        "heavy_imports": sorted({name.split(".")[0] for name in heavy}),
+    }
+
+
+def check(
+    results: Dict[str, Dict[str, Any]], budgets: Dict[str, float], scale: float = 1.0
+) -> List[str]:
+    """Return a description of every budget violation in the results."""
+    failures = []
+    for module, result in results.items():
+        limit = budgets[module] * scale
+        if result["import_ms"] > limit:
+            failures.append(
+                f"{module}: {result['import_ms']:.1f} ms (budget {limit:.0f} ms)"
+            )
+        if result["heavy_imports"]:
+            failures.append(f"{module}: imports {', '.join(result['heavy_imports'])}")
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Measure import times and fail if a budget is exceeded."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="Also write the results as JSON")
+    parser.add_argument("-k", "--filter", help="Only check modules containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply every budget by this"
+    )
+    args = parser.parse_args(argv)
+
+    budgets = {
+        module: budget
+        for module, budget in BUDGETS_MS.items()
+        if not args.filter or args.filter in module
+    }
+    results = {module: measure(module, args.repeat) for module in budgets}
+    for module, result in results.items():
+        print(
+            f"{module:<40} {result['import_ms']:8.1f} ms"
+            f"  (budget {budgets[module] * args.scale:.0f} ms)"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budgets_ms": budgets, "results": results}, f, indent=2)
+            f.write("\n")
+
+    failures = check(results, budgets, args.scale)
+    for failure in failures:
+        print(f"OVER BUDGET {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Load generator for the headless HTTP API.
+
+Start the server first (`lo-chatbot serve`), then run from the repository root:
+
+    python benchmarks/loadgen.py --concurrency 64 --seconds 10 --endpoint chat
+"""
+
+from typing import Any, Dict, List, Tuple
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+
+OBJECTIVE = "Students will be able to design an experiment using controlled variables."
+CONVERSATION = [
+    "Biology",
+    "Analyze information",
+    "They will compare results",
+    "suggest one",
+    "refine it",
+]
+
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    path: str,
+    payload: Any = None,
+) -> Tuple[int, Any]:
+    """Send one request on a keep-alive connection and read the JSON response."""
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: loadgen\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(
+    host: str, port: int, endpoint: str, deadline: float, latencies: List[float]
+) -> int:
+    """Issue requests back to back until the deadline; return the error count."""
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    session_id = None
+    turns = itertools.cycle(CONVERSATION)
+    while time.perf_counter() < deadline:
+        if endpoint == "chat":
+            message = next(turns)
+            if message == CONVERSATION[0]:
+                session_id = None
+            call: Tuple[str, str, Any] = (
+                "POST",
+                "/chat",
+                {"session_id": session_id, "message": message},
+            )
+        elif endpoint == "analyze":
+            call = ("POST", "/analyze", {"objective": OBJECTIVE})
+        elif endpoint == "batch":
+            call = ("POST", "/analyze/batch", {"objectives": [OBJECTIVE] * 100})
+        else:
+            call = ("GET", "/examples", None)
+
+        start = time.perf_counter()
+        status, body = await request(reader, writer, *call)
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors += 1
+        elif endpoint == "chat":
+            session_id = body["session_id"]
+    writer.close()
+    return errors
+
+
+async def run(args: argparse.Namespace) -> Dict[str, float]:
+    """Run the load test and return the summary statistics."""
+    latencies: List[float] = []
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    errors = await asyncio.gather(
+        *(
+            client(args.host, args.port, args.endpoint, deadline, latencies)
+            for _ in range(args.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the load test and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--endpoint", choices=["chat", "analyze", "batch", "examples"], default="chat"
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    for name, value in summary.items():
+        print(f"{name:<18} {value:12,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""End-to-end latency harness that replays scripted conversations through the app.
+
+Every turn goes through the real Streamlit script with ``AppTest``: form
+submit, the reply backend, analysis, the history render and any reruns.
+Run from the repository root:
+
+    python benchmarks/rerun_harness.py run --sessions 20 --turns 40 -o rerun.json
+    python benchmarks/rerun_harness.py compare baseline.json rerun.json --max-regression 20
+
+Conversations start with a subject, a level and a measurement, then branch
+randomly (with ``--branches`` weights) between asking for a suggestion,
+refining, asking for another objective and free-form replies. Scripts are
+generated from ``--seed``, so two runs replay the same conversations.
+
+The report holds latency percentiles per turn bucket and per branch, script
+runs per turn and the size of the session state, so reports from two
+releases can be diffed or checked with ``compare``.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import pickle
+import platform
+import random
+import statistics
+import sys
+import time
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+from learning_objectives_chatbot import __version__, metrics
+
+APP_PATH = Path(__file__).parents[1] / "src" / "learning_objectives_chatbot" / "app.py"
+
+SUBJECTS = ["Introductory statistics", "Cell biology", "World history", "Python"]
+LEVELS = ["Understand the concepts", "Apply formulas", "Analyze data", "Create"]
+MEASUREMENTS = ["They will explain it", "solve problems", "compare two cases"]
+
+# Messages for each branch of the refinement stage of generate_response
+BRANCH_MESSAGES = {
+    "suggest": ["suggest one", "Can you suggest an objective?"],
+    "refine": ["refine it", "Make it better", "change the verb"],
+    "another": ["another one please", "Something different"],
+    "smart": ["Thanks", "Looks good", "ok"],
+}
+
+DEFAULT_BRANCHES = "suggest=3,refine=2,another=1,smart=1"
+
+# Metrics compared between reports, as paths into the report's summary
+COMPARED = [
+    ("turn_ms", "p50"),
+    ("turn_ms", "p95"),
+    ("last_bucket_ms", "p95"),
+    ("state_bytes", "max"),
+]
+
+
+def parse_branches(spec: str) -> Dict[str, float]:
+    """Parse ``name=weight`` pairs such as ``suggest=3,refine=1``."""
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in BRANCH_MESSAGES:
+            raise ValueError(f"Unknown branch: {name}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def make_script(
+    turns: int, branches: Dict[str, float], rng: random.Random
+) -> List[Tuple[str, str]]:
+    """Return one conversation as (branch, message) pairs.
+
+    Args:
+        turns: Number of user messages, including the first three stages
+        branches: Weight of each refinement branch
+        rng: Random source, so scripts are reproducible
+
+    Returns:
+        The scripted user turns, labelled with the branch they exercise
+    """
+    script = [
+        ("subject", rng.choice(SUBJECTS)),
+        ("level", rng.choice(LEVELS)),
+        ("measurement", rng.choice(MEASUREMENTS)),
+    ][:turns]
+    names = list(branches)
+    for _ in range(turns - len(script)):
+        branch = rng.choices(names, weights=[branches[name] for name in names])[0]
+        script.append((branch, rng.choice(BRANCH_MESSAGES[branch])))
+    return script
+
+
+def state_size(at: AppTest) -> int:
+    """Return the pickled size of a session's state in bytes."""
+    total = 0
+    for _, value in at.session_state.items():
+        try:
+            total += len(pickle.dumps(value))
+        except Exception:
+            total += sys.getsizeof(value)
+    return total
+
+
+def run_session(script: List[Tuple[str, str]], timeout: float) -> List[Dict[str, Any]]:
+    """Replay one conversation and return a record per turn."""
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout).run()
+    records = []
+    for turn, (branch, text) in enumerate(script, start=1):
+        runs_before = metrics.registry.value("lo_chatbot_reruns_total")
+        at.text_input(key="user_input").input(text)
+        start = time.perf_counter()
+        at.button[0].click().run()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(f"Turn {turn} ({text!r}) failed: {at.exception}")
+        records.append(
+            {
+                "turn": turn,
+                "branch": branch,
+                "ms": elapsed_ms,
+                "script_runs": metrics.registry.value("lo_chatbot_reruns_total")
+                - runs_before,
+                "state_bytes": state_size(at),
+            }
+        )
+    return records
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(pick(0.50), 3),
+        "p95": round(pick(0.95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "count": len(records),
+        "ms": _percentiles([r["ms"] for r in records]),
+        "script_runs_mean": round(
+            statistics.fmean(r["script_runs"] for r in records), 3
+        ),
+        "state_bytes_mean": round(statistics.fmean(r["state_bytes"] for r in records)),
+    }
+
+
+def build_report(
+    records: List[Dict[str, Any]], config: Dict[str, Any], bucket: int
+) -> Dict[str, Any]:
+    """Aggregate per-turn records into a report.
+
+    Args:
+        records: Turn records from every session
+        config: Harness settings, stored in the report
+        bucket: Number of consecutive turns grouped in ``by_turn``
+    """
+    buckets: Dict[int, List[Dict[str, Any]]] = {}
+    branches: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        buckets.setdefault((record["turn"] - 1) // bucket, []).append(record)
+        branches.setdefault(record["branch"], []).append(record)
+    last_turn = max(record["turn"] for record in records)
+    by_turn = [
+        {
+            "turns": f"{i * bucket + 1}-{min(i * bucket + bucket, last_turn)}",
+            **_summarize(group),
+        }
+        for i, group in sorted(buckets.items())
+    ]
+    last = buckets[max(buckets)]
+    return {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "streamlit": streamlit.__version__,
+            "package": __version__,
+        },
+        "summary": {
+            "turns": len(records),
+            "turn_ms": _percentiles([r["ms"] for r in records]),
+            "last_bucket_ms": _percentiles([r["ms"] for r in last]),
+            "script_runs": {
+                "mean": round(statistics.fmean(r["script_runs"] for r in records), 3),
+                "max": max(r["script_runs"] for r in records),
+            },
+            "state_bytes": _percentiles([r["state_bytes"] for r in records]),
+        },
+        "by_turn": by_turn,
+        "by_branch": {
+            name: _summarize(group) for name, group in sorted(branches.items())
+        },
+    }
+
+
+def run(
+    sessions: int,
+    turns: int,
+    branches: Dict[str, float],
+    seed: int = 0,
+    bucket: int = 10,
+    timeout: float = 60.0,
+) -> Dict[str, Any]:
+    """Replay ``sessions`` scripted conversations and return the report."""
+    # Script runs are counted with the app's own rerun counter. Timing
+    # wrappers are chosen at import, so this adds no per-call overhead.
+    enabled, metrics.ENABLED = metrics.ENABLED, True
+    rng = random.Random(seed)
+    records = []
+    try:
+        for _ in range(sessions):
+            records.extend(run_session(make_script(turns, branches, rng), timeout))
+    finally:
+        metrics.ENABLED = enabled
+    config = {
+        "sessions": sessions,
+        "turns": turns,
+        "branches": branches,
+        "seed": seed,
+        "bucket": bucket,
+    }
+    return build_report(records, config, bucket)
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float
+) -> List[str]:
+    """Return the summary metrics that grew by more than ``max_regression`` percent."""
+    failures = []
+    for group, stat in COMPARED:
+        old = baseline["summary"][group][stat]
+        new = current["summary"][group][stat]
+        change = 100 * (new - old) / old if old else 0.0
+        if change > max_regression:
+            failures.append(
+                f"{group}.{stat}: {old:g} -> {new:g} "
+                f"(+{change:.1f}%, limit +{max_regression:g}%)"
+            )
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Parse arguments and run the harness or compare two reports."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Replay conversations, write JSON")
+    run_parser.add_argument("-o", "--output", default="-")
+    run_parser.add_argument("--sessions", type=int, default=10)
+    run_parser.add_argument("--turns", type=int, default=30)
+    run_parser.add_argument(
+        "--branches",
+        default=DEFAULT_BRANCHES,
+        help=f"Refinement branch weights (default: {DEFAULT_BRANCHES})",
+    )
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument(
+        "--bucket", type=int, default=10, help="Turns per row of the by_turn table"
+    )
+
+    compare_parser = commands.add_parser("compare", help="Fail on regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=20.0,
+        help="Allowed increase in percent (default: 20)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run(
+            args.sessions,
+            args.turns,
+            parse_branches(args.branches),
+            args.seed,
+            args.bucket,
+        )
+        document = json.dumps(report, indent=2)
+        if args.output == "-":
+            print(document)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(document + "\n")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    failures = compare(baseline, current, args.max_regression)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Benchmark suite for the core chatbot functions, with regression checks.
+
+Run from the repository root:
+
+    python benchmarks/suite.py run -o results.json
+    python benchmarks/suite.py compare baseline.json results.json --max-regression 10
+
+`compare` exits with status 1 if any benchmark's throughput dropped by more
+than the allowed percentage.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+from learning_objectives_chatbot.utils import (
+    BLOOMS_TAXONOMY_VERBS,
+    analyze_objective,
+    extract_action_verb,
+    generate_response,
+    generate_sample_objective,
+    get_blooms_level,
+    suggest_improvements,
+)
+
+SHORT = "Define photosynthesis."
+LONG = (
+    "After completing this course, students will be able to design and conduct "
+    "experiments using appropriate controls, analyze the resulting data with "
+    "statistical techniques, and justify their conclusions in a written report, "
+    "with attention to safety, ethics, reproducibility, and clear communication."
+)
+HUGE = " ".join(
+    ("students will consider the historical context".split() * 1667)[:10000]
+)
+ALL_VERBS = (
+    "Students will "
+    + ", ".join(verb for verbs in BLOOMS_TAXONOMY_VERBS.values() for verb in verbs)
+    + "."
+)
+
+CONVERSATION = [
+    "Introductory statistics",
+    "I want them to analyze data",
+    "They will compare and interpret two samples",
+    "suggest one",
+    "Can we refine it?",
+    "Let's try another",
+    "Thanks",
+]
+
+
+def _full_conversation() -> None:
+    history = [{"role": "assistant", "content": "Hi!"}]
+    for user_input in CONVERSATION:
+        history.append({"role": "user", "content": user_input})
+        history.append(
+            {"role": "assistant", "content": generate_response(user_input, history)}
+        )
+
+
+def benchmarks() -> List[Tuple[str, Callable[[], Any]]]:
+    """Return the (name, zero-argument callable) pairs to measure."""
+    cases: List[Tuple[str, Callable[[], Any]]] = []
+    for label, text in [
+        ("short", SHORT),
+        ("long", LONG),
+        ("10k_words", HUGE),
+        ("all_verbs", ALL_VERBS),
+    ]:
+        cases.append(
+            (f"analyze_objective[{label}]", lambda t=text: analyze_objective(t))
+        )
+        cases.append(
+            (
+                f"extract_action_verb[{label}]",
+                lambda t=text: extract_action_verb(t, "Analyze"),
+            )
+        )
+        cases.append((f"get_blooms_level[{label}]", lambda t=text: get_blooms_level(t)))
+
+    analysis = analyze_objective(SHORT)
+    cases.append(("suggest_improvements", lambda: suggest_improvements(analysis)))
+    cases.append(("generate_response[conversation]", _full_conversation))
+    cases.append(
+        (
+            "generate_sample_objective",
+            lambda: generate_sample_objective(
+                "Computer programming", "Apply knowledge", "implement and solve"
+            ),
+        )
+    )
+    return cases
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Measure a callable, keeping the fastest of several timed runs."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"ops_per_sec": 1 / best, "mean_us": best * 1e6}
+
+
+def run(
+    pattern: Optional[str] = None, repeat: int = 5, min_time: float = 0.2
+) -> Dict[str, Any]:
+    """Run the suite and return the results document."""
+    results = {}
+    for name, func in benchmarks():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(func, repeat, min_time)
+        print(
+            f"{name:<42} {results[name]['ops_per_sec']:14,.1f} ops/sec", file=sys.stderr
+        )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float
+) -> List[str]:
+    """Return a description of every benchmark that regressed too far.
+
+    Args:
+        baseline: Results document to compare against
+        current: Newly measured results document
+        max_regression: Allowed throughput drop, in percent
+
+    Returns:
+        One line per failing benchmark; empty if none regressed
+    """
+    failures = []
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            continue
+        change = (after["ops_per_sec"] / before["ops_per_sec"] - 1) * 100
+        print(f"{name:<42} {change:+8.1f}%", file=sys.stderr)
+        if change < -max_regression:
+            failures.append(
+                f"{name}: throughput {change:+.1f}% (limit -{max_regression}%)"
+            )
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Parse arguments and run or compare benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and write JSON")
+    run_parser.add_argument("-o", "--output", default="-")
+    run_parser.add_argument("-k", "--filter", help="Only run names containing this")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.2)
+
+    compare_parser = commands.add_parser("compare", help="Fail on regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=10.0,
+        help="Allowed throughput drop in percent (default: 10)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        document = json.dumps(run(args.filter, args.repeat, args.min_time), indent=2)
+        if args.output == "-":
+            print(document)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(document + "\n")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    failures = compare(baseline, current, args.max_regression)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
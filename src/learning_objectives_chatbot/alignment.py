@@ -0,0 +1,152 @@
+"""Course- and program-level alignment analytics over many objectives.
+
+Objectives are analyzed in one vectorized pass and then summarized per group
+(for example per course, or per course and module) with pandas groupby
+operations, so reports over tens of thousands of courses take seconds.
+"""
+
+from typing import List, NamedTuple, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from learning_objectives_chatbot.batch import analyze_objectives, verb_hits
+from learning_objectives_chatbot.taxonomy import Taxonomy, resolve_taxonomy
+
+# Share of a group's objectives above which a verb counts as overused
+DEFAULT_OVERUSE_SHARE = 0.3
+
+# Verbs used fewer times than this are never reported as overused
+DEFAULT_OVERUSE_MIN_COUNT = 3
+
+
+def report_levels(taxonomy: Union[Taxonomy, str, None] = None) -> List[str]:
+    """Return the levels reported in the distribution, lowest first.
+
+    "Unknown" comes first and counts objectives without a taxonomy verb.
+    """
+    return ["Unknown", *resolve_taxonomy(taxonomy).levels]
+
+
+class AlignmentReport(NamedTuple):
+    """Summaries of a set of objectives, one row per group.
+
+    Attributes:
+        summary: Objective count, measurable share and clarity statistics
+        levels: Number of objectives at each Bloom's level
+        overused_verbs: Verbs whose share of a group exceeds the threshold
+        gaps: One row per group and Bloom's level with no objectives
+    """
+
+    summary: pd.DataFrame
+    levels: pd.DataFrame
+    overused_verbs: pd.DataFrame
+    gaps: pd.DataFrame
+
+
+def add_analysis(
+    objectives: pd.DataFrame, taxonomy: Union[Taxonomy, str, None] = None
+) -> pd.DataFrame:
+    """Return the objectives with analysis and leading verb columns added.
+
+    Columns that are already present, for example from a history file
+    written by ``history_io``, are kept rather than recomputed.
+
+    Args:
+        objectives: DataFrame with an ``objective`` column
+        taxonomy: Taxonomy or taxonomy name to classify against (default:
+            ``LO_CHATBOT_TAXONOMY``, or Bloom's)
+    """
+    taxonomy = resolve_taxonomy(taxonomy)
+    frame = objectives.copy()
+    missing = [
+        column
+        for column in ("blooms_level", "measurable", "clarity_score")
+        if column not in frame
+    ]
+    if missing:
+        analysis = analyze_objectives(frame["objective"], taxonomy)
+        for column in missing:
+            frame[column] = analysis[column]
+    if "verb" not in frame:
+        # The leading verb in its base form, so "analyzes" counts as "analyze"
+        lower = frame["objective"].astype("str").str.lower().reset_index(drop=True)
+        rows, verbs = verb_hits(lower, taxonomy.verb_matcher)
+        first = np.unique(rows, return_index=True)[1]
+        leading = np.full(len(frame), np.nan, dtype=object)
+        leading[rows[first]] = np.array(verbs, dtype=object)[first]
+        frame["verb"] = leading
+    return frame
+
+
+def alignment_report(
+    objectives: pd.DataFrame,
+    by: Union[str, Sequence[str]] = "course_id",
+    overuse_share: float = DEFAULT_OVERUSE_SHARE,
+    overuse_min_count: int = DEFAULT_OVERUSE_MIN_COUNT,
+    taxonomy: Union[Taxonomy, str, None] = None,
+) -> AlignmentReport:
+    """Summarize objectives per course, module or any other grouping.
+
+    Args:
+        objectives: DataFrame with an ``objective`` column and the grouping
+            columns; analysis columns are computed if missing
+        by: Column or columns to group by
+        overuse_share: Share of a group's objectives above which a verb is
+            reported as overused
+        overuse_min_count: Minimum uses before a verb can be overused
+        taxonomy: Taxonomy or taxonomy name whose levels are reported
+            (default as in ``add_analysis``)
+
+    Returns:
+        AlignmentReport with one summary row per group
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    taxonomy = resolve_taxonomy(taxonomy)
+    levels_reported = report_levels(taxonomy)
+    frame = add_analysis(objectives, taxonomy)
+    groups = frame.groupby(keys, sort=True, observed=True)
+
+    summary = groups.agg(
+        objectives=("objective", "size"),
+        measurable_share=("measurable", "mean"),
+        clarity_mean=("clarity_score", "mean"),
+        clarity_median=("clarity_score", "median"),
+        clarity_min=("clarity_score", "min"),
+        clarity_max=("clarity_score", "max"),
+        distinct_verbs=("verb", "nunique"),
+    )
+
+    levels = (
+        frame.groupby(keys + ["blooms_level"], observed=True)
+        .size()
+        .unstack("blooms_level", fill_value=0)
+        .reindex(index=summary.index, columns=levels_reported, fill_value=0)
+    )
+    levels.columns.name = None
+
+    verb_counts = (
+        frame.dropna(subset=["verb"])
+        .groupby(keys + ["verb"], observed=True)
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+    totals = summary["objectives"].rename("total").reset_index()
+    verb_counts = verb_counts.merge(totals, on=keys)
+    verb_counts["share"] = verb_counts["count"] / verb_counts.pop("total")
+    overused_verbs = verb_counts[
+        (verb_counts["share"] > overuse_share)
+        & (verb_counts["count"] >= overuse_min_count)
+    ].reset_index(drop=True)
+
+    # Gaps only consider real taxonomy levels, not "Unknown"
+    taxonomy_levels = levels[levels_reported[1:]]
+    missing = taxonomy_levels.eq(0).stack()
+    gaps = (
+        missing[missing]
+        .rename_axis(keys + ["missing_level"])
+        .index.to_frame(index=False)
+    )
+
+    return AlignmentReport(summary, levels, overused_verbs, gaps)
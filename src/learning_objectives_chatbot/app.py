@@ -1,19 +1,222 @@
 """Learning Objectives Chatbot Application."""
 
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional
+import logging
+import os
+import time
+
 import streamlit as st
 from streamlit_chat import message
-import pandas as pd
 
+from learning_objectives_chatbot import metrics
+from learning_objectives_chatbot.backends import default_backend
+from learning_objectives_chatbot.cache import analysis_cache
+from learning_objectives_chatbot.sessions import (
+    CompactMessage,
+    Role,
+    assistant_message,
+    user_message
+)
 from learning_objectives_chatbot.utils import (
-    generate_response,
-    get_sample_objectives,
-    analyze_objective,
-    suggest_improvements
+    ConversationState,
+    get_sample_objectives
 )
 
+if TYPE_CHECKING:
+    from learning_objectives_chatbot.dedup import DedupIndex
+
+logger = logging.getLogger(__name__)
+
+# Number of most recent messages rendered as chat bubbles
+DEFAULT_CHAT_WINDOW = int(os.environ.get("LO_CHATBOT_CHAT_WINDOW", "20"))
+
+# Number of older messages shown per page of the history section
+HISTORY_PAGE_SIZE = 20
+
+# Optional metrics export, see learning_objectives_chatbot.metrics
+METRICS_FILE = os.environ.get("LO_CHATBOT_METRICS_FILE")
+METRICS_PORT = os.environ.get("LO_CHATBOT_METRICS_PORT")
+
+
+def record_render_metrics(elapsed_ms: float) -> None:
+    """Record the render time and export metrics if configured."""
+    if not metrics.ENABLED:
+        return
+    metrics.observe("lo_chatbot_render_duration_seconds", elapsed_ms / 1000)
+    if METRICS_FILE:
+        metrics.write_prometheus(METRICS_FILE)
+
+
+# Callables notified with the render time (in milliseconds) of every rerun
+RENDER_HOOKS: List[Callable[[float], None]] = [
+    lambda ms: logger.debug("Rendered app in %.1f ms", ms),
+    record_render_metrics
+]
+
+
+def history_pages(first_visible: int, page_size: int = HISTORY_PAGE_SIZE) -> List[range]:
+    """Split the messages before the chat window into pages, newest first.
+    
+    Args:
+        first_visible: Index of the first message shown in the chat window
+        page_size: Number of messages per page
+        
+    Returns:
+        List of index ranges, one per page
+    """
+    return [
+        range(max(0, end - page_size), end)
+        for end in range(first_visible, 0, -page_size)
+    ]
+
+
+@contextmanager
+def render_timer() -> Iterator[None]:
+    """Measure one script run and report it to the render hooks.
+    
+    The time is also kept in session state so the next run can display it.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.session_state.last_render_ms = elapsed_ms
+        for hook in RENDER_HOOKS:
+            hook(elapsed_ms)
+
+
+def time_to_first_token(chunks: Iterable[str]) -> Iterator[str]:
+    """Pass through a response stream, recording when its first chunk arrives."""
+    start = time.perf_counter()
+    first = True
+    for chunk in chunks:
+        if first:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            st.session_state.last_first_token_ms = elapsed_ms
+            metrics.observe("lo_chatbot_first_token_seconds", elapsed_ms / 1000)
+            first = False
+        yield chunk
+
+
+def render_message(msg: CompactMessage, index: int) -> None:
+    """Render a single chat message as a chat bubble."""
+    content = msg.expand()["content"]
+    if msg.role == Role.ASSISTANT:
+        message(content, key=f"assistant_{index}")
+    else:
+        message(content, is_user=True, key=f"user_{index}")
+
+
+def render_earlier_messages(messages: List[CompactMessage], first_visible: int) -> None:
+    """Render messages older than the chat window as a paginated section.
+    
+    Nothing is rendered until the user picks a page, and pages use plain
+    markdown rather than one chat component per message.
+    """
+    pages = history_pages(first_visible)
+    
+    def page_label(page: Optional[int]) -> str:
+        if page is None:
+            return "Hidden"
+        return f"{page + 1} of {len(pages)} (messages {pages[page].start + 1}-{pages[page].stop})"
+    
+    with st.expander(f"Earlier messages ({first_visible})"):
+        page = st.selectbox(
+            "Page",
+            options=[None] + list(range(len(pages))),
+            format_func=page_label,
+            key="history_page"
+        )
+        if page is not None:
+            for i in pages[page]:
+                speaker = "Assistant" if messages[i].role == Role.ASSISTANT else "You"
+                st.markdown(f"**{speaker}:** {messages[i].expand()['content']}")
+
+
+def render_history_download(history: List[str]) -> None:
+    """Offer the objective history and its analysis as a download.
+    
+    The file is only rebuilt when objectives were added since the last run.
+    """
+    if not history:
+        return
+    # NumPy and pandas are only imported once a session has objectives
+    from learning_objectives_chatbot.history_io import PARQUET_AVAILABLE, export_history_bytes
+    
+    fmt = "parquet" if PARQUET_AVAILABLE else "csv"
+    cached = st.session_state.get("history_export")
+    if cached is None or cached[0] != len(history):
+        cached = st.session_state.history_export = (
+            len(history),
+            export_history_bytes(history, fmt)
+        )
+    st.sidebar.download_button(
+        "Download objective history",
+        data=cached[1],
+        file_name=f"objective_history.{fmt}",
+        mime="application/vnd.apache.parquet" if fmt == "parquet" else "text/csv"
+    )
+
+
+def render_alignment_panel(history: List[str]) -> None:
+    """Summarize how the session's objectives cover Bloom's taxonomy.
+    
+    The report is only recomputed when objectives were added since the last run.
+    """
+    if not history:
+        return
+    import pandas as pd
+    from learning_objectives_chatbot.alignment import alignment_report
+    
+    cached = st.session_state.get("alignment_report")
+    if cached is None or cached[0] != len(history):
+        frame = pd.DataFrame({"course_id": "session", "objective": history})
+        cached = st.session_state.alignment_report = (len(history), alignment_report(frame))
+    report = cached[1]
+    summary = report.summary.iloc[0]
+    
+    with st.expander("Alignment Summary"):
+        st.write(f"- **Measurable:** {summary['measurable_share']:.0%} of {summary['objectives']:.0f} objectives")
+        st.write(
+            f"- **Clarity:** mean {summary['clarity_mean']:.1f}/10 "
+            f"(range {summary['clarity_min']:.0f}-{summary['clarity_max']:.0f})"
+        )
+        st.bar_chart(report.levels.iloc[0])
+        if not report.gaps.empty:
+            st.write(f"**Levels not covered:** {', '.join(report.gaps['missing_level'])}")
+        for verb in report.overused_verbs.itertuples():
+            st.write(f"**Overused verb:** '{verb.verb}' in {verb.share:.0%} of objectives")
+
+
+def objective_index() -> "DedupIndex":
+    """Return the session's duplicate index, creating it on first use.
+    
+    The index only detects exact duplicates (after normalization) without
+    scanning the history. Generated objectives for different levels or
+    subjects share most of their words, so near-duplicate matching would
+    drop distinct objectives. It needs NumPy, so it is only built once the
+    assistant suggests an objective, keeping NumPy out of the first page load.
+    """
+    if "objective_index" not in st.session_state:
+        from learning_objectives_chatbot.dedup import DedupIndex
+        
+        st.session_state.objective_index = DedupIndex(threshold=1.0)
+    return st.session_state.objective_index
+
 
 def main() -> None:
     """Main Streamlit application entry point."""
+    if metrics.ENABLED and METRICS_PORT:
+        metrics.start_http_exporter(int(METRICS_PORT))
+    metrics.inc("lo_chatbot_reruns_total")
+    with render_timer():
+        render_app()
+
+
+def render_app() -> None:
+    """Render the whole page for one script run."""
     st.set_page_config(
         page_title="Learning Objectives Chatbot",
         page_icon="🎯",
@@ -31,10 +234,12 @@ def main() -> None:
     )
 
     # Initialize session state variables if they don't exist
+    # Messages are stored compactly and only expanded to text when rendered
     if "messages" not in st.session_state:
-        st.session_state.messages = [
-            {"role": "assistant", "content": "Hi! I'm your Learning Objectives Assistant. What subject or skill are you creating learning objectives for?"}
-        ]
+        st.session_state.messages = [assistant_message("greeting")]
+    
+    if "conversation" not in st.session_state:
+        st.session_state.conversation = ConversationState()
     
     if "current_objective" not in st.session_state:
         st.session_state.current_objective = ""
@@ -42,6 +247,22 @@ def main() -> None:
     if "objective_history" not in st.session_state:
         st.session_state.objective_history = []
 
+    # Chat display settings
+    st.sidebar.number_input(
+        "Messages shown",
+        min_value=2,
+        max_value=1000,
+        value=DEFAULT_CHAT_WINDOW,
+        step=2,
+        key="chat_window"
+    )
+    if "last_render_ms" in st.session_state:
+        st.sidebar.caption(f"Last render: {st.session_state.last_render_ms:.1f} ms")
+    if "last_first_token_ms" in st.session_state:
+        st.sidebar.caption(
+            f"Last time to first token: {st.session_state.last_first_token_ms:.1f} ms"
+        )
+
     # Create two columns for layout
     col1, col2 = st.columns([2, 1])
 
@@ -49,15 +270,19 @@ def main() -> None:
     with col1:
         st.subheader("Chat")
         
-        # Display chat messages
-        for i, msg in enumerate(st.session_state.messages):
-            if msg["role"] == "assistant":
-                message(msg["content"], key=f"assistant_{i}")
-            else:
-                message(msg["content"], is_user=True, key=f"user_{i}")
+        # Display the most recent chat messages; older ones are paginated.
+        # New messages are added to this container after the form is handled.
+        chat_area = st.container()
+        messages = st.session_state.messages
+        first_visible = max(0, len(messages) - st.session_state.chat_window)
+        with chat_area:
+            if first_visible:
+                render_earlier_messages(messages, first_visible)
+            for i in range(first_visible, len(messages)):
+                render_message(messages[i], i)
         
-        # Chat input - Use a form to prevent rerun loops
-        with st.form(key="message_form"):
+        # Chat input - the form clears itself, so no extra rerun is needed
+        with st.form(key="message_form", clear_on_submit=True):
             user_input = st.text_input("Type your message here...", key="user_input")
             submit_button = st.form_submit_button("Send")
             
@@ -66,24 +291,38 @@ def main() -> None:
             # Store the current input
             current_input = user_input
             
-            # Add user message to chat history
-            st.session_state.messages.append({"role": "user", "content": current_input})
+            # Add user message to chat history and show it
+            st.session_state.messages.append(user_message(current_input))
+            with chat_area:
+                render_message(st.session_state.messages[-1], len(st.session_state.messages) - 1)
             
-            # Generate response
-            response = generate_response(current_input, st.session_state.messages)
+            # Stream the response from the configured backend, then replace
+            # the streamed text with the finished chat bubble
+            stream = default_backend().stream(st.session_state.conversation, current_input)
+            with chat_area:
+                slot = st.empty()
+                with slot:
+                    st.write_stream(time_to_first_token(stream))
+            reply = stream.reply
             
             # Add assistant response to chat history
-            st.session_state.messages.append({"role": "assistant", "content": response})
+            st.session_state.messages.append(assistant_message(reply.template, reply.args))
+            with slot:
+                render_message(st.session_state.messages[-1], len(st.session_state.messages) - 1)
             
-            # If response contains a learning objective suggestion, save it
-            if "Here's a possible learning objective:" in response:
-                objective = response.split("Here's a possible learning objective:")[1].strip()
+            # If the response suggests a learning objective, save it
+            if reply.objective:
+                objective = reply.objective
                 st.session_state.current_objective = objective
-                if objective not in st.session_state.objective_history:
+                if objective_index().add(objective) is None:
                     st.session_state.objective_history.append(objective)
+                    metrics.inc("lo_chatbot_objectives_saved_total")
             
-            # Clear the input field by forcing a rerun once
-            st.rerun()
+            metrics.observe(
+                "lo_chatbot_session_messages",
+                len(st.session_state.messages),
+                metrics.MESSAGE_BUCKETS
+            )
 
     # Learning objectives panel in the second column
     with col2:
@@ -94,8 +333,8 @@ def main() -> None:
             st.write("**Current Objective:**")
             st.info(st.session_state.current_objective)
             
-            # Analyze the current objective
-            analysis = analyze_objective(st.session_state.current_objective)
+            # Analyze the current objective (cached across reruns and sessions)
+            analysis, improvements = analysis_cache.get(st.session_state.current_objective)
             
             # Display the analysis
             st.write("**Analysis:**")
@@ -104,11 +343,19 @@ def main() -> None:
             st.write(f"- **Clarity:** {analysis['clarity_score']}/10")
             
             # Suggestions for improvement
-            improvements = suggest_improvements(analysis)
             if improvements:
                 st.write("**Suggestions for Improvement:**")
                 for suggestion in improvements:
                     st.write(f"- {suggestion}")
+            
+            # Closest well-formed examples from the indexed corpus
+            from learning_objectives_chatbot.examples import nearest_examples
+            
+            closest = nearest_examples(st.session_state.current_objective, k=3)
+            if closest:
+                st.write("**Similar Examples:**")
+                for example in closest:
+                    st.write(f"- {example['objective']} ({example['blooms_level']})")
         
         # Objective history
         if st.session_state.objective_history:
@@ -116,6 +363,7 @@ def main() -> None:
             for i, obj in enumerate(st.session_state.objective_history):
                 with st.expander(f"Objective {i+1}"):
                     st.write(obj)
+            render_alignment_panel(st.session_state.objective_history)
         
         # Example objectives section
         with st.expander("Example Learning Objectives"):
@@ -125,11 +373,13 @@ def main() -> None:
                 for obj in objectives:
                     st.write(f"- {obj}")
 
+    # Rendered after the chat so it includes an objective saved in this run
+    render_history_download(st.session_state.objective_history)
+
     # Reset conversation button
     if st.button("Start New Conversation"):
-        st.session_state.messages = [
-            {"role": "assistant", "content": "Hi! I'm your Learning Objectives Assistant. What subject or skill are you creating learning objectives for?"}
-        ]
+        st.session_state.messages = [assistant_message("greeting")]
+        st.session_state.conversation = ConversationState()
         st.session_state.current_objective = ""
         st.rerun()
 
@@ -0,0 +1,533 @@
+"""Pluggable backends that produce the assistant's replies.
+
+``RuleBasedBackend`` is the built-in conversation logic and the default.
+``HTTPBackend`` asks a model server for the reply text through a pool of
+keep-alive connections, and can show the text as the server streams it.
+It coalesces identical in-flight requests, caches replies by conversation
+state, and falls back to the rule-based reply when the server is slow or
+unavailable.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import astuple
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+import abc
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import urllib.parse
+
+from learning_objectives_chatbot import metrics
+from learning_objectives_chatbot.utils import (
+    ConversationState,
+    render_response,
+    stream_text,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Reply(NamedTuple):
+    """An assistant reply in template form.
+
+    Attributes:
+        template: Key into ``RESPONSE_TEMPLATES``
+        args: Values for the template's placeholders
+        objective: The learning objective suggested by this reply, if any
+    """
+
+    template: str
+    args: Tuple[str, ...]
+    objective: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """The full reply text."""
+        return render_response(self.template, self.args)
+
+
+def rule_based_reply(state: ConversationState, user_input: str) -> Reply:
+    """Advance the conversation with the built-in rules."""
+    template, args = state.reply(user_input)
+    return Reply(template, args, args[0] if template == "suggestion" else None)
+
+
+class ResponseBackend(abc.ABC):
+    """Interface for reply backends.
+
+    Every backend advances the ``ConversationState`` it is given, so the
+    conversation stages stay the same whichever backend produced the text.
+    Subclasses must implement ``respond``. Backends that receive the text
+    piece by piece also override ``respond_incrementally`` and set
+    ``incremental``.
+    """
+
+    #: Whether ``respond_incrementally`` reports text before the reply is done
+    incremental = False
+
+    @abc.abstractmethod
+    async def respond(self, state: ConversationState, user_input: str) -> Reply:
+        """Advance the conversation by one user message and return the reply."""
+
+    async def respond_incrementally(
+        self,
+        state: ConversationState,
+        user_input: str,
+        on_text: Optional[Callable[[str], None]],
+    ) -> Reply:
+        """Like ``respond``, passing text to ``on_text`` as it is produced.
+
+        The default waits for the whole reply and reports nothing, leaving
+        the caller to show the finished text.
+        """
+        return await self.respond(state, user_input)
+
+    def respond_sync(self, state: ConversationState, user_input: str) -> Reply:
+        """Blocking variant of ``respond`` for synchronous callers such as the app.
+
+        The coroutine runs on a shared background event loop, so connection
+        pools and in-flight requests are shared between callers.
+        """
+        return run_sync(self.respond(state, user_input))
+
+    def stream(self, state: ConversationState, user_input: str) -> "ReplyStream":
+        """Return the reply as an iterator of text chunks.
+
+        The reply is requested when iteration starts. For ``incremental``
+        backends the chunks are the text as it arrives; otherwise the
+        finished reply is split into words, which only simulates streaming.
+        """
+        return ReplyStream(self, state, user_input)
+
+    async def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class ReplyStream:
+    """Iterates over a reply's text in chunks for incremental display.
+
+    ``reply`` holds the complete reply once iteration has finished, so the
+    caller can store it after the text has been shown. If an incremental
+    backend fails part way and falls back to another reply, the shown text
+    ends early and ``reply`` holds the fallback.
+    """
+
+    def __init__(
+        self, backend: ResponseBackend, state: ConversationState, user_input: str
+    ) -> None:
+        self.reply: Optional[Reply] = None
+        self._backend = backend
+        self._state = state
+        self._user_input = user_input
+
+    def __iter__(self) -> Iterator[str]:
+        if self.reply is not None or not self._backend.incremental:
+            if self.reply is None:
+                self.reply = self._backend.respond_sync(self._state, self._user_input)
+            yield from stream_text(self.reply.text)
+            return
+
+        # Text arrives on the background loop; None marks the end
+        chunks: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        future = _submit(
+            self._backend.respond_incrementally(
+                self._state, self._user_input, chunks.put
+            )
+        )
+        future.add_done_callback(lambda _: chunks.put(None))
+        shown = False
+        while (chunk := chunks.get()) is not None:
+            shown = True
+            yield chunk
+        self.reply = future.result()
+        if not shown:
+            # Cached, coalesced or fallback replies arrive all at once
+            yield from stream_text(self.reply.text)
+
+
+class RuleBasedBackend(ResponseBackend):
+    """The built-in rule-based conversation."""
+
+    async def respond(self, state: ConversationState, user_input: str) -> Reply:
+        return rule_based_reply(state, user_input)
+
+    def respond_sync(self, state: ConversationState, user_input: str) -> Reply:
+        # Nothing to wait for, so skip the event loop
+        return rule_based_reply(state, user_input)
+
+
+class _Response:
+    """An HTTP response whose body is read as it arrives."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, status: int, headers: Dict[str, str]
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self.chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        # Whether the connection can carry another request once the body is read
+        self.reusable = headers.get("connection", "").lower() != "close" and (
+            self.chunked or "content-length" in headers
+        )
+        self.complete = False
+        self._reader = reader
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield the body in pieces, decoding chunked transfer encoding."""
+        reader = self._reader
+        if self.chunked:
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                yield await reader.readexactly(size)
+                await reader.readline()
+            # Skip any trailers
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass
+        elif "content-length" in self.headers:
+            length = int(self.headers["content-length"])
+            if length:
+                yield await reader.readexactly(length)
+        else:
+            # The body ends when the server closes the connection
+            while data := await reader.read(65536):
+                yield data
+        self.complete = True
+
+    async def read(self) -> bytes:
+        """Read the whole body."""
+        return b"".join([chunk async for chunk in self.chunks()])
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one host, capped in number."""
+
+    def __init__(self, host: str, port: int, max_connections: int) -> None:
+        self.host = host
+        self.port = port
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._limit = asyncio.Semaphore(max_connections)
+
+    async def post_json(self, path: str, payload: Any) -> Tuple[int, Any]:
+        """Send a JSON POST request and return (status, decoded JSON body)."""
+        async with self.post(path, payload) as response:
+            return response.status, json.loads(await response.read() or b"null")
+
+    @contextlib.asynccontextmanager
+    async def post(
+        self, path: str, payload: Any, accept: str = "application/json"
+    ) -> AsyncIterator[_Response]:
+        """Send a JSON POST request and yield the response once its head arrives.
+
+        A pooled connection may have been closed by the server while it was
+        idle. If sending on one fails before a response arrives, the request
+        is retried once on a new connection. The connection returns to the
+        pool only if the body was read completely.
+        """
+        body = json.dumps(payload).encode()
+        async with self._limit:
+            response = None
+            if self._idle:
+                connection = self._idle.pop()
+                try:
+                    response = await self._send(connection, path, body, accept)
+                except ConnectionError as exc:
+                    logger.debug("Idle connection was closed (%r), reconnecting", exc)
+            if response is None:
+                connection = await asyncio.open_connection(self.host, self.port)
+                response = await self._send(connection, path, body, accept)
+            try:
+                yield response
+            finally:
+                # After cancellation by a timeout the connection is in an
+                # unknown state, so it is never reused
+                if response.complete and response.reusable:
+                    self._idle.append(connection)
+                else:
+                    connection[1].close()
+
+    async def _send(
+        self,
+        connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        path: str,
+        body: bytes,
+        accept: str,
+    ) -> _Response:
+        reader, writer = connection
+        try:
+            writer.write(
+                f"POST {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                f"Accept: {accept}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"\r\n".encode() + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed by the server")
+            status = int(status_line.split(b" ", 2)[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except BaseException:
+            writer.close()
+            raise
+        return _Response(reader, status, headers)
+
+    def close(self) -> None:
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+async def _sse_events(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Decode the JSON data of server-sent events as they arrive."""
+    buffer = b""
+    data: List[bytes] = []
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line.startswith(b"data:"):
+                data.append(line[5:].removeprefix(b" "))
+            elif not line and data:
+                event = b"\n".join(data)
+                data = []
+                if event != b"[DONE]":
+                    yield json.loads(event)
+
+
+class HTTPBackend(ResponseBackend):
+    """Replies written by a model server, with the rule-based reply as fallback.
+
+    The server receives ``POST <path>`` with
+    ``{"message", "state", "draft"}``, where ``draft`` is the rule-based
+    reply text, and answers ``{"response"}`` plus an optional
+    ``"objective"``.
+
+    Streamed requests (see ``stream``) also carry ``"stream": true`` and
+    ``Accept: text/event-stream``. The server may then answer with
+    server-sent events whose data are ``{"delta"}`` objects, any of which
+    may carry ``"objective"``, or with the usual JSON body. While
+    streaming, ``timeout`` limits the wait for each event rather than for
+    the whole reply.
+    """
+
+    incremental = True
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 2.0,
+        max_connections: int = 10,
+        cache_size: int = 1024,
+    ) -> None:
+        """Configure the backend; connections are opened on first use.
+
+        Args:
+            url: Endpoint of the model server, e.g. ``http://127.0.0.1:9000/generate``
+            timeout: Seconds to wait for a reply before falling back
+            max_connections: Concurrent requests (and pooled connections)
+            cache_size: Replies kept, keyed by conversation state and message
+        """
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme != "http" or not parsed.hostname:
+            raise ValueError(f"Unsupported model server URL: {url}")
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.path = parsed.path or "/"
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.cache_size = cache_size
+        self._pool: Optional[_ConnectionPool] = None
+        self._cache: "OrderedDict[Tuple[Any, ...], Reply]" = OrderedDict()
+        self._inflight: Dict[Tuple[Any, ...], "asyncio.Future[Reply]"] = {}
+
+    @staticmethod
+    def cache_key(state: ConversationState, user_input: str) -> Tuple[Any, ...]:
+        """Key for a turn: the advanced state plus the normalized message."""
+        return astuple(state) + (" ".join(user_input.lower().split()),)
+
+    async def respond(self, state: ConversationState, user_input: str) -> Reply:
+        return await self.respond_incrementally(state, user_input, None)
+
+    async def respond_incrementally(
+        self,
+        state: ConversationState,
+        user_input: str,
+        on_text: Optional[Callable[[str], None]],
+    ) -> Reply:
+        fallback = rule_based_reply(state, user_input)
+        key = self.cache_key(state, user_input)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            metrics.inc("lo_chatbot_backend_requests_total", outcome="cached")
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            metrics.inc("lo_chatbot_backend_requests_total", outcome="coalesced")
+            return await asyncio.shield(pending)
+
+        task = asyncio.ensure_future(
+            self._fetch(state, user_input, fallback, key, on_text)
+        )
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._inflight.pop(key, None)
+            else:
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+    async def _fetch(
+        self,
+        state: ConversationState,
+        user_input: str,
+        fallback: Reply,
+        key: Tuple[Any, ...],
+        on_text: Optional[Callable[[str], None]],
+    ) -> Reply:
+        if self._pool is None:
+            self._pool = _ConnectionPool(self.host, self.port, self.max_connections)
+        payload = {
+            "message": user_input,
+            "state": {
+                "stage": state.stage.name.lower(),
+                "subject": state.subject,
+                "level": state.level,
+                "measurement": state.measurement,
+                "blooms_level": state.blooms_level,
+            },
+            "draft": fallback.text,
+        }
+        try:
+            if on_text is None:
+                status, body = await asyncio.wait_for(
+                    self._pool.post_json(self.path, payload), self.timeout
+                )
+                text, objective = self._parse_reply(status, body)
+            else:
+                text, objective = await self._fetch_stream(payload, on_text)
+        except Exception as exc:
+            logger.warning("Model server failed, using rule-based reply: %r", exc)
+            metrics.inc("lo_chatbot_backend_requests_total", outcome="fallback")
+            return fallback
+
+        metrics.inc("lo_chatbot_backend_requests_total", outcome="ok")
+        reply = Reply("generated", (text,), objective or fallback.objective)
+        self._cache[key] = reply
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return reply
+
+    async def _fetch_stream(
+        self, payload: Dict[str, Any], on_text: Callable[[str], None]
+    ) -> Tuple[str, Optional[str]]:
+        """Request a streamed reply, passing each piece of text to ``on_text``."""
+        assert self._pool is not None
+        loop = asyncio.get_running_loop()
+        async with asyncio.timeout(self.timeout) as deadline:
+            async with self._pool.post(
+                self.path, {**payload, "stream": True}, accept="text/event-stream"
+            ) as response:
+                content_type = response.headers.get("content-type", "")
+                if response.status != 200 or not content_type.startswith(
+                    "text/event-stream"
+                ):
+                    body = json.loads(await response.read() or b"null")
+                    return self._parse_reply(response.status, body)
+
+                parts: List[str] = []
+                objective = None
+                async for event in _sse_events(response.chunks()):
+                    deadline.reschedule(loop.time() + self.timeout)
+                    delta = event.get("delta")
+                    if isinstance(delta, str) and delta:
+                        parts.append(delta)
+                        on_text(delta)
+                    objective = event.get("objective") or objective
+        if not parts:
+            raise ValueError("Model server streamed an empty reply")
+        return "".join(parts), objective
+
+    @staticmethod
+    def _parse_reply(status: int, body: Any) -> Tuple[str, Optional[str]]:
+        """Return (text, objective) from a JSON reply, or raise ValueError."""
+        if (
+            status != 200
+            or not isinstance(body, dict)
+            or not isinstance(body.get("response"), str)
+        ):
+            raise ValueError(f"Unexpected model server reply ({status})")
+        return body["response"], body.get("objective")
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _submit(coro: Awaitable[T]) -> "Future[T]":
+    """Schedule a coroutine on the shared background event loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="lo-chatbot-backend", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop)  # type: ignore[arg-type]
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the shared background event loop and wait for it."""
+    return _submit(coro).result()
+
+
+@functools.lru_cache(maxsize=1)
+def default_backend() -> ResponseBackend:
+    """Return the backend configured by the environment.
+
+    ``LO_CHATBOT_BACKEND_URL`` selects ``HTTPBackend`` (with
+    ``LO_CHATBOT_BACKEND_TIMEOUT`` and ``LO_CHATBOT_BACKEND_CONNECTIONS``);
+    otherwise the rule-based backend is used.
+    """
+    url = os.environ.get("LO_CHATBOT_BACKEND_URL")
+    if not url:
+        return RuleBasedBackend()
+    return HTTPBackend(
+        url,
+        timeout=float(os.environ.get("LO_CHATBOT_BACKEND_TIMEOUT", "2")),
+        max_connections=int(os.environ.get("LO_CHATBOT_BACKEND_CONNECTIONS", "10")),
+    )
@@ -0,0 +1,191 @@
+"""Vectorized analysis of many learning objectives at once."""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import functools
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+from learning_objectives_chatbot.matcher import Candidates, VerbMatcher, tokenize
+from learning_objectives_chatbot.taxonomy import Taxonomy, resolve_taxonomy
+from learning_objectives_chatbot.utils import CONDITION_WORDS, IMPROVEMENT_SUGGESTIONS
+
+ANALYSIS_COLUMNS = [
+    "objective",
+    "blooms_level",
+    "measurable",
+    "clarity_score",
+    "word_count",
+    "comma_count",
+    "suggestions",
+]
+
+_CONDITION_PATTERN = "|".join(re.escape(word) for word in CONDITION_WORDS)
+
+# Runs of characters that str.split() keeps together. The Arrow-backed "str"
+# dtype matches with RE2, whose \S differs from str.isspace(), so the
+# whitespace characters are listed explicitly
+_WORD_PATTERN = (
+    "[^\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000-\u200a"
+    "\u2028\u2029\u202f\u205f\u3000]+"
+)
+
+# Joins the texts of a column; lowercase text never contains it
+_ROW_SEPARATOR = "Z"
+
+
+@functools.lru_cache(maxsize=16)
+def _level_ranks(taxonomy: Taxonomy) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Return level names by rank and the highest level rank of each verb.
+
+    Rank 0 is reserved for objectives without any taxonomy verb. Reloaded
+    taxonomies are new objects, so they get fresh tables.
+    """
+    matcher = taxonomy.verb_matcher
+    names = np.array(["Unknown", *matcher.levels], dtype=object)
+    verb_ranks = {
+        verb: 1 + max(matcher.level_order[level] for level in levels)
+        for verb, levels in matcher.verb_levels.items()
+    }
+    return names, verb_ranks
+
+
+def verb_hits(lower: pd.Series, matcher: VerbMatcher) -> Tuple[np.ndarray, List[str]]:
+    """Find the verbs in a column of lowercase texts with one tokenizing pass.
+
+    Gives the same hits as ``VerbMatcher.find_all`` on each text. The texts
+    are joined around a separator token and tokenized at once, and every
+    distinct token is looked up once for the whole column.
+
+    Args:
+        lower: Lowercase texts
+        matcher: Matcher to look the tokens up in
+
+    Returns:
+        Tuple of (row number of each hit, base form of each verb), in row and
+        then text order
+    """
+    tokens = tokenize(f" {_ROW_SEPARATOR} ".join(lower.tolist()), _ROW_SEPARATOR)
+    table = {token: matcher.candidates(token) for token in set(tokens)}
+    table[_ROW_SEPARATOR] = None
+    found = list(map(table.__getitem__, tokens))
+
+    positions = list(itertools.compress(range(len(tokens)), found))
+    if not any(candidates[0][0] for candidates in table.values() if candidates):
+        # No multi-word verb starts in this column, so hits cannot overlap
+        verbs = [found[i][0][1] for i in positions]
+    else:
+        positions, verbs = _greedy_hits(tokens, found, positions)
+    separators = np.flatnonzero(np.array(tokens, dtype=object) == _ROW_SEPARATOR)
+    return np.searchsorted(separators, positions).astype(np.int64), verbs
+
+
+def _greedy_hits(
+    tokens: List[str], found: List[Optional[Candidates]], positions: List[int]
+) -> Tuple[List[int], List[str]]:
+    """Resolve overlapping candidates the way ``VerbMatcher.find_tokens`` does."""
+    hits: List[int] = []
+    verbs: List[str] = []
+    next_free = 0
+    for i in positions:
+        if i < next_free:
+            continue
+        for rest, verb in found[i]:  # type: ignore[union-attr]
+            # A phrase never spans rows, since no verb contains the separator
+            if not rest or tuple(tokens[i + 1 : i + 1 + len(rest)]) == rest:
+                hits.append(i)
+                verbs.append(verb)
+                next_free = i + 1 + len(rest)
+                break
+    return hits, verbs
+
+
+def analyze_objectives(
+    objectives: Union[Iterable[str], pd.Series],
+    taxonomy: Union[Taxonomy, str, None] = None,
+) -> pd.DataFrame:
+    """Analyze many learning objectives with vectorized string operations.
+
+    Produces the same results as calling ``analyze_objective`` and
+    ``suggest_improvements`` on each objective, one row per objective.
+
+    Args:
+        objectives: A list, iterator or Series of learning objectives. The
+            index of a Series is preserved in the result.
+        taxonomy: Taxonomy or taxonomy name to classify against (default:
+            ``LO_CHATBOT_TAXONOMY``, or Bloom's)
+
+    Returns:
+        DataFrame with the columns in ``ANALYSIS_COLUMNS``. The ``suggestions``
+        column holds a tuple of suggestion strings for each row.
+    """
+    if isinstance(objectives, pd.Series):
+        index = objectives.index
+        text = objectives.astype(object).fillna("")
+    else:
+        text = pd.Series(list(objectives), dtype=object)
+        index = text.index
+    # The "str" dtype is Arrow-backed when pyarrow is installed, which runs the
+    # string operations below in native code
+    text = text.astype("str").reset_index(drop=True)
+    lower = text.str.lower()
+    resolved = resolve_taxonomy(taxonomy)
+    level_names, verb_ranks = _level_ranks(resolved)
+
+    # Highest level per objective, from a single tokenizing pass
+    ranks = np.zeros(len(text), dtype=np.int64)
+    hit_rows, verbs = verb_hits(lower, resolved.verb_matcher)
+    np.maximum.at(
+        ranks, hit_rows, np.array([verb_ranks[verb] for verb in verbs], dtype=np.int64)
+    )
+    measurable = ranks > 0
+
+    word_count = text.str.count(_WORD_PATTERN).to_numpy(dtype=np.int64)
+    comma_count = text.str.count(",").to_numpy(dtype=np.int64)
+
+    clarity = (
+        5
+        + 2 * measurable
+        + (word_count >= 10)
+        + lower.str.contains("will be able to", regex=False).to_numpy(dtype=bool)
+        + lower.str.contains(_CONDITION_PATTERN).to_numpy(dtype=bool)
+        - (word_count > 30)
+        - (comma_count > 2)
+    )
+    clarity = np.clip(clarity, 1, 10)
+
+    # Encode which suggestions apply as a bitmask and map each code once
+    blooms_level = level_names[ranks]
+    checks = [
+        ("measurable", ~measurable),
+        ("clarity", clarity < 6),
+        ("blooms_level", ~measurable),
+        ("higher_order", (clarity < 8) & (ranks == 1)),
+    ]
+    codes = np.zeros(len(text), dtype=np.int64)
+    for bit, (_, mask) in enumerate(checks):
+        codes |= mask.astype(np.int64) << bit
+    suggestion_sets = {
+        code: tuple(
+            IMPROVEMENT_SUGGESTIONS[key]
+            for bit, (key, _) in enumerate(checks)
+            if code >> bit & 1
+        )
+        for code in np.unique(codes).tolist()
+    }
+
+    return pd.DataFrame(
+        {
+            "objective": text.to_numpy(),
+            "blooms_level": blooms_level,
+            "measurable": measurable,
+            "clarity_score": clarity,
+            "word_count": word_count,
+            "comma_count": comma_count,
+            "suggestions": pd.Series(codes).map(suggestion_sets).to_numpy(),
+        },
+        index=index,
+        columns=ANALYSIS_COLUMNS,
+    )
@@ -0,0 +1,137 @@
+"""Process-wide memoization of objective analysis results."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+import os
+import threading
+import time
+
+from learning_objectives_chatbot.taxonomy import Taxonomy, resolve_taxonomy
+from learning_objectives_chatbot.utils import analyze_objective, suggest_improvements
+
+
+class CacheStats(NamedTuple):
+    """Counters describing how an AnalysisCache has been used."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+def normalize_objective(objective: str) -> str:
+    """Return the cache key for an objective.
+
+    Analysis ignores case and surrounding whitespace, so objectives that only
+    differ in those share one entry.
+    """
+    return objective.strip().lower()
+
+
+def _copy_result(
+    analysis: Dict[str, Any], suggestions: List[str]
+) -> Tuple[Dict[str, Any], List[str]]:
+    return dict(analysis, suggestions=list(analysis["suggestions"])), list(suggestions)
+
+
+class AnalysisCache:
+    """Thread-safe LRU cache of analysis results and suggestions.
+
+    One instance is shared by every Streamlit session in the process, so
+    reruns and sessions that look at the same objective reuse the work.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of objectives kept before the least
+                recently used entry is evicted
+            ttl: Seconds an entry stays valid, or None to keep entries until
+                they are evicted
+            clock: Monotonic time source, replaceable for testing
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # Keyed by (taxonomy source hash, normalized objective)
+        self._entries: (
+            "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any], List[str]]]"
+        ) = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(
+        self, objective: str, taxonomy: Union[Taxonomy, str, None] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Return the analysis and improvement suggestions for an objective.
+
+        Args:
+            objective: The learning objective to analyze
+            taxonomy: Taxonomy or taxonomy name to analyze against. Entries
+                are keyed by the taxonomy's content, so a reloaded taxonomy
+                never sees results computed with its previous version.
+
+        Returns:
+            Tuple of (analysis, suggestions). Both are fresh copies, so callers
+            may modify them freely.
+        """
+        taxonomy = resolve_taxonomy(taxonomy)
+        text = normalize_objective(objective)
+        key = (taxonomy.source_hash, text)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return _copy_result(entry[1], entry[2])
+                del self._entries[key]
+                self._evictions += 1
+            self._misses += 1
+
+        # Compute outside the lock so slow analyses don't block other sessions
+        analysis = analyze_objective(text, taxonomy)
+        suggestions = suggest_improvements(analysis, taxonomy)
+
+        with self._lock:
+            self._entries[key] = (now, analysis, suggestions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return _copy_result(analysis, suggestions)
+
+    def stats(self) -> CacheStats:
+        """Return the hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+# Shared by every session in this process; sized from the environment
+analysis_cache = AnalysisCache(
+    maxsize=int(os.environ.get("LO_CHATBOT_CACHE_SIZE", "1024")),
+    ttl=(
+        float(os.environ["LO_CHATBOT_CACHE_TTL"])
+        if os.environ.get("LO_CHATBOT_CACHE_TTL")
+        else None
+    ),
+)
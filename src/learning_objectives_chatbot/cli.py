@@ -0,0 +1,474 @@
+"""Command line interface for the Learning Objectives Chatbot."""
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    as_completed,
+    wait,
+)
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TextIO,
+)
+import argparse
+import collections
+import csv
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+
+from learning_objectives_chatbot.scoring import Chunk, score_chunk
+from learning_objectives_chatbot.taxonomy import available_taxonomies
+
+
+def read_objectives(stream: TextIO, fmt: str, field: str) -> Iterator[str]:
+    """Lazily read objectives from a text stream.
+
+    Args:
+        stream: Open text stream to read from
+        fmt: One of "csv", "jsonl" or "text" (one objective per line)
+        field: Column (CSV) or key (JSONL) holding the objective
+
+    Returns:
+        Iterator over the objectives, skipping blank lines
+
+    Raises:
+        ValueError: If the CSV has no such column, or a row has no value for
+            it; the message gives the line number
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if reader.fieldnames is not None and field not in reader.fieldnames:
+            raise ValueError(f"CSV input has no '{field}' column")
+        for record in reader:
+            # Short rows leave the missing columns as None
+            if record[field] is None:
+                raise ValueError(f"Line {reader.line_num}: no '{field}' value")
+            yield record[field]
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"Line {number}: invalid JSON ({exc})") from None
+            value = record.get(field) if isinstance(record, dict) else None
+            if not isinstance(value, str):
+                raise ValueError(f"Line {number}: no '{field}' string")
+            yield value
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def chunked(objectives: Iterable[str], size: int) -> Iterator[Chunk]:
+    """Split numbered objectives into lists of at most `size` items."""
+    numbered = enumerate(objectives)
+    while True:
+        chunk = list(itertools.islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_stream(
+    chunks: Iterable[Chunk],
+    executor: Optional[Executor],
+    max_pending: int,
+    ordered: bool = True,
+    taxonomy: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Score chunks in parallel, keeping at most `max_pending` chunks in flight.
+
+    Args:
+        chunks: Chunks of numbered objectives
+        executor: Executor to fan chunks out to, or None to score inline
+        max_pending: Maximum number of submitted but unwritten chunks
+        ordered: If True, results come back in input order. Otherwise they are
+            yielded as soon as any chunk finishes.
+        taxonomy: Name of the taxonomy to score against
+
+    Returns:
+        Iterator over result records
+    """
+    score = functools.partial(score_chunk, taxonomy=taxonomy)
+    if executor is None:
+        for chunk in chunks:
+            yield from score(chunk)
+        return
+
+    if ordered:
+        queue: collections.deque[Future] = collections.deque()
+        for chunk in chunks:
+            if len(queue) >= max_pending:
+                yield from queue.popleft().result()
+            queue.append(executor.submit(score, chunk))
+        while queue:
+            yield from queue.popleft().result()
+    else:
+        pending: set[Future] = set()
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(executor.submit(score, chunk))
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def _fail(command: str, message: object) -> int:
+    """Report a problem with a command's input and return the exit status."""
+    print(f"lo-chatbot {command}: error: {message}", file=sys.stderr)
+    return 1
+
+
+def _detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "text"
+
+
+def score_command(args: argparse.Namespace) -> int:
+    """Run the `score` subcommand."""
+    fmt = args.format or ("text" if args.input == "-" else _detect_format(args.input))
+    source = (
+        sys.stdin
+        if args.input == "-"
+        else open(args.input, newline="", encoding="utf-8")
+    )
+    sink = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+
+    workers = (os.cpu_count() or 1) if args.workers is None else args.workers
+    executor = None
+    if workers > 0:
+        # Only loaded when needed, so inline runs start faster
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        chunks = chunked(read_objectives(source, fmt, args.field), args.chunk_size)
+        for record in score_stream(
+            chunks, executor, 2 * max(workers, 1), not args.unordered, args.taxonomy
+        ):
+            sink.write(json.dumps(record) + "\n")
+    except ValueError as exc:
+        return _fail("score", exc)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    """Run the `serve` subcommand."""
+    # Imported here so `score` does not pay for the server module
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    import asyncio
+
+    from learning_objectives_chatbot.server import ChatAPI
+    from learning_objectives_chatbot.sessions import SessionStore
+
+    logging.basicConfig(level=logging.INFO)
+    # As with `score`, 0 workers keeps analysis in this process, on a thread
+    # so the event loop stays free
+    executor = (
+        ThreadPoolExecutor(max_workers=1)
+        if args.workers == 0
+        else ProcessPoolExecutor(max_workers=args.workers)
+    )
+    sessions = SessionStore(
+        max_bytes=args.session_memory_mb * 1024 * 1024,
+        idle_timeout=args.session_idle_timeout,
+    )
+    try:
+        asyncio.run(ChatAPI(executor, sessions).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_examples_command(args: argparse.Namespace) -> int:
+    """Run the `build-examples` subcommand."""
+    from learning_objectives_chatbot.examples import ExampleCorpus
+
+    fmt = args.format or ("text" if args.input == "-" else _detect_format(args.input))
+    source = (
+        sys.stdin
+        if args.input == "-"
+        else open(args.input, newline="", encoding="utf-8")
+    )
+    try:
+        corpus = ExampleCorpus.build(
+            read_objectives(source, fmt, args.field), taxonomy=args.taxonomy
+        )
+    except ValueError as exc:
+        return _fail("build-examples", exc)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    corpus.save(args.output)
+    return 0
+
+
+def dedup_command(args: argparse.Namespace) -> int:
+    """Run the `dedup` subcommand."""
+    from learning_objectives_chatbot.dedup import DEFAULT_THRESHOLD, find_duplicates
+
+    fmt = args.format or ("text" if args.input == "-" else _detect_format(args.input))
+    source = (
+        sys.stdin
+        if args.input == "-"
+        else open(args.input, newline="", encoding="utf-8")
+    )
+    try:
+        objectives = list(read_objectives(source, fmt, args.field))
+    except ValueError as exc:
+        return _fail("dedup", exc)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    clusters = find_duplicates(objectives, threshold)
+    sink = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    try:
+        for row, (objective, first) in enumerate(zip(objectives, clusters.tolist())):
+            if args.all or first != row:
+                record = {
+                    "row": row,
+                    "objective": objective,
+                    "duplicate_of": None if first == row else first,
+                }
+                sink.write(json.dumps(record) + "\n")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+def align_command(args: argparse.Namespace) -> int:
+    """Run the `align` subcommand."""
+    import pandas as pd
+
+    from learning_objectives_chatbot.alignment import alignment_report
+
+    fmt = args.format or _detect_format(args.input)
+    if fmt not in ("csv", "jsonl"):
+        return _fail(
+            "align", "alignment reports need CSV or JSONL input with course IDs"
+        )
+    try:
+        if fmt == "csv":
+            frame = pd.read_csv(args.input, keep_default_na=False)
+        else:
+            frame = pd.read_json(args.input, lines=True)
+    except ValueError as exc:
+        return _fail("align", f"could not read {args.input}: {exc}")
+    by = args.by or ["course_id"]
+    missing = [column for column in (args.field, *by) if column not in frame.columns]
+    if missing:
+        return _fail("align", f"input has no {', '.join(map(repr, missing))} column")
+    frame = frame.rename(columns={args.field: "objective"})
+
+    report = alignment_report(frame, by=by, taxonomy=args.taxonomy)
+    os.makedirs(args.output, exist_ok=True)
+    for name, table in report._asdict().items():
+        table.to_csv(
+            os.path.join(args.output, f"{name}.csv"),
+            index=name in ("summary", "levels"),
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the `lo-chatbot` command."""
+    parser = argparse.ArgumentParser(
+        prog="lo-chatbot", description="Learning Objectives Chatbot tools"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser(
+        "score", help="Analyze objectives in bulk and write JSON lines"
+    )
+    score.add_argument(
+        "input", nargs="?", default="-", help="CSV, JSONL or text file (default: stdin)"
+    )
+    score.add_argument(
+        "--format",
+        choices=["csv", "jsonl", "text"],
+        help="Input format (default: from the file extension, text for stdin)",
+    )
+    score.add_argument(
+        "--field", default="objective", help="CSV column or JSON key with the objective"
+    )
+    score.add_argument(
+        "-o", "--output", default="-", help="Output file (default: stdout)"
+    )
+    score.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: CPU count, 0 scores in-process)",
+    )
+    score.add_argument(
+        "--chunk-size", type=int, default=1000, help="Objectives per chunk"
+    )
+    score.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write results as chunks finish instead of in input order",
+    )
+    score.add_argument(
+        "--taxonomy",
+        help="Taxonomy to score against (default: LO_CHATBOT_TAXONOMY or blooms)",
+    )
+    score.set_defaults(handler=score_command)
+
+    serve = commands.add_parser("serve", help="Run the headless HTTP API")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    serve.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    serve.add_argument(
+        "--workers",
+        type=int,
+        help="Processes for batch analysis (default: CPU count, 0 analyzes in-process)",
+    )
+    serve.add_argument(
+        "--session-memory-mb",
+        type=int,
+        default=64,
+        help="Memory budget for all chat sessions, in MiB",
+    )
+    serve.add_argument(
+        "--session-idle-timeout",
+        type=float,
+        help="Seconds before an inactive session is evicted (default: never)",
+    )
+    serve.set_defaults(handler=serve_command)
+
+    build_examples = commands.add_parser(
+        "build-examples", help="Pack vetted objectives into an example corpus"
+    )
+    build_examples.add_argument(
+        "input", nargs="?", default="-", help="CSV, JSONL or text file (default: stdin)"
+    )
+    build_examples.add_argument(
+        "--format",
+        choices=["csv", "jsonl", "text"],
+        help="Input format (default: from the file extension, text for stdin)",
+    )
+    build_examples.add_argument(
+        "--field", default="objective", help="CSV column or JSON key with the objective"
+    )
+    build_examples.add_argument(
+        "-o", "--output", required=True, help="Corpus file to write (.npz)"
+    )
+    build_examples.add_argument(
+        "--taxonomy",
+        help="Taxonomy to classify the examples against (default: LO_CHATBOT_TAXONOMY or blooms)",
+    )
+    build_examples.set_defaults(handler=build_examples_command)
+
+    dedup = commands.add_parser(
+        "dedup", help="Find exact and near-duplicate objectives in a catalog"
+    )
+    dedup.add_argument(
+        "input", nargs="?", default="-", help="CSV, JSONL or text file (default: stdin)"
+    )
+    dedup.add_argument(
+        "--format",
+        choices=["csv", "jsonl", "text"],
+        help="Input format (default: from the file extension, text for stdin)",
+    )
+    dedup.add_argument(
+        "--field", default="objective", help="CSV column or JSON key with the objective"
+    )
+    dedup.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="Similarity (0-1) at which objectives are duplicates; 1 for exact only "
+        "(default: LO_CHATBOT_DEDUP_THRESHOLD or 0.8)",
+    )
+    dedup.add_argument(
+        "--all",
+        action="store_true",
+        help="Write every objective, not only the duplicates",
+    )
+    dedup.add_argument(
+        "-o", "--output", default="-", help="Output file (default: stdout)"
+    )
+    dedup.set_defaults(handler=dedup_command)
+
+    align = commands.add_parser(
+        "align", help="Write course alignment reports for tagged objectives"
+    )
+    align.add_argument("input", help="CSV or JSONL file with objectives and course IDs")
+    align.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="Input format (default: from the file extension)",
+    )
+    align.add_argument(
+        "--field", default="objective", help="CSV column or JSON key with the objective"
+    )
+    align.add_argument(
+        "--by",
+        action="append",
+        help="Column to group by; repeat for nested groups (default: course_id)",
+    )
+    align.add_argument(
+        "-o", "--output", required=True, help="Directory for the report CSV files"
+    )
+    align.add_argument(
+        "--taxonomy",
+        help="Taxonomy whose levels are reported (default: LO_CHATBOT_TAXONOMY or blooms)",
+    )
+    align.set_defaults(handler=align_command)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the `lo-chatbot` console script."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "chunk_size", 1) < 1:
+        parser.error("--chunk-size must be at least 1")
+    threshold = getattr(args, "threshold", None)
+    if threshold is not None and not 0 < threshold <= 1:
+        parser.error("--threshold must be between 0 and 1")
+    # Checked here so a typo fails at once, not inside a worker process
+    taxonomy = getattr(args, "taxonomy", None)
+    if taxonomy is not None and taxonomy not in available_taxonomies():
+        parser.error(
+            f"unknown taxonomy '{taxonomy}' "
+            f"(choose from {', '.join(available_taxonomies())})"
+        )
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""Exact and near-duplicate detection for learning objectives.
+
+Exact duplicates are found with a hash set of normalized text. Near
+duplicates are found with MinHash signatures over byte shingles and
+locality-sensitive hashing (LSH): signatures are split into bands, and only
+objectives that share a band are compared, so large catalogs never need a
+pairwise comparison.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+
+import numpy as np
+
+# Jaccard similarity of shingle sets at or above which objectives are duplicates
+DEFAULT_THRESHOLD = float(os.environ.get("LO_CHATBOT_DEDUP_THRESHOLD", "0.8"))
+
+# Length of the shingles, in bytes of normalized UTF-8 text
+SHINGLE_SIZE = 5
+
+# Number of MinHash permutations per signature
+NUM_PERM = 128
+
+# Shingles hashed per block when computing signatures in bulk
+_BLOCK_SIZE = 4096
+
+
+def normalize_text(objective: str) -> str:
+    """Return the text used for duplicate detection (lowercase, single spaces)."""
+    return " ".join(objective.lower().split())
+
+
+def _shingle_hashes(
+    texts: List[str], size: int = SHINGLE_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the byte shingles of normalized texts and each text's count.
+
+    A shingle of up to 8 bytes is used directly as its own 64-bit hash, so
+    shingling needs no per-shingle Python work. Texts shorter than `size`
+    are padded with spaces so every text has at least one shingle.
+    """
+    encoded = [normalize_text(text).ljust(size).encode() for text in texts]
+    lengths = np.array([len(b) - size + 1 for b in encoded], dtype=np.int64)
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(blob, size)
+    hashes = windows @ (np.uint64(1) << (np.arange(size, dtype=np.uint64) * 8))
+    # Drop the windows that straddle two texts
+    text_end = np.cumsum([len(b) for b in encoded])
+    keep = np.ones(len(hashes), dtype=bool)
+    for offset in range(1, size):
+        keep[text_end[:-1] - offset] = False
+    return hashes[keep], lengths
+
+
+def shingles(objective: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Return the unique hashed byte shingles of an objective."""
+    return np.unique(_shingle_hashes([objective], size)[0])
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """Choose (bands, rows) so the LSH S-curve rises just below `threshold`.
+
+    Objectives with Jaccard similarity ``s`` share at least one band with
+    probability ``1 - (1 - s**rows)**bands``, which rises steeply around
+    ``(1 / bands) ** (1 / rows)``. The highest such midpoint that is not
+    above the threshold is chosen, so pairs at the threshold are almost
+    always candidates; every candidate is confirmed against the signature
+    similarity anyway.
+    """
+    candidates = [
+        (num_perm // rows, rows)
+        for rows in range(1, num_perm + 1)
+        if not num_perm % rows
+    ]
+
+    def midpoint(br: Tuple[int, int]) -> float:
+        return (1 / br[0]) ** (1 / br[1])
+
+    below = [br for br in candidates if midpoint(br) <= threshold]
+    return max(below, key=midpoint) if below else min(candidates, key=midpoint)
+
+
+class MinHasher:
+    """Computes MinHash signatures with seeded multiply-shift hash functions."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    def _permute(self, hashes: np.ndarray) -> np.ndarray:
+        # (a * x + b) mod 2**64, keeping the well-mixed high 32 bits; one row
+        # per permutation so the reductions below run over contiguous memory
+        with np.errstate(over="ignore"):
+            mixed = self._a[:, None] * hashes
+            mixed += self._b[:, None]
+        mixed >>= np.uint64(32)
+        return mixed
+
+    def signature(self, objective: str) -> np.ndarray:
+        """Return the signature of one objective."""
+        return self._permute(shingles(objective)).min(axis=1)
+
+    def signatures(self, objectives: List[str]) -> np.ndarray:
+        """Return an (n, num_perm) array of signatures, hashing in blocks."""
+        result = np.empty((len(objectives), self.num_perm), dtype=np.uint64)
+        if not objectives:
+            return result
+        hashes, lengths = _shingle_hashes(objectives)
+        starts = np.cumsum(lengths) - lengths
+
+        # Blocks cover whole objectives so each reduceat segment is one objective
+        block_ends = np.searchsorted(starts, np.arange(0, len(hashes), _BLOCK_SIZE)[1:])
+        for first, last in zip(
+            np.concatenate([[0], block_ends]), np.append(block_ends, len(objectives))
+        ):
+            if first == last:
+                continue
+            stop = starts[last] if last < len(objectives) else len(hashes)
+            block = self._permute(hashes[starts[first] : stop])
+            result[first:last] = np.minimum.reduceat(
+                block, starts[first:last] - starts[first], axis=1
+            ).T
+        return result
+
+
+def similarity(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Estimate Jaccard similarity from MinHash signatures (row-wise)."""
+    return (left == right).mean(axis=-1)
+
+
+class DedupIndex:
+    """Incremental duplicate detector, for example for a session's history.
+
+    Lookups hash the normalized text for exact duplicates and probe one
+    bucket per LSH band for near duplicates, so they do not scan the entries.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = NUM_PERM,
+        hasher: Optional[MinHasher] = None,
+    ) -> None:
+        """Create an empty index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of duplicates;
+                1.0 only detects exact (normalized) duplicates
+            num_perm: MinHash permutations per signature
+            hasher: Shared MinHasher, created from `num_perm` if not given
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm) if hasher is None else hasher
+        self.bands, self.rows = lsh_params(threshold, self.hasher.num_perm)
+        self._exact: Dict[str, int] = {}
+        self._signatures: List[np.ndarray] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _lookup(self, objective: str) -> Tuple[Optional[int], str, np.ndarray]:
+        key = normalize_text(objective)
+        match = self._exact.get(key)
+        if match is not None or self.threshold >= 1:
+            return match, key, np.zeros(0, dtype=np.uint64)
+        signature = self.hasher.signature(objective)
+        candidates = sorted(
+            {
+                entry
+                for band, band_key in enumerate(self._band_keys(signature))
+                for entry in self._buckets[band].get(band_key, ())
+            }
+        )
+        if candidates:
+            scores = similarity(
+                np.stack([self._signatures[c] for c in candidates]), signature
+            )
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                match = candidates[best]
+        return match, key, signature
+
+    def find(self, objective: str) -> Optional[int]:
+        """Return the position of an existing duplicate of `objective`, or None."""
+        return self._lookup(objective)[0]
+
+    def add(self, objective: str) -> Optional[int]:
+        """Add an objective unless it duplicates an existing entry.
+
+        Returns:
+            The position of the existing duplicate, or None if it was added
+        """
+        match, key, signature = self._lookup(objective)
+        if match is not None:
+            return match
+        position = len(self._signatures)
+        self._exact[key] = position
+        self._signatures.append(signature)
+        if len(signature):
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(band_key, []).append(position)
+        return None
+
+
+def _bucket_matches(
+    keys: np.ndarray, signatures: np.ndarray, threshold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the confirmed duplicate pairs among rows with equal band keys.
+
+    Each round compares every unmatched member of a bucket with the first
+    unmatched member; members that do not match it are compared again in
+    the next round. Any two members of a bucket are compared unless one of
+    them already matched, and rounds stay few when buckets hold a handful
+    of clusters.
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    new_run = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+    run = np.cumsum(new_run)
+    run_size = np.bincount(run)
+
+    lefts, rights = [], []
+    pending = np.flatnonzero(run_size[run] > 1)
+    while len(pending):
+        pending_run = run[pending]
+        first = np.concatenate([[True], pending_run[1:] != pending_run[:-1]])
+        reference = pending[first][np.cumsum(first) - 1][~first]
+        pending = pending[~first]
+        left, right = order[reference], order[pending]
+        matched = np.zeros(len(pending), dtype=bool)
+        for start in range(0, len(pending), _BLOCK_SIZE):
+            stop = start + _BLOCK_SIZE
+            matched[start:stop] = (
+                similarity(signatures[left[start:stop]], signatures[right[start:stop]])
+                >= threshold
+            )
+        lefts.append(left[matched])
+        rights.append(right[matched])
+        pending = pending[~matched]
+    if not lefts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(lefts), np.concatenate(rights)
+
+
+def find_duplicates(
+    objectives: Iterable[str],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = NUM_PERM,
+) -> np.ndarray:
+    """Group a catalog of objectives into duplicate clusters.
+
+    Exact duplicates are merged first; the remaining objectives are bucketed
+    by LSH band, members of each bucket are checked against each other's
+    signature similarity, and confirmed pairs are merged with union-find.
+
+    Args:
+        objectives: The catalog
+        threshold: Minimum estimated Jaccard similarity of duplicates
+        num_perm: MinHash permutations per signature
+
+    Returns:
+        For each objective, the index of the first objective in its cluster
+        (its own index if it is not a duplicate)
+    """
+    objectives = list(objectives)
+    parent = np.arange(len(objectives))
+
+    first_seen: Dict[str, int] = {}
+    unique_rows = []
+    for i, objective in enumerate(objectives):
+        j = first_seen.setdefault(normalize_text(objective), i)
+        if j == i:
+            unique_rows.append(i)
+        else:
+            parent[i] = j
+    if threshold >= 1 or len(unique_rows) < 2:
+        return parent
+
+    rows_index = np.array(unique_rows)
+    signatures = MinHasher(num_perm).signatures([objectives[i] for i in unique_rows])
+    bands, rows = lsh_params(threshold, num_perm)
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    with np.errstate(over="ignore"):
+        coefficients = np.random.default_rng(0).integers(
+            1, 2**63, rows, dtype=np.uint64
+        )
+        band_keys = [
+            signatures[:, band * rows : (band + 1) * rows] @ coefficients
+            for band in range(bands)
+        ]
+    for keys in band_keys:
+        left, right = _bucket_matches(keys, signatures, threshold)
+        left, right = rows_index[left], rows_index[right]
+        # Skip pairs that earlier bands already merged
+        roots = parent.copy()
+        while not np.array_equal(roots, roots[roots]):
+            roots = roots[roots]
+        merged = roots[left] == roots[right]
+        for i, j in zip(left[~merged], right[~merged]):
+            ri, rj = root(i), root(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    return np.array([root(i) for i in range(len(objectives))])
@@ -0,0 +1,323 @@
+"""Indexed corpus of example objectives with nearest-example lookup.
+
+A corpus is stored as an uncompressed ``.npz`` file of flat NumPy arrays:
+the objective text as one UTF-8 blob plus offsets, the precomputed analysis
+columns, and an inverted index over hashed word and character n-grams
+weighted by TF-IDF. Arrays are only read from disk when first used.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+import functools
+import os
+import re
+import zlib
+
+import numpy as np
+
+from learning_objectives_chatbot.batch import analyze_objectives
+from learning_objectives_chatbot.taxonomy import Taxonomy, resolve_taxonomy
+from learning_objectives_chatbot.utils import SAMPLE_OBJECTIVES
+
+# Bumped whenever the packed layout or the features change
+CORPUS_FORMAT_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def text_features(text: str) -> List[int]:
+    """Return hashed word unigram, word bigram and character trigram features.
+
+    Hashing uses CRC32 so feature IDs are stable across processes.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    grams = [f"w:{token}" for token in tokens]
+    grams += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f"#{token}#"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return [zlib.crc32(gram.encode()) for gram in grams]
+
+
+def _keyword_feature(word: str) -> int:
+    return zlib.crc32(f"w:{word.lower()}".encode())
+
+
+class ExampleCorpus:
+    """Example objectives with precomputed analysis and search indexes."""
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]) -> None:
+        """Wrap packed corpus arrays.
+
+        Args:
+            arrays: Arrays produced by ``build`` or an opened ``.npz`` file,
+                whose members are read lazily on first access
+        """
+        self._arrays = arrays
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def _get(self, name: str) -> np.ndarray:
+        array = self._cache.get(name)
+        if array is None:
+            array = self._cache[name] = self._arrays[name]
+        return array
+
+    @classmethod
+    def build(
+        cls,
+        objectives: Iterable[str],
+        categories: Optional[Sequence[str]] = None,
+        taxonomy: Union[Taxonomy, str, None] = None,
+    ) -> "ExampleCorpus":
+        """Analyze and index a collection of objectives.
+
+        Args:
+            objectives: The example objectives
+            categories: Optional category label for each objective
+            taxonomy: Taxonomy or taxonomy name to classify against (default:
+                ``LO_CHATBOT_TAXONOMY``, or Bloom's)
+
+        Returns:
+            A new in-memory corpus
+        """
+        objectives = list(objectives)
+        n = len(objectives)
+        taxonomy = resolve_taxonomy(taxonomy)
+        matcher = taxonomy.verb_matcher
+        analysis = analyze_objectives(objectives, taxonomy)
+
+        encoded = [obj.encode() for obj in objectives]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+        category_names, category_codes = np.unique(
+            np.array(categories if categories is not None else [""] * n, dtype=str),
+            return_inverse=True,
+        )
+        level_names = np.array(["Unknown", *matcher.levels])
+        level_order = {name: i for i, name in enumerate(level_names)}
+        level_codes = np.array(
+            [level_order[level] for level in analysis["blooms_level"]], dtype=np.int8
+        )
+
+        verb_names = np.array(sorted(matcher.verb_levels))
+        verb_index = {verb: i for i, verb in enumerate(verb_names)}
+        verb_codes = np.full(n, -1, dtype=np.int16)
+        rows, features = [], []
+        for i, objective in enumerate(objectives):
+            verbs = matcher.find_verbs(objective)
+            if verbs:
+                verb_codes[i] = verb_index[verbs[0]]
+            doc_features = text_features(objective)
+            rows.append(np.full(len(doc_features), i, dtype=np.uint64))
+            features.append(np.array(doc_features, dtype=np.uint64))
+        row = np.concatenate(rows) if rows else np.zeros(0, dtype=np.uint64)
+        feature = np.concatenate(features) if features else np.zeros(0, dtype=np.uint64)
+
+        # Term frequencies per (feature, row), then document frequencies;
+        # pairs are packed into one 64-bit key so np.unique stays 1-D
+        pairs, tf = np.unique((feature << np.uint64(32)) | row, return_counts=True)
+        pair_feature, pair_row = pairs >> np.uint64(32), pairs & np.uint64(0xFFFFFFFF)
+        unique_features, doc_freq = np.unique(pair_feature, return_counts=True)
+        idf = (np.log((1 + n) / (1 + doc_freq)) + 1).astype(np.float32)
+        weights = tf * np.repeat(idf, doc_freq)
+        norms = np.sqrt(np.bincount(pair_row, weights=weights**2, minlength=n))
+        weights = weights / np.where(norms > 0, norms, 1)[pair_row]
+
+        feature_ptr = np.zeros(len(unique_features) + 1, dtype=np.int64)
+        np.cumsum(doc_freq, out=feature_ptr[1:])
+
+        return cls(
+            {
+                "version": np.array([CORPUS_FORMAT_VERSION]),
+                "text_blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                "text_offsets": offsets,
+                "category_names": category_names,
+                "category_codes": category_codes.astype(np.int32),
+                "level_names": level_names,
+                "level_codes": level_codes,
+                "verb_names": verb_names,
+                "verb_codes": verb_codes,
+                "measurable": analysis["measurable"].to_numpy(dtype=bool),
+                "clarity_score": analysis["clarity_score"].to_numpy(dtype=np.int8),
+                "features": unique_features.astype(np.uint32),
+                "feature_ptr": feature_ptr,
+                "idf": idf,
+                "posting_rows": pair_row.astype(np.int32),
+                "posting_weights": weights.astype(np.float32),
+            }
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ExampleCorpus":
+        """Open a packed corpus; arrays are read from disk on first use."""
+        arrays = np.load(path, allow_pickle=False)
+        version = int(arrays["version"][0])
+        if version != CORPUS_FORMAT_VERSION:
+            raise ValueError(
+                f"Corpus {path} has format version {version}, "
+                f"expected {CORPUS_FORMAT_VERSION}"
+            )
+        return cls(arrays)
+
+    def save(self, path: str) -> None:
+        """Write the corpus as an uncompressed ``.npz`` file."""
+        np.savez(path, **{name: self._get(name) for name in self._arrays})
+
+    def __len__(self) -> int:
+        return len(self._get("text_offsets")) - 1
+
+    def objective(self, row: int) -> str:
+        """Return the text of one example."""
+        offsets = self._get("text_offsets")
+        return (
+            self._get("text_blob")[offsets[row] : offsets[row + 1]].tobytes().decode()
+        )
+
+    def entry(self, row: int) -> Dict[str, Any]:
+        """Return one example with its precomputed analysis."""
+        verb_code = int(self._get("verb_codes")[row])
+        return {
+            "objective": self.objective(row),
+            "category": str(
+                self._get("category_names")[self._get("category_codes")[row]]
+            ),
+            "blooms_level": str(
+                self._get("level_names")[self._get("level_codes")[row]]
+            ),
+            "verb": None if verb_code < 0 else str(self._get("verb_names")[verb_code]),
+            "measurable": bool(self._get("measurable")[row]),
+            "clarity_score": int(self._get("clarity_score")[row]),
+        }
+
+    def by_level(self, level: str) -> np.ndarray:
+        """Return the rows whose Bloom's level is `level`."""
+        matches = np.flatnonzero(self._get("level_names") == level)
+        if not len(matches):
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self._get("level_codes") == matches[0])
+
+    def by_verb(self, verb: str) -> np.ndarray:
+        """Return the rows whose leading action verb is `verb`."""
+        matches = np.flatnonzero(self._get("verb_names") == verb.lower())
+        if not len(matches):
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self._get("verb_codes") == matches[0])
+
+    def by_keyword(self, word: str) -> np.ndarray:
+        """Return the rows containing `word` (for example a subject keyword)."""
+        word = word.lower()
+        rows = self._postings(np.array([_keyword_feature(word)], dtype=np.uint32))[0]
+        # Features are 32-bit hashes, so other words can share one; confirm
+        # each hit against the example's tokens
+        confirmed = [
+            row
+            for row in rows.tolist()
+            if word in _TOKEN_PATTERN.findall(self.objective(row).lower())
+        ]
+        return np.sort(np.array(confirmed, dtype=rows.dtype))
+
+    def _postings(self, query: np.ndarray) -> Any:
+        """Gather the posting lists of sorted, unique query features.
+
+        Returns:
+            Tuple of (rows, weights, per-feature hit mask, posting lengths of
+            the features that were found)
+        """
+        features = self._get("features")
+        ptr = self._get("feature_ptr")
+        slots = np.searchsorted(features, query)
+        hit = slots < len(features)
+        hit[hit] = features[slots[hit]] == query[hit]
+        found = slots[hit]
+        starts = ptr[found]
+        lengths = ptr[found + 1] - starts
+        index = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+        return (
+            self._get("posting_rows")[index],
+            self._get("posting_weights")[index],
+            hit,
+            lengths,
+        )
+
+    def nearest(self, objective: str, k: int = 3) -> List[Dict[str, Any]]:
+        """Return the `k` examples most similar to an objective.
+
+        Similarity is the cosine between TF-IDF weighted hashed n-gram
+        vectors, computed over the inverted index in one vectorized pass.
+
+        Args:
+            objective: The draft objective to compare
+            k: Number of examples to return
+
+        Returns:
+            Example entries with an added ``score``, best match first
+        """
+        query, counts = np.unique(
+            np.array(text_features(objective), dtype=np.uint32), return_counts=True
+        )
+        rows, weights, hit, lengths = self._postings(query)
+        if not len(rows):
+            return []
+        found = np.searchsorted(self._get("features"), query[hit])
+        query_weights = counts[hit] * self._get("idf")[found]
+        query_weights = query_weights / np.linalg.norm(query_weights)
+        scores = np.bincount(
+            rows,
+            weights=weights * np.repeat(query_weights, lengths),
+            minlength=len(self),
+        )
+        k = min(k, int(np.count_nonzero(scores)))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [dict(self.entry(int(row)), score=float(scores[row])) for row in top]
+
+
+def default_corpus(taxonomy: Union[Taxonomy, str, None] = None) -> ExampleCorpus:
+    """Return the shared example corpus, loading it on first use.
+
+    Uses the packed corpus at ``LO_CHATBOT_EXAMPLES`` if set, otherwise the
+    built-in sample objectives, analyzed against the given taxonomy (default:
+    ``LO_CHATBOT_TAXONOMY``, or Bloom's). A reloaded taxonomy gets a freshly
+    built corpus.
+    """
+    path = os.environ.get("LO_CHATBOT_EXAMPLES")
+    if path:
+        return _load_corpus(path)
+    return _sample_corpus(resolve_taxonomy(taxonomy))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_corpus(path: str) -> ExampleCorpus:
+    return ExampleCorpus.load(path)
+
+
+@functools.lru_cache(maxsize=4)
+def _sample_corpus(taxonomy: Taxonomy) -> ExampleCorpus:
+    categories = [
+        category
+        for category, objectives in SAMPLE_OBJECTIVES.items()
+        for _ in objectives
+    ]
+    objectives = [
+        obj for objectives in SAMPLE_OBJECTIVES.values() for obj in objectives
+    ]
+    return ExampleCorpus.build(objectives, categories, taxonomy)
+
+
+def nearest_examples(
+    objective: str, k: int = 3, taxonomy: Union[Taxonomy, str, None] = None
+) -> List[Dict[str, Any]]:
+    """Return the `k` well-formed examples closest to a draft objective.
+
+    Args:
+        objective: The draft objective
+        k: Number of examples to return
+        taxonomy: Taxonomy the built-in examples are analyzed against
+            (default as in ``default_corpus``)
+
+    Returns:
+        Example entries with precomputed analysis and a similarity ``score``
+    """
+    return default_corpus(taxonomy).nearest(objective, k)
@@ -0,0 +1,140 @@
+"""Batch generation of draft learning objectives.
+
+Produces the same objectives as ``generate_sample_objective``, but resolves
+each distinct subject, level and (measurement, level) pair only once and
+assembles the objectives with array operations, so generating tens of
+thousands of drafts costs little more than generating a few hundred.
+"""
+
+from typing import Iterable, Iterator, Sequence, Tuple, Union
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from learning_objectives_chatbot.utils import (
+    OBJECTIVE_TEMPLATE,
+    extract_action_verb,
+    get_blooms_level,
+    subject_content,
+)
+
+GENERATED_COLUMNS = [
+    "subject",
+    "level",
+    "measurement",
+    "blooms_level",
+    "verb",
+    "objective",
+]
+
+Column = Union[Sequence[str], pd.Series]
+
+
+def _factorize(values: Column) -> Tuple[np.ndarray, np.ndarray]:
+    codes, uniques = pd.factorize(
+        pd.Series(values, dtype=object), use_na_sentinel=False
+    )
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def generate_objectives(
+    subjects: Column, levels: Column, measurements: Column
+) -> pd.DataFrame:
+    """Generate one objective per row of aligned subjects, levels and measurements.
+
+    Columns of a DataFrame can be passed directly, for example
+    ``generate_objectives(df["subject"], df["level"], df["measurement"])``.
+
+    Args:
+        subjects: Subject area of each objective
+        levels: Learning level description of each objective
+        measurements: How learning will be measured for each objective
+
+    Returns:
+        DataFrame with the columns in ``GENERATED_COLUMNS``. The index of
+        ``subjects`` is kept if it is a Series.
+    """
+    if not len(subjects) == len(levels) == len(measurements):
+        raise ValueError("subjects, levels and measurements must have the same length")
+    index = subjects.index if isinstance(subjects, pd.Series) else None
+
+    subject_codes, subject_values = _factorize(subjects)
+    contents = np.array(
+        [subject_content(s.strip().lower()) for s in subject_values], dtype=object
+    )
+
+    level_codes, level_values = _factorize(levels)
+    blooms_values = np.array(
+        [get_blooms_level(level.strip().lower()) for level in level_values],
+        dtype=object,
+    )
+    blooms_levels = blooms_values[level_codes]
+
+    # A verb depends on the measurement text and the resolved Bloom's level
+    measurement_codes, measurement_values = _factorize(measurements)
+    blooms_codes, blooms_names = _factorize(blooms_levels)
+    pairs, pair_codes = np.unique(
+        measurement_codes.astype(np.int64) * len(blooms_names) + blooms_codes,
+        return_inverse=True,
+    )
+    pair_verbs = np.array(
+        [
+            extract_action_verb(
+                measurement_values[pair // len(blooms_names)],
+                blooms_names[pair % len(blooms_names)],
+            )
+            for pair in pairs.tolist()
+        ],
+        dtype=object,
+    )
+    verbs = pair_verbs[pair_codes]
+
+    prefix, suffix = OBJECTIVE_TEMPLATE.split("{}")
+    objectives = prefix + verbs + " " + contents[subject_codes] + suffix
+
+    return pd.DataFrame(
+        {
+            "subject": np.asarray(subjects, dtype=object),
+            "level": np.asarray(levels, dtype=object),
+            "measurement": np.asarray(measurements, dtype=object),
+            "blooms_level": blooms_levels,
+            "verb": verbs,
+            "objective": objectives,
+        },
+        index=index,
+        columns=GENERATED_COLUMNS,
+    )
+
+
+def generate_grid(
+    subjects: Iterable[str], levels: Iterable[str], measurements: Iterable[str]
+) -> pd.DataFrame:
+    """Generate an objective for every combination of subject, level and measurement.
+
+    Returns:
+        DataFrame with the columns in ``GENERATED_COLUMNS``, ordered by
+        subject, then level, then measurement
+    """
+    grid = pd.MultiIndex.from_product(
+        [list(subjects), list(levels), list(measurements)],
+        names=["subject", "level", "measurement"],
+    ).to_frame(index=False)
+    return generate_objectives(grid["subject"], grid["level"], grid["measurement"])
+
+
+def stream_objectives(
+    rows: Iterable[Tuple[str, str, str]], chunk_size: int = 10_000
+) -> Iterator[str]:
+    """Lazily generate objectives for (subject, level, measurement) rows.
+
+    Rows are processed ``chunk_size`` at a time, so memory stays bounded for
+    arbitrarily long inputs.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        subjects, levels, measurements = zip(*chunk)
+        yield from generate_objectives(subjects, levels, measurements)["objective"]
@@ -0,0 +1,238 @@
+"""Columnar export and import of objective history with precomputed analysis.
+
+History is written as Parquet when pyarrow is installed, or as CSV
+otherwise. Every row carries the result of ``analyze_objectives``, so
+readers never re-analyze. Writers analyze and write one row group at a time,
+and readers can select columns and filter by Bloom's level.
+"""
+
+from types import TracebackType
+from typing import IO, Any, Iterable, List, Optional, Sequence, Type, Union
+import io
+import json
+import os
+
+import pandas as pd
+
+from learning_objectives_chatbot.batch import ANALYSIS_COLUMNS, analyze_objectives
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = pc = pq = None
+
+HISTORY_COLUMNS = ANALYSIS_COLUMNS
+
+# Objectives analyzed and written per row group
+DEFAULT_ROW_GROUP_SIZE = 10_000
+
+PARQUET_AVAILABLE = pq is not None
+
+Target = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+def _schema() -> Any:
+    return pa.schema(
+        [
+            ("objective", pa.string()),
+            ("blooms_level", pa.dictionary(pa.int8(), pa.string())),
+            ("measurable", pa.bool_()),
+            ("clarity_score", pa.int8()),
+            ("word_count", pa.int32()),
+            ("comma_count", pa.int32()),
+            ("suggestions", pa.list_(pa.dictionary(pa.int8(), pa.string()))),
+        ]
+    )
+
+
+def _resolve_format(target: Target, fmt: Optional[str]) -> str:
+    if fmt is None:
+        name = str(target) if isinstance(target, (str, os.PathLike)) else ""
+        if name.endswith(".csv"):
+            fmt = "csv"
+        elif name.endswith(".parquet"):
+            fmt = "parquet"
+        else:
+            fmt = "parquet" if PARQUET_AVAILABLE else "csv"
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported history format: {fmt}")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ImportError("Parquet history files require pyarrow")
+    return fmt
+
+
+class HistoryWriter:
+    """Streams objectives with their analysis to a Parquet or CSV file.
+
+    Objectives are buffered and analyzed one row group at a time, so memory
+    stays bounded by ``row_group_size`` however many objectives are written.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        fmt: Optional[str] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> None:
+        """Open a history file for writing.
+
+        Args:
+            target: Path or binary file object to write to
+            fmt: "parquet" or "csv"; inferred from the file extension if not
+                given, preferring Parquet when pyarrow is installed
+            row_group_size: Objectives per row group (CSV: per write)
+        """
+        self.format = _resolve_format(target, fmt)
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._buffer: List[str] = []
+        self._owns_file = isinstance(target, (str, os.PathLike))
+        self._file: IO[bytes] = open(target, "wb") if self._owns_file else target
+        self._parquet: Any = None
+        if self.format == "parquet":
+            self._parquet = pq.ParquetWriter(self._file, _schema())
+
+    def write(self, objectives: Iterable[str]) -> None:
+        """Queue objectives, writing every full row group."""
+        for objective in objectives:
+            self._buffer.append(objective)
+            if len(self._buffer) >= self.row_group_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Analyze and write the buffered objectives as one row group."""
+        if not self._buffer:
+            return
+        frame = analyze_objectives(self._buffer)
+        if self.format == "parquet":
+            frame["suggestions"] = frame["suggestions"].map(list)
+            self._parquet.write_table(
+                pa.Table.from_pandas(frame, schema=_schema(), preserve_index=False)
+            )
+        else:
+            frame["suggestions"] = frame["suggestions"].map(
+                lambda s: json.dumps(list(s))
+            )
+            text = frame.to_csv(index=False, header=self.rows == 0)
+            self._file.write(text.encode())
+        self.rows += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        """Write any remaining objectives and finish the file."""
+        self.flush()
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self.rows == 0:
+            self._file.write((",".join(HISTORY_COLUMNS) + "\n").encode())
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def export_history(
+    objectives: Iterable[str],
+    target: Target,
+    fmt: Optional[str] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> int:
+    """Write objectives and their analysis to a history file.
+
+    Args:
+        objectives: The objectives to export
+        target: Path or binary file object to write to
+        fmt: "parquet" or "csv" (see ``HistoryWriter``)
+        row_group_size: Objectives per row group
+
+    Returns:
+        The number of objectives written
+    """
+    with HistoryWriter(target, fmt, row_group_size) as writer:
+        writer.write(objectives)
+    return writer.rows
+
+
+def export_history_bytes(objectives: Iterable[str], fmt: Optional[str] = None) -> bytes:
+    """Return a history file as bytes, for example for a download button."""
+    buffer = io.BytesIO()
+    export_history(objectives, buffer, fmt)
+    return buffer.getvalue()
+
+
+def read_history(
+    source: Target,
+    columns: Optional[Sequence[str]] = None,
+    levels: Optional[Sequence[str]] = None,
+    fmt: Optional[str] = None,
+) -> pd.DataFrame:
+    """Read a history file without re-analyzing the objectives.
+
+    Parquet files only read the selected columns, and row groups whose
+    statistics exclude the requested levels are skipped. CSV files are read
+    in chunks and filtered as they are read.
+
+    Args:
+        source: Path or binary file object to read from
+        columns: Columns to return (default: all of ``HISTORY_COLUMNS``)
+        levels: Only return rows with one of these Bloom's levels
+        fmt: "parquet" or "csv"; inferred from the file extension if not given
+
+    Returns:
+        DataFrame with the selected columns. ``suggestions`` holds tuples.
+    """
+    columns = list(HISTORY_COLUMNS if columns is None else columns)
+    unknown = set(columns) - set(HISTORY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown history columns: {sorted(unknown)}")
+    fmt = _resolve_format(source, fmt)
+
+    if fmt == "parquet":
+        table = pq.read_table(
+            source,
+            columns=columns,
+            filters=(
+                None
+                if levels is None
+                else pc.field("blooms_level").isin(pa.array(levels, pa.string()))
+            ),
+        )
+        frame = table.to_pandas()
+        if "blooms_level" in frame:
+            frame["blooms_level"] = frame["blooms_level"].astype(str)
+    else:
+        needed = list(
+            dict.fromkeys(columns + (["blooms_level"] if levels is not None else []))
+        )
+        chunks = [
+            chunk if levels is None else chunk[chunk["blooms_level"].isin(levels)]
+            for chunk in pd.read_csv(
+                source,
+                usecols=needed,
+                chunksize=DEFAULT_ROW_GROUP_SIZE,
+                keep_default_na=False,
+            )
+        ]
+        frame = (
+            pd.concat(chunks, ignore_index=True)
+            if chunks
+            else pd.DataFrame(columns=needed)
+        )
+        frame = frame[columns]
+        if "suggestions" in frame:
+            frame["suggestions"] = frame["suggestions"].map(json.loads)
+
+    if "suggestions" in frame:
+        frame["suggestions"] = frame["suggestions"].map(tuple)
+    return frame.reset_index(drop=True)
@@ -0,0 +1,431 @@
+"""Compiled verb matcher used by the learning objective analysis functions."""
+
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from collections import deque
+import functools
+import re
+
+# Text is split into runs of lowercase letters before verbs are looked up
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+# Past tense and participle forms that the regular rules do not produce
+IRREGULAR_FORMS: Dict[str, Tuple[str, ...]] = {
+    "break": ("broke", "broken"),
+    "build": ("built",),
+    "choose": ("chose", "chosen"),
+    "do": ("did", "done"),
+    "draw": ("drew", "drawn"),
+    "find": ("found",),
+    "give": ("gave", "given"),
+    "hold": ("held",),
+    "lead": ("led",),
+    "make": ("made",),
+    "show": ("shown",),
+    "take": ("took", "taken"),
+    "teach": ("taught",),
+    "tell": ("told",),
+    "think": ("thought",),
+    "understand": ("understood",),
+    "write": ("wrote", "written"),
+}
+
+# Inflected forms that objectives use as prepositions or adjectives rather
+# than as verbs ("terms related to", "using a calculator")
+NON_VERB_FORMS = frozenset(
+    {
+        "according",
+        "based",
+        "concerning",
+        "following",
+        "given",
+        "including",
+        "regarding",
+        "related",
+        "using",
+    }
+)
+
+# Endings accepted after a verb when matching prefixes ("understanding",
+# "implementation"). Any other remainder makes it a different word, as in
+# "listening" (list) or "users" (use).
+PREFIX_SUFFIXES = frozenset(
+    {
+        "able",
+        "ation",
+        "ations",
+        "ed",
+        "er",
+        "ers",
+        "es",
+        "ing",
+        "ings",
+        "ion",
+        "ions",
+        "ive",
+        "ment",
+        "ments",
+        "s",
+    }
+)
+
+# British spellings rewritten to the American forms used by the taxonomies
+_BRITISH_SUFFIXES = (
+    ("ise", "ize"),
+    ("ised", "ized"),
+    ("ises", "izes"),
+    ("ising", "izing"),
+    ("yse", "yze"),
+    ("ysed", "yzed"),
+    ("yses", "yzes"),
+    ("ysing", "yzing"),
+)
+
+# "labelled" -> "labeled", "modelling" -> "modeling"
+_DOUBLED_CONSONANT = re.compile(r"([b-df-hj-np-tv-z])\1(ed|ing)$")
+
+_VOWELS = frozenset("aeiou")
+
+# Tokens learned by the fallback lemmatizer are memoized up to this many,
+# after which the earliest learned are forgotten
+MAX_LEARNED_TOKENS = 100_000
+
+_UNSEEN = object()
+
+# (remaining words of a multi-word verb, the verb), longest first
+Candidates = Tuple[Tuple[Tuple[str, ...], str], ...]
+
+
+def inflections(word: str) -> List[str]:
+    """Return a word with its regular and known irregular verb inflections.
+
+    Final consonants after a single vowel are produced both doubled and
+    not ("planned", "labeled"), since the rule depends on stress.
+
+    Args:
+        word: Lowercase base form
+
+    Returns:
+        The base form first, then third person, past and -ing forms
+    """
+    forms = [word]
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        forms.append(word + "es")
+    elif len(word) > 1 and word[-1] == "y" and word[-2] not in _VOWELS:
+        forms.append(word[:-1] + "ies")
+    else:
+        forms.append(word + "s")
+
+    if word.endswith("ie"):
+        forms += [word + "d", word[:-2] + "ying"]
+    elif word.endswith("e"):
+        forms.append(word + "d")
+        forms.append(
+            word + "ing" if word.endswith(("ee", "ye", "oe")) else word[:-1] + "ing"
+        )
+    elif len(word) > 1 and word[-1] == "y" and word[-2] not in _VOWELS:
+        forms += [word[:-1] + "ied", word + "ing"]
+    else:
+        forms += [word + "ed", word + "ing"]
+        if (
+            len(word) >= 3
+            and word[-1] not in _VOWELS | set("wxy")
+            and word[-2] in _VOWELS
+            and word[-3] not in _VOWELS
+        ):
+            forms += [word + word[-1] + "ed", word + word[-1] + "ing"]
+
+    forms += IRREGULAR_FORMS.get(word, ())
+    return forms
+
+
+def tokenize(lower: str, keep: str = "") -> List[str]:
+    """Split lowercase text into the tokens matched by ``TOKEN_PATTERN``.
+
+    ASCII text, the common case, is split with a byte translation table,
+    which is several times faster than the regular expression.
+
+    Args:
+        lower: Lowercase text
+        keep: Uppercase ASCII letter to keep as a token of its own, so joined
+            texts can be split apart again
+
+    Returns:
+        The runs of letters a-z (and ``keep``), in order
+    """
+    if lower.isascii():
+        table = _letters_only(keep)
+        return lower.encode("ascii").translate(table).decode("ascii").split()
+    if keep:
+        return re.findall(f"{TOKEN_PATTERN.pattern}|{keep}", lower)
+    return TOKEN_PATTERN.findall(lower)
+
+
+@functools.lru_cache(maxsize=None)
+def _letters_only(keep: str) -> bytes:
+    # Byte table that blanks out everything but a-z and ``keep``
+    kept = set(b"abcdefghijklmnopqrstuvwxyz" + keep.encode("ascii"))
+    return bytes(byte if byte in kept else 0x20 for byte in range(256))
+
+
+@functools.lru_cache(maxsize=1024)
+def _span_pattern(words: Tuple[str, ...]) -> "re.Pattern[str]":
+    body = "[^a-z]+".join(re.escape(word) for word in words)
+    return re.compile(f"(?<![a-z]){body}(?![a-z])")
+
+
+class VerbMatch(NamedTuple):
+    """A single verb hit found in a piece of text."""
+
+    verb: str
+    start: int
+    end: int
+    levels: Tuple[str, ...]
+
+
+class VerbMatcher:
+    """Find every taxonomy verb in a text, in any inflected form.
+
+    The text is split into tokens and each token is resolved with a single
+    dictionary lookup in a table that maps every inflection of every verb
+    ("analyzes", "designing", "chose") to its base form. Tokens that are not
+    in the table go through a small rule-based lemmatizer once (British
+    spellings, doubled consonants) and the result is memoized, so repeated
+    tokens never cost more than one lookup. Multi-word verbs such as
+    "break down" are matched from their first word, longest verb first.
+    """
+
+    def __init__(
+        self, taxonomy: Mapping[str, Iterable[str]], whole_words: bool = True
+    ) -> None:
+        """Build the matcher.
+
+        Args:
+            taxonomy: Mapping of level name to the verbs for that level, in
+                priority order
+            whole_words: If True, tokens must be a form of a verb. If False,
+                a verb followed by one of ``PREFIX_SUFFIXES`` also matches,
+                so "understand" also matches "understanding" and "implement"
+                matches "implementation".
+        """
+        self.levels: Tuple[str, ...] = tuple(taxonomy)
+        self.level_order: Dict[str, int] = {
+            level: i for i, level in enumerate(self.levels)
+        }
+        self.whole_words = whole_words
+
+        verb_levels: Dict[str, List[str]] = {}
+        self._ranks: Dict[Tuple[str, str], int] = {}
+        for level, verbs in taxonomy.items():
+            for rank, verb in enumerate(verbs):
+                verb = " ".join(verb.lower().split())
+                verb_levels.setdefault(verb, [])
+                if level not in verb_levels[verb]:
+                    verb_levels[verb].append(level)
+                self._ranks.setdefault((level, verb), rank)
+        self.verb_levels: Dict[str, Tuple[str, ...]] = {
+            verb: tuple(levels) for verb, levels in verb_levels.items()
+        }
+
+        # Inflected form -> base form of the first word of each verb
+        heads = list(dict.fromkeys(verb.split()[0] for verb in self.verb_levels))
+        self.lemmas: Dict[str, str] = {}
+        for head in heads:
+            for form in inflections(head):
+                if form not in NON_VERB_FORMS:
+                    self.lemmas.setdefault(form, head)
+        # A base form always stands for itself, even if it inflects another
+        self.lemmas.update((head, head) for head in heads)
+        self._build_lookup()
+
+    def _build_lookup(self) -> None:
+        by_head: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for verb in self.verb_levels:
+            head, *rest = verb.split()
+            by_head.setdefault(head, []).append((tuple(rest), verb))
+        self._candidates: Dict[str, Candidates] = {
+            head: tuple(sorted(entries, key=lambda entry: -len(entry[0])))
+            for head, entries in by_head.items()
+        }
+        # Token -> candidates (or None), the single lookup made per token
+        self._lookup: Dict[str, Optional[Candidates]] = {
+            form: self._candidates[head] for form, head in self.lemmas.items()
+        }
+        # Tokens added to the lookup by the fallback lemmatizer, oldest first
+        self._learned: Deque[str] = deque()
+
+    def to_artifact(self) -> Dict[str, Any]:
+        """Return the derived tables as JSON-serializable data."""
+        ranks: Dict[str, Dict[str, int]] = {}
+        for (level, verb), rank in self._ranks.items():
+            ranks.setdefault(level, {})[verb] = rank
+        return {
+            "levels": list(self.levels),
+            "verb_levels": {
+                verb: list(levels) for verb, levels in self.verb_levels.items()
+            },
+            "ranks": ranks,
+            "whole_words": self.whole_words,
+            "lemmas": self.lemmas,
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact: Mapping[str, Any]) -> "VerbMatcher":
+        """Rebuild a matcher from ``to_artifact`` data without re-deriving it."""
+        matcher = cls.__new__(cls)
+        matcher.levels = tuple(artifact["levels"])
+        matcher.level_order = {level: i for i, level in enumerate(matcher.levels)}
+        matcher.whole_words = artifact["whole_words"]
+        matcher.verb_levels = {
+            verb: tuple(levels) for verb, levels in artifact["verb_levels"].items()
+        }
+        matcher._ranks = {
+            (level, verb): rank
+            for level, verbs in artifact["ranks"].items()
+            for verb, rank in verbs.items()
+        }
+        matcher.lemmas = dict(artifact["lemmas"])
+        matcher._build_lookup()
+        return matcher
+
+    def lemmatize(self, token: str) -> Optional[str]:
+        """Return the base form of a token if it is a form of a verb's first word.
+
+        Args:
+            token: A lowercase token
+
+        Returns:
+            The base form, or None if the token is not a known verb form
+        """
+        candidates = self.candidates(token)
+        return candidates[0][1].split()[0] if candidates else None
+
+    def candidates(self, token: str) -> Optional[Candidates]:
+        """Return the verbs that can start at a token, longest first.
+
+        Args:
+            token: A lowercase token
+
+        Returns:
+            Tuple of (remaining words, verb) pairs, or None if no verb starts
+            with this token
+        """
+        candidates = self._lookup.get(token, _UNSEEN)
+        if candidates is _UNSEEN:
+            candidates = self._learn(token)
+        return candidates  # type: ignore[return-value]
+
+    def _learn(self, token: str) -> Optional[Candidates]:
+        head = self._guess_lemma(token)
+        candidates = None if head is None else self._candidates[head]
+        self._lookup[token] = candidates
+        self._learned.append(token)
+        if len(self._learned) > MAX_LEARNED_TOKENS:
+            del self._lookup[self._learned.popleft()]
+        return candidates
+
+    def _guess_lemma(self, token: str) -> Optional[str]:
+        variants = [token]
+        for british, american in _BRITISH_SUFFIXES:
+            if token.endswith(british):
+                variants.append(token[: -len(british)] + american)
+        variants += [
+            _DOUBLED_CONSONANT.sub(r"\1\2", variant)
+            for variant in variants
+            if _DOUBLED_CONSONANT.search(variant)
+        ]
+        for variant in variants:
+            if variant in self.lemmas:
+                return self.lemmas[variant]
+        if not self.whole_words:
+            # Longest verb that the token starts with, followed by a known suffix
+            for end in range(len(token) - 1, 0, -1):
+                if token[:end] in self._candidates and token[end:] in PREFIX_SUFFIXES:
+                    return token[:end]
+        return None
+
+    def find_tokens(self, tokens: Sequence[str]) -> List[Tuple[str, int, int]]:
+        """Find verbs in an already tokenized text.
+
+        Args:
+            tokens: Lowercase tokens, as produced by ``tokenize``
+
+        Returns:
+            List of (verb, first token index, number of tokens) in order
+        """
+        lookup = self._lookup
+        hits = []
+        next_free = 0
+        for i, token in enumerate(tokens):
+            candidates = lookup.get(token, _UNSEEN)
+            if candidates is None or i < next_free:
+                continue
+            if candidates is _UNSEEN:
+                candidates = self._learn(token)
+            for rest, verb in candidates or ():
+                if not rest or tuple(tokens[i + 1 : i + 1 + len(rest)]) == rest:
+                    hits.append((verb, i, len(rest) + 1))
+                    next_free = i + 1 + len(rest)
+                    break
+        return hits
+
+    def find_verbs(self, text: str) -> List[str]:
+        """Return the base form of every verb in the text, in order.
+
+        The same hits as ``find_all`` without locating them in the text,
+        which is all the analysis functions need.
+
+        Args:
+            text: Text to scan (matching is case-insensitive)
+
+        Returns:
+            List of verbs, one per hit
+        """
+        tokens = tokenize(text.lower())
+        return [verb for verb, _, _ in self.find_tokens(tokens)]
+
+    def find_all(self, text: str) -> List[VerbMatch]:
+        """Return every verb hit in the text, in order of position.
+
+        Args:
+            text: Text to scan (matching is case-insensitive)
+
+        Returns:
+            List of verb matches with their positions and levels. ``verb`` is
+            the verb's base form, whatever form appeared in the text.
+        """
+        lower = text.lower()
+        tokens = tokenize(lower)
+        matches = []
+        offset = 0
+        for verb, index, length in self.find_tokens(tokens):
+            span = _span_pattern(tuple(tokens[index : index + length])).search(
+                lower, offset
+            )
+            offset = span.end()
+            matches.append(
+                VerbMatch(verb, span.start(), span.end(), self.verb_levels[verb])
+            )
+        return matches
+
+    def rank(self, level: str, verb: str) -> int:
+        """Return the position of a verb within a level's verb list.
+
+        Args:
+            level: Taxonomy level name
+            verb: Verb belonging to that level
+
+        Returns:
+            Zero-based priority of the verb within the level
+        """
+        return self._ranks[(level, verb)]
@@ -0,0 +1,287 @@
+"""Opt-in instrumentation with Prometheus text-format export.
+
+Set ``LO_CHATBOT_METRICS=1`` to enable. When it is not set, ``timed``
+returns functions unchanged and the recording helpers do nothing, so the
+instrumented code paths cost nothing extra.
+
+Export options:
+    - ``LO_CHATBOT_METRICS_FILE``: the app rewrites this file after every run
+    - ``LO_CHATBOT_METRICS_PORT``: the app serves ``/metrics`` on this port
+    - ``GET /metrics`` on the headless HTTP API
+"""
+
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+import bisect
+import functools
+import os
+import tempfile
+import threading
+import time
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+ENABLED = os.environ.get("LO_CHATBOT_METRICS", "").lower() in ("1", "true", "yes", "on")
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# Histogram bucket upper bounds for message counts
+MESSAGE_BUCKETS = (1, 3, 5, 10, 20, 50, 100, 200, 500)
+
+# Label sets kept per gauge or histogram before the least recently updated
+# one is dropped. Counters are never dropped, so their totals stay correct.
+MAX_SERIES = 1000
+
+# Known metrics: name -> (type, help text)
+METRICS = {
+    "lo_chatbot_function_duration_seconds": (
+        "histogram",
+        "Time spent in instrumented chatbot functions.",
+    ),
+    "lo_chatbot_render_duration_seconds": (
+        "histogram",
+        "Time taken by one Streamlit script run.",
+    ),
+    "lo_chatbot_first_token_seconds": (
+        "histogram",
+        "Time until the first chunk of an assistant reply was shown.",
+    ),
+    "lo_chatbot_reruns_total": ("counter", "Streamlit script runs."),
+    "lo_chatbot_turns_total": ("counter", "User turns handled by the conversation."),
+    "lo_chatbot_suggestions_total": ("counter", "Learning objectives suggested."),
+    "lo_chatbot_objectives_saved_total": (
+        "counter",
+        "Objectives added to a session's objective history.",
+    ),
+    "lo_chatbot_session_messages": (
+        "histogram",
+        "Messages in a chat session, observed after each turn.",
+    ),
+    "lo_chatbot_backend_requests_total": (
+        "counter",
+        "Replies requested from the model server, by outcome.",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Registry:
+    """Thread-safe store of counters, gauges and histograms."""
+
+    def __init__(self, max_series: int = MAX_SERIES) -> None:
+        self.max_series = max_series
+        self._values: Dict[str, "OrderedDict[Labels, Any]"] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._lock = threading.Lock()
+
+    def _series(
+        self, name: str, labels: Dict[str, str], evict: bool = True
+    ) -> Tuple["OrderedDict[Labels, Any]", Labels]:
+        series = self._values.setdefault(name, OrderedDict())
+        key = tuple(sorted(labels.items()))
+        if key in series:
+            series.move_to_end(key)
+        elif evict and len(series) >= self.max_series:
+            series.popitem(last=False)
+        return series, key
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increase a counter."""
+        with self._lock:
+            series, key = self._series(name, labels, evict=False)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge."""
+        with self._lock:
+            series, key = self._series(name, labels)
+            series[key] = value
+
+    def value(self, name: str, **labels: str) -> float:
+        """Return the current value of a counter or gauge (0 if never set)."""
+        with self._lock:
+            return self._values.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        **labels: str,
+    ) -> None:
+        """Record a value in a histogram."""
+        with self._lock:
+            bounds = self._buckets.setdefault(name, buckets)
+            series, key = self._series(name, labels)
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [[0] * len(bounds), 0.0, 0]
+            index = bisect.bisect_left(bounds, value)
+            if index < len(bounds):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._values):
+                kind, help_text = METRICS.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in self._values[name].items():
+                    if kind == "histogram":
+                        lines.extend(self._render_histogram(name, labels, value))
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _render_histogram(self, name: str, labels: Labels, state: Any) -> List[str]:
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self._buckets[name], counts):
+            cumulative += bucket_count
+            le = _format_labels(labels + (("le", repr(float(bound))),))
+            lines.append(f"{name}_bucket{le} {cumulative}")
+        lines.append(
+            f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}"
+        )
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for key, value in labels
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+registry = Registry()
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorate a function to record its duration when metrics are enabled.
+
+    Args:
+        name: Value of the ``function`` label
+
+    Returns:
+        Decorator that returns the function unchanged if metrics are disabled
+    """
+
+    def decorator(func: F) -> F:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(
+                    "lo_chatbot_function_duration_seconds",
+                    time.perf_counter() - start,
+                    function=name,
+                )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    """Increase a counter if metrics are enabled."""
+    if ENABLED:
+        registry.inc(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels: str) -> None:
+    """Set a gauge if metrics are enabled."""
+    if ENABLED:
+        registry.set(name, value, **labels)
+
+
+def observe(
+    name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels: str
+) -> None:
+    """Record a histogram value if metrics are enabled."""
+    if ENABLED:
+        registry.observe(name, value, buckets, **labels)
+
+
+def write_prometheus(path: str) -> None:
+    """Atomically write the current metrics to a file (for node_exporter's textfile collector)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, delete=False, suffix=".tmp"
+    ) as f:
+        f.write(registry.render())
+    os.replace(f.name, path)
+
+
+_exporter: Optional["ThreadingHTTPServer"] = None
+_exporter_lock = threading.Lock()
+
+
+def start_http_exporter(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """Serve ``/metrics`` from a background thread; later calls reuse the server."""
+    global _exporter
+    # http.server is only imported when the exporter is used
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = registry.render().encode()
+            self.send_response(200 if self.path == "/metrics" else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_exporter.serve_forever, daemon=True).start()
+        return _exporter
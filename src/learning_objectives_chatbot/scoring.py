@@ -0,0 +1,37 @@
+"""Scoring of numbered objectives, shared by the bulk CLI and the server."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from learning_objectives_chatbot.utils import analyze_objective, suggest_improvements
+
+Chunk = List[Tuple[int, str]]
+
+
+def score_chunk(chunk: Chunk, taxonomy: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Analyze a chunk of numbered objectives.
+
+    This runs inside worker processes, so it must stay importable at
+    module level.
+
+    Args:
+        chunk: List of (row number, objective) pairs
+        taxonomy: Name of the taxonomy to score against (default:
+            ``LO_CHATBOT_TAXONOMY``, or Bloom's)
+
+    Returns:
+        One result record per objective, in the order given
+    """
+    results = []
+    for row, objective in chunk:
+        analysis = analyze_objective(objective, taxonomy)
+        results.append(
+            {
+                "row": row,
+                "objective": objective,
+                "blooms_level": analysis["blooms_level"],
+                "measurable": analysis["measurable"],
+                "clarity_score": analysis["clarity_score"],
+                "suggestions": suggest_improvements(analysis, taxonomy),
+            }
+        )
+    return results
@@ -0,0 +1,301 @@
+"""Headless asyncio HTTP API for chat and objective analysis.
+
+The server only uses the standard library. It speaks just enough HTTP/1.1
+(keep-alive, Content-Length bodies, JSON in and out) to sit behind a
+reverse proxy or be called directly from an LMS integration.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import functools
+import json
+import logging
+import re
+
+from learning_objectives_chatbot import metrics
+from learning_objectives_chatbot.cache import analysis_cache
+from learning_objectives_chatbot.scoring import score_chunk
+from learning_objectives_chatbot.sessions import SessionStore
+from learning_objectives_chatbot.taxonomy import resolve_taxonomy
+from learning_objectives_chatbot.utils import get_sample_objectives
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 10 * 1024 * 1024
+# Longest client-supplied session ID; generated IDs are 32 hex characters
+MAX_SESSION_ID_LENGTH = 64
+
+# Taxonomy names that may be requested; they name files, so no paths
+_TAXONOMY_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+# Objectives per executor task for /analyze/batch
+BATCH_CHUNK_SIZE = 500
+
+
+class HTTPError(Exception):
+    """Error that is turned into a JSON error response."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+
+    method: str
+    path: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self) -> Any:
+        """Decode the body as JSON, raising a 400 error if it is invalid."""
+        try:
+            return json.loads(self.body or b"null")
+        except ValueError as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON body: {exc}")
+
+
+# Handlers return (status, payload); str payloads are sent as plain text
+Handler = Callable[[Request], Awaitable[Tuple[int, Any]]]
+
+
+def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool
+) -> None:
+    if isinstance(payload, str):
+        body = payload.encode()
+        content_type = "text/plain; version=0.0.4"
+    else:
+        body = json.dumps(payload).encode()
+        content_type = "application/json"
+    writer.write(
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n".encode() + body
+    )
+
+
+class JSONHTTPServer:
+    """Minimal keep-alive HTTP/1.1 server that routes requests to JSON handlers."""
+
+    def __init__(self) -> None:
+        self.routes: Dict[Tuple[str, str], Handler] = {}
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        """Register a handler for a method and exact path."""
+        self.routes[(method, path)] = handler
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.Server:
+        """Start listening and return the running asyncio server."""
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                status, payload = await self._dispatch(request)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as exc:
+            # Malformed request framing; answer once and drop the connection
+            _write_response(writer, exc.status, {"error": exc.message}, False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(
+                HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported"
+            )
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large"
+            )
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target.split("?", 1)[0], headers, body)
+
+    async def _dispatch(self, request: Request) -> Tuple[int, Any]:
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self.routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed"}
+            return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+        try:
+            return await handler(request)
+        except HTTPError as exc:
+            return exc.status, {"error": exc.message}
+        except Exception:
+            logger.exception("Error handling %s %s", request.method, request.path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+
+def _taxonomy(payload: Dict[str, Any]) -> Optional[str]:
+    taxonomy = payload.get("taxonomy")
+    if taxonomy is None:
+        return None
+    if isinstance(taxonomy, str) and _TAXONOMY_NAME.fullmatch(taxonomy):
+        # The registry keeps loaded taxonomies, so known names cost no file access
+        try:
+            resolve_taxonomy(taxonomy)
+            return taxonomy
+        except KeyError:
+            pass
+    raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown taxonomy: {taxonomy}")
+
+
+def _require(payload: Any, key: str, kind: type) -> Any:
+    if not isinstance(payload, dict) or not isinstance(payload.get(key), kind):
+        raise HTTPError(
+            HTTPStatus.BAD_REQUEST, f"Body must be a JSON object with a '{key}' field"
+        )
+    return payload[key]
+
+
+class ChatAPI:
+    """Chat and analysis endpoints with server-side conversation state.
+
+    Endpoints:
+        POST /chat           {"session_id"?, "message"} -> {"session_id", "response"}
+        POST /analyze        {"objective", "taxonomy"?} -> {"analysis", "suggestions"}
+        POST /analyze/batch  {"objectives": [...], "taxonomy"?} -> {"results": [...]}
+        GET  /examples       -> sample objectives by category
+        GET  /sessions/stats -> {"sessions", "bytes", "evictions"}
+        GET  /metrics        -> Prometheus text format (LO_CHATBOT_METRICS=1)
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        sessions: Optional[SessionStore] = None,
+    ) -> None:
+        """Create the API.
+
+        Args:
+            executor: Pool that runs batch analysis off the event loop. A
+                process pool is created on first use if none is given.
+            sessions: Store for conversation state; a default-sized
+                SessionStore is used if none is given
+        """
+        self.sessions = SessionStore() if sessions is None else sessions
+        self._executor = executor
+        self.http = JSONHTTPServer()
+        self.http.route("POST", "/chat", self.chat)
+        self.http.route("POST", "/analyze", self.analyze)
+        self.http.route("POST", "/analyze/batch", self.analyze_batch)
+        self.http.route("GET", "/examples", self.examples)
+        self.http.route("GET", "/sessions/stats", self.session_stats)
+        self.http.route("GET", "/metrics", self.metrics)
+
+    @property
+    def executor(self) -> Executor:
+        """Pool used for CPU-heavy batch requests."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor()
+        return self._executor
+
+    async def chat(self, request: Request) -> Tuple[int, Any]:
+        """Advance a conversation by one user message."""
+        payload = request.json()
+        user_input = _require(payload, "message", str)
+        session_id = payload.get("session_id")
+        if session_id is not None and (
+            not isinstance(session_id, str) or len(session_id) > MAX_SESSION_ID_LENGTH
+        ):
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST,
+                f"'session_id' must be a string of at most "
+                f"{MAX_SESSION_ID_LENGTH} characters",
+            )
+        session_id, response = await self.sessions.chat(session_id, user_input)
+        return HTTPStatus.OK, {"session_id": session_id, "response": response}
+
+    async def analyze(self, request: Request) -> Tuple[int, Any]:
+        """Analyze a single objective."""
+        payload = request.json()
+        objective = _require(payload, "objective", str)
+        analysis, suggestions = analysis_cache.get(objective, _taxonomy(payload))
+        return HTTPStatus.OK, {"analysis": analysis, "suggestions": suggestions}
+
+    async def analyze_batch(self, request: Request) -> Tuple[int, Any]:
+        """Analyze many objectives in the executor, keeping the loop free."""
+        payload = request.json()
+        objectives = _require(payload, "objectives", list)
+        if not all(isinstance(obj, str) for obj in objectives):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'objectives' must be strings")
+        score = functools.partial(score_chunk, taxonomy=_taxonomy(payload))
+        loop = asyncio.get_running_loop()
+        numbered = list(enumerate(objectives))
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.executor, score, numbered[i : i + BATCH_CHUNK_SIZE]
+                )
+                for i in range(0, len(numbered), BATCH_CHUNK_SIZE)
+            )
+        )
+        return HTTPStatus.OK, {
+            "results": [record for chunk in chunks for record in chunk]
+        }
+
+    async def examples(self, request: Request) -> Tuple[int, Any]:
+        """Return the sample objectives by category."""
+        return HTTPStatus.OK, get_sample_objectives()
+
+    async def session_stats(self, request: Request) -> Tuple[int, Any]:
+        """Return the session store counters."""
+        return HTTPStatus.OK, self.sessions.stats()._asdict()
+
+    async def metrics(self, request: Request) -> Tuple[int, Any]:
+        """Return the collected metrics in Prometheus text format."""
+        return HTTPStatus.OK, metrics.registry.render()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """Run the API until cancelled."""
+        server = await self.http.start(host, port)
+        logger.info(
+            "Serving on %s", ", ".join(str(s.getsockname()) for s in server.sockets)
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
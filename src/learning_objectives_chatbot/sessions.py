@@ -0,0 +1,248 @@
+"""Memory-capped store of chat sessions with compact message storage."""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import asyncio
+import sys
+import threading
+import time
+import uuid
+
+from learning_objectives_chatbot import metrics
+from learning_objectives_chatbot.backends import ResponseBackend, default_backend
+from learning_objectives_chatbot.utils import ConversationState, render_response
+
+
+class Role(IntEnum):
+    """Author of a chat message."""
+
+    USER = 0
+    ASSISTANT = 1
+
+
+class CompactMessage(NamedTuple):
+    """A chat message stored without copying assistant template text.
+
+    User messages keep their text as the only argument. Assistant messages
+    keep a reference to a shared template key plus the values filled into it,
+    and are only expanded to full text when rendered.
+    """
+
+    role: Role
+    template: Optional[str]
+    args: Tuple[str, ...]
+
+    def expand(self) -> Dict[str, str]:
+        """Return the message in the ``{"role", "content"}`` form used for display."""
+        if self.template is None:
+            return {"role": "user", "content": self.args[0]}
+        return {
+            "role": "assistant",
+            "content": render_response(self.template, self.args),
+        }
+
+
+def user_message(text: str) -> CompactMessage:
+    """Build a compact user message."""
+    return CompactMessage(Role.USER, None, (text,))
+
+
+def assistant_message(template: str, args: Tuple[str, ...] = ()) -> CompactMessage:
+    """Build a compact assistant message from a response template."""
+    return CompactMessage(Role.ASSISTANT, template, args)
+
+
+# Approximate bytes an OrderedDict entry adds beyond its key and value
+# (hash table slot plus the linked-list node that keeps the order)
+_ENTRY_OVERHEAD = 100
+
+
+def message_size(message: CompactMessage) -> int:
+    """Estimate the bytes held by a message.
+
+    Argument strings are counted in full even when they are shared with
+    other messages, while template keys are interned and not counted.
+    """
+    return (
+        sys.getsizeof(message)
+        + sys.getsizeof(message.args)
+        + sum(sys.getsizeof(arg) for arg in message.args)
+    )
+
+
+def state_size(state: ConversationState) -> int:
+    """Estimate the bytes held by a conversation state and its strings."""
+    return sys.getsizeof(state) + sum(
+        sys.getsizeof(value)
+        for value in (state.subject, state.level, state.measurement, state.blooms_level)
+    )
+
+
+@dataclass(slots=True)
+class Session:
+    """Conversation state and message history for one user."""
+
+    state: ConversationState = field(default_factory=ConversationState)
+    messages: List[CompactMessage] = field(default_factory=list)
+    nbytes: int = 0
+    last_seen: float = 0.0
+    # Part of nbytes that is not messages: the store entry, the session
+    # object, its message list and its state
+    overhead: int = 0
+    # Serializes turns of this session while the backend is working
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def append(self, message: CompactMessage) -> int:
+        """Add a message and return the number of bytes it added."""
+        size = message_size(message)
+        self.messages.append(message)
+        self.nbytes += size
+        return size
+
+    def remeasure(self, session_id: str) -> int:
+        """Re-estimate the non-message overhead and return the change in bytes.
+
+        Args:
+            session_id: The key the session is stored under, counted too
+        """
+        overhead = (
+            _ENTRY_OVERHEAD
+            + sys.getsizeof(session_id)
+            + sys.getsizeof(self)
+            + sys.getsizeof(self.messages)
+            + state_size(self.state)
+        )
+        change = overhead - self.overhead
+        self.overhead = overhead
+        self.nbytes += change
+        return change
+
+
+class SessionStats(NamedTuple):
+    """Counters describing a SessionStore."""
+
+    sessions: int
+    bytes: int
+    evictions: int
+
+
+class SessionStore:
+    """Server-side chat sessions under a total memory budget.
+
+    Sessions are kept in least-recently-used order. When the estimated size
+    of all sessions exceeds the budget, or a session has been idle longer
+    than the timeout, the least recently used sessions are evicted.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional[ResponseBackend] = None,
+    ) -> None:
+        """Create an empty store.
+
+        Args:
+            max_bytes: Budget for the estimated size of all sessions
+            idle_timeout: Seconds without activity before a session is
+                evicted, or None to only evict for memory
+            clock: Monotonic time source, replaceable for testing
+            backend: Produces the assistant's replies; defaults to the
+                backend configured by the environment, as in the app
+        """
+        self.max_bytes = max_bytes
+        self.backend = default_backend() if backend is None else backend
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Return a session without touching its recency, or None."""
+        return self._sessions.get(session_id)
+
+    async def chat(self, session_id: Optional[str], user_input: str) -> Tuple[str, str]:
+        """Advance a session by one user message, creating it if needed.
+
+        The reply is awaited on the caller's event loop, so a slow model
+        server holds up only this session's turns.
+
+        Args:
+            session_id: Existing session ID, or None to start a new session.
+                Unknown (for example evicted) IDs start a new conversation.
+            user_input: The latest user message
+
+        Returns:
+            Tuple of (session ID, assistant response text)
+        """
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            if session_id is None:
+                session_id = uuid.uuid4().hex
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = Session()
+                self._bytes += session.append(assistant_message("greeting"))
+                self._bytes += session.remeasure(session_id)
+            self._sessions.move_to_end(session_id)
+            session.last_seen = now
+
+        # The backend may wait on a model server, so only this session is
+        # locked while it works
+        async with session.lock:
+            reply = await self.backend.respond(session.state, user_input)
+            with self._lock:
+                added = session.append(user_message(user_input))
+                added += session.append(assistant_message(reply.template, reply.args))
+                added += session.remeasure(session_id)
+                # Evicted while the backend was working: nothing to account
+                if self._sessions.get(session_id) is session:
+                    self._bytes += added
+                metrics.observe(
+                    "lo_chatbot_session_messages",
+                    len(session.messages),
+                    metrics.MESSAGE_BUCKETS,
+                )
+                self._evict_for_memory()
+        return session_id, reply.text
+
+    def messages(self, session_id: str) -> List[Dict[str, str]]:
+        """Return a session's messages expanded to full text."""
+        session = self._sessions.get(session_id)
+        return [] if session is None else [msg.expand() for msg in session.messages]
+
+    def stats(self) -> SessionStats:
+        """Return the number of sessions, their estimated bytes and evictions."""
+        with self._lock:
+            return SessionStats(len(self._sessions), self._bytes, self._evictions)
+
+    def _evict(self) -> None:
+        _, session = self._sessions.popitem(last=False)
+        self._bytes -= session.nbytes
+        self._evictions += 1
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_timeout is None:
+            return
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_seen < self.idle_timeout:
+                break
+            self._evict()
+
+    def _evict_for_memory(self) -> None:
+        # The active session is last and is never evicted for its own growth
+        while self._bytes > self.max_bytes and len(self._sessions) > 1:
+            self._evict()
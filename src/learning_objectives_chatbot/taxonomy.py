@@ -0,0 +1,267 @@
+"""Verb taxonomies loaded from data files, with compiled artifacts on disk.
+
+A taxonomy is a JSON file named ``<name>.json`` in the built-in
+``taxonomies`` directory or a directory listed in ``LO_CHATBOT_TAXONOMY_PATH``
+(later directories override earlier ones). It holds the verbs for each
+level, the keywords used to recognise a level a user describes, a fallback
+verb per level and the default level.
+
+Compiling a taxonomy derives its matchers. The result is cached as a JSON
+artifact named after the source's content hash, so other processes (and
+later starts) load it instead of compiling. Loaded taxonomies are checked
+for changes at most every ``RELOAD_INTERVAL`` seconds and reloaded in place.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from learning_objectives_chatbot.matcher import VerbMatcher
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the artifact layout or the compiled patterns change
+ARTIFACT_VERSION = 2
+
+# Directory holding the taxonomies shipped with the package
+BUILTIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomies")
+
+DEFAULT_TAXONOMY = os.environ.get("LO_CHATBOT_TAXONOMY", "blooms")
+
+# Seconds between checks of a loaded taxonomy's source file
+RELOAD_INTERVAL = float(os.environ.get("LO_CHATBOT_TAXONOMY_RELOAD", "2"))
+
+
+@dataclass(eq=False)
+class Taxonomy:
+    """A compiled taxonomy.
+
+    Attributes:
+        name: File name of the taxonomy without ``.json``
+        title: Human-readable name
+        verbs: Verbs for each level, lowest level first, in priority order
+        level_keywords: Words that name each level in a level description
+        default_verbs: Fallback action verb for each level
+        default_level: Level assumed when a description names none
+        verb_matcher: Finds the taxonomy's verbs in objectives
+        keyword_matcher: Finds level keywords in level descriptions
+        source_hash: SHA-256 of the source file
+    """
+
+    name: str
+    title: str
+    verbs: Dict[str, List[str]]
+    level_keywords: Dict[str, List[str]]
+    default_verbs: Dict[str, str]
+    default_level: str
+    verb_matcher: VerbMatcher
+    keyword_matcher: VerbMatcher
+    source_hash: str
+
+    @property
+    def levels(self) -> Tuple[str, ...]:
+        """Level names, lowest first."""
+        return self.verb_matcher.levels
+
+
+def taxonomy_dirs() -> List[str]:
+    """Return the directories searched for taxonomy files, lowest priority first."""
+    extra = os.environ.get("LO_CHATBOT_TAXONOMY_PATH", "")
+    return [BUILTIN_DIR] + [path for path in extra.split(os.pathsep) if path]
+
+
+def find_taxonomy(name: str) -> str:
+    """Return the path of a taxonomy's source file.
+
+    Raises:
+        KeyError: If no directory has a file for the taxonomy
+    """
+    for directory in reversed(taxonomy_dirs()):
+        path = os.path.join(directory, f"{name}.json")
+        if os.path.isfile(path):
+            return path
+    raise KeyError(f"Unknown taxonomy: {name}")
+
+
+def available_taxonomies() -> List[str]:
+    """Return the names of every taxonomy that can be loaded."""
+    names = set()
+    for directory in taxonomy_dirs():
+        if os.path.isdir(directory):
+            names.update(
+                entry[: -len(".json")]
+                for entry in os.listdir(directory)
+                if entry.endswith(".json")
+            )
+    return sorted(names)
+
+
+def cache_dir() -> str:
+    """Return the directory for compiled taxonomy artifacts."""
+    configured = os.environ.get("LO_CHATBOT_TAXONOMY_CACHE")
+    if configured:
+        return configured
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "learning-objectives-chatbot", "taxonomies")
+
+
+def compile_taxonomy(name: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    """Compile a taxonomy definition into an artifact.
+
+    Args:
+        name: Name of the taxonomy
+        source: Parsed taxonomy file
+
+    Returns:
+        JSON-serializable artifact, see ``Taxonomy``
+    """
+    levels = source["levels"]
+    missing = set(levels) - set(source["default_verbs"])
+    if missing:
+        raise ValueError(f"Taxonomy {name} has no default verb for {sorted(missing)}")
+    if source["default_level"] not in levels:
+        raise ValueError(f"Taxonomy {name} has an unknown default level")
+    return {
+        "artifact_version": ARTIFACT_VERSION,
+        "name": name,
+        "title": source.get("title", name),
+        "verbs": levels,
+        "level_keywords": source["level_keywords"],
+        "default_verbs": source["default_verbs"],
+        "default_level": source["default_level"],
+        "verb_matcher": VerbMatcher(levels).to_artifact(),
+        "keyword_matcher": VerbMatcher(
+            source["level_keywords"], whole_words=False
+        ).to_artifact(),
+    }
+
+
+def _write_atomic(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(path), delete=False, suffix=".tmp"
+    ) as f:
+        json.dump(data, f)
+    os.replace(f.name, path)
+
+
+def load_taxonomy(path: str) -> Taxonomy:
+    """Load a taxonomy file, using its compiled artifact when one is cached.
+
+    Args:
+        path: Path of the taxonomy's ``.json`` source
+
+    Returns:
+        The compiled taxonomy
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    source_hash = hashlib.sha256(raw).hexdigest()
+    name = os.path.basename(path)[: -len(".json")]
+    artifact_path = os.path.join(
+        cache_dir(), f"{name}-{source_hash[:16]}-v{ARTIFACT_VERSION}.json"
+    )
+
+    artifact = None
+    try:
+        with open(artifact_path, encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if artifact is None or artifact.get("artifact_version") != ARTIFACT_VERSION:
+        artifact = compile_taxonomy(name, json.loads(raw))
+        try:
+            _write_atomic(artifact_path, artifact)
+        except OSError as exc:
+            logger.debug("Could not cache taxonomy artifact %s: %s", artifact_path, exc)
+
+    return Taxonomy(
+        name=name,
+        title=artifact["title"],
+        verbs=artifact["verbs"],
+        level_keywords=artifact["level_keywords"],
+        default_verbs=artifact["default_verbs"],
+        default_level=artifact["default_level"],
+        verb_matcher=VerbMatcher.from_artifact(artifact["verb_matcher"]),
+        keyword_matcher=VerbMatcher.from_artifact(artifact["keyword_matcher"]),
+        source_hash=source_hash,
+    )
+
+
+class TaxonomyRegistry:
+    """Loaded taxonomies, reloaded when their source files change."""
+
+    def __init__(self, reload_interval: float = RELOAD_INTERVAL) -> None:
+        self.reload_interval = reload_interval
+        # name -> (taxonomy, source path, source mtime_ns, time of last check)
+        self._entries: Dict[str, Tuple[Taxonomy, str, int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: Optional[str] = None) -> Taxonomy:
+        """Return a taxonomy, loading or reloading it if needed.
+
+        Args:
+            name: Taxonomy name (default: ``LO_CHATBOT_TAXONOMY`` or "blooms")
+        """
+        name = name or DEFAULT_TAXONOMY
+        entry = self._entries.get(name)
+        now = time.monotonic()
+        if entry is not None and now - entry[3] < self.reload_interval:
+            return entry[0]
+
+        with self._lock:
+            entry = self._entries.get(name)
+            try:
+                path = find_taxonomy(name)
+                mtime = os.stat(path).st_mtime_ns
+                if entry is not None and entry[1] == path and entry[2] == mtime:
+                    taxonomy = entry[0]
+                else:
+                    taxonomy = load_taxonomy(path)
+            except (KeyError, OSError, TypeError, ValueError) as exc:
+                if entry is None:
+                    raise
+                # Deleted, half-written or invalid: keep serving the last good
+                # version and try again after the next interval
+                logger.warning(
+                    "Could not reload taxonomy %s, keeping the loaded version: %r",
+                    name,
+                    exc,
+                )
+                self._entries[name] = entry[:3] + (now,)
+                return entry[0]
+            if entry is not None and taxonomy is not entry[0]:
+                if entry[0].source_hash == taxonomy.source_hash:
+                    # Touched but unchanged: keep the existing object
+                    taxonomy = entry[0]
+                else:
+                    logger.info("Reloaded taxonomy %s from %s", name, path)
+            self._entries[name] = (taxonomy, path, mtime, now)
+            return taxonomy
+
+
+registry = TaxonomyRegistry()
+
+
+def get_taxonomy(name: Optional[str] = None) -> Taxonomy:
+    """Return a taxonomy from the shared registry (see ``TaxonomyRegistry.get``)."""
+    return registry.get(name)
+
+
+def resolve_taxonomy(taxonomy: Union[Taxonomy, str, None] = None) -> Taxonomy:
+    """Return a taxonomy given either the taxonomy itself or its name.
+
+    Args:
+        taxonomy: A ``Taxonomy``, a taxonomy name, or None for the default
+    """
+    if isinstance(taxonomy, Taxonomy):
+        return taxonomy
+    return registry.get(taxonomy)
@@ -1,15 +1,148 @@
 """Utility functions for the Learning Objectives Chatbot."""
 
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Iterator, List, Any, Tuple, Union
 import re
-import pandas as pd
 
+from learning_objectives_chatbot import metrics
+from learning_objectives_chatbot.taxonomy import Taxonomy, get_taxonomy, resolve_taxonomy
 
+
+class ConversationStage(IntEnum):
+    """Stages of the guided objective-writing conversation."""
+
+    SUBJECT = 0
+    LEVEL = 1
+    MEASUREMENT = 2
+    REFINEMENT = 3
+
+
+@dataclass(slots=True)
+class ConversationState:
+    """Incremental state of a single chatbot conversation.
+    
+    Each call to ``advance`` handles one user turn in constant time, no
+    matter how long the conversation has been running.
+    """
+
+    stage: ConversationStage = ConversationStage.SUBJECT
+    subject: str = ""
+    level: str = ""
+    measurement: str = ""
+    blooms_level: str = ""
+
+    @classmethod
+    def from_history(cls, message_history: List[Dict[str, str]]) -> "ConversationState":
+        """Rebuild the state from a list of alternating chat messages.
+        
+        Only fixed positions are read, so this is O(1) in the history length.
+        
+        Args:
+            message_history: Messages so far, starting with the assistant
+                greeting. The latest user message may or may not be included.
+                
+        Returns:
+            State ready to handle the latest user message
+        """
+        turns = max(0, (len(message_history) - 1) // 2)
+        state = cls(stage=ConversationStage(min(turns, ConversationStage.REFINEMENT)))
+        if turns > 0:
+            state.subject = message_history[1]["content"]
+        if turns > 1:
+            state.level = message_history[3]["content"]
+            state.blooms_level = get_blooms_level(state.level)
+        if turns > 2:
+            state.measurement = message_history[5]["content"]
+        return state
+
+    def advance(self, user_input: str) -> str:
+        """Handle one user message and move to the next stage.
+        
+        Args:
+            user_input: The latest user message
+            
+        Returns:
+            String response from the assistant
+        """
+        return render_response(*self.reply(user_input))
+
+    def reply(self, user_input: str) -> Tuple[str, Tuple[str, ...]]:
+        """Handle one user message, returning the response in template form.
+        
+        Args:
+            user_input: The latest user message
+            
+        Returns:
+            Tuple of (key into ``RESPONSE_TEMPLATES``, template arguments)
+        """
+        metrics.inc("lo_chatbot_turns_total")
+        
+        if self.stage == ConversationStage.SUBJECT:
+            # Initial subject/topic identification
+            self.subject = user_input
+            self.stage = ConversationStage.LEVEL
+            return "ask_level", (user_input,)
+        
+        if self.stage == ConversationStage.LEVEL:
+            # Learning level identification
+            self.level = user_input
+            self.blooms_level = get_blooms_level(user_input)
+            self.stage = ConversationStage.MEASUREMENT
+            return "ask_measurement", ()
+        
+        if self.stage == ConversationStage.MEASUREMENT:
+            # Measurement/verb identification
+            self.measurement = user_input
+            self.stage = ConversationStage.REFINEMENT
+            
+            # Extract a good action verb based on their input
+            verb = extract_action_verb(user_input, self.blooms_level)
+            return "framework", (verb, self.subject)
+        
+        text = user_input.lower()
+        
+        if "suggest" in text:
+            # User wants a suggestion
+            suggested_objective = generate_sample_objective(
+                self.subject, self.level, self.measurement
+            )
+            metrics.inc("lo_chatbot_suggestions_total")
+            return "suggestion", (suggested_objective, self.subject)
+        
+        if any(word in text for word in ["refine", "improve", "better", "change"]):
+            # User wants to refine the objective
+            return "refine", ()
+        
+        if "another" in text or "different" in text:
+            # User wants a new objective
+            return "another", (self.subject,)
+        
+        # Default response for continuing the conversation
+        return "smart", ()
+
+
+def render_response(template: str, args: Tuple[str, ...] = ()) -> str:
+    """Expand an assistant response from its template key and arguments.
+    
+    Args:
+        template: Key into ``RESPONSE_TEMPLATES``
+        args: Positional values for the template's placeholders
+        
+    Returns:
+        The full response text
+    """
+    return RESPONSE_TEMPLATES[template].format(*args)
+
+
+@metrics.timed("generate_response")
 def generate_response(user_input: str, message_history: List[Dict[str, str]]) -> str:
     """Generate chatbot response based on user input and conversation history.
     
     This function simulates a conversational flow to guide users through
-    creating effective learning objectives.
+    creating effective learning objectives. It is a stateless wrapper around
+    ``ConversationState``; callers that keep the state between turns should
+    call ``ConversationState.advance`` directly.
     
     Args:
         user_input: The latest user message
@@ -18,136 +151,59 @@ def generate_response(user_input: str, message_history: List[Dict[str, str]]) ->
     Returns:
         String response from the assistant
     """
-    # Extract just the content from message history for easier processing
-    history_content = [msg["content"] for msg in message_history]
-    
-    # Check what stage of the conversation we're in
-    if len(message_history) <= 2:
-        # Initial subject/topic identification
-        return (
-            f"Thanks for sharing about {user_input}! Learning objectives should focus on what "
-            f"students will be able to do after the learning experience. "
-            f"What level of learning are you targeting? For example:\n"
-            f"- Remember/recall information\n"
-            f"- Understand/explain concepts\n"
-            f"- Apply knowledge to new situations\n"
-            f"- Analyze information\n"
-            f"- Evaluate ideas\n"
-            f"- Create new content or perspectives"
-        )
-    
-    elif len(message_history) <= 4:
-        # Learning level identification
-        return (
-            f"Great! Now let's think about how you'll measure success. "
-            f"What specific, observable actions will show that students have achieved this objective? "
-            f"For example, will they be able to define, explain, solve, compare, design, etc.?"
-        )
-    
-    elif len(message_history) <= 6:
-        # Measurement/verb identification
-        subject = message_history[1]["content"]  # The subject from first user reply
-        level = message_history[3]["content"]    # The learning level from second user reply
-        measurement = user_input                # The measurement from third user reply
-        
-        # Extract a good action verb based on their input
-        verb = extract_action_verb(measurement, get_blooms_level(level))
-        
-        return (
-            f"Excellent! Based on our conversation, let me suggest a learning objective framework:\n\n"
-            f"'After completing this [learning experience], students will be able to {verb} [specific content] "
-            f"[optional: condition] [optional: criteria].'\n\n"
-            f"Would you like to fill in this template for your {subject} objective? Or I can suggest one for you."
-        )
-    
-    elif "suggest" in user_input.lower():
-        # User wants a suggestion
-        subject = message_history[1]["content"]  # Subject from first user reply
-        level = message_history[3]["content"]    # Learning level from second reply
-        measurement = message_history[5]["content"]  # Measurement from third reply
-        
-        # Generate a suggested learning objective
-        suggested_objective = generate_sample_objective(subject, level, measurement)
-        
-        return (
-            f"Here's a possible learning objective:\n\n{suggested_objective}\n\n"
-            f"What do you think? Would you like to refine this further, or would you prefer "
-            f"to create another objective for a different aspect of {subject}?"
-        )
+    return ConversationState.from_history(message_history).advance(user_input)
+
+
+def generate_response_stream(
+    user_input: str, message_history: List[Dict[str, str]]
+) -> Iterator[str]:
+    """Streaming variant of ``generate_response``.
     
-    elif any(word in user_input.lower() for word in ["refine", "improve", "better", "change"]):
-        # User wants to refine the objective
-        return (
-            f"Let's refine this objective. Is there anything specific you'd like to change? For example:\n"
-            f"- Make it more specific\n"
-            f"- Change the level of thinking\n"
-            f"- Adjust how it will be measured\n"
-            f"- Add conditions or criteria for success"
-        )
+    The rule-based reply is computed in one step, so this splits the
+    finished text into words rather than streaming it as it is produced.
     
-    elif "another" in user_input.lower() or "different" in user_input.lower():
-        # User wants a new objective
-        subject = message_history[1]["content"]  # Subject from first user reply
+    Args:
+        user_input: The latest user message
+        message_history: List of previous messages in the conversation
         
-        return (
-            f"Let's create another learning objective for {subject}. "
-            f"What specific skill or knowledge component would you like to address with this new objective?"
-        )
+    Returns:
+        Iterator over chunks of the response that join to the full text
+    """
+    yield from stream_text(generate_response(user_input, message_history))
+
+
+def stream_text(text: str) -> Iterator[str]:
+    """Split a response into word chunks for incremental display.
     
-    else:
-        # Default response for continuing the conversation
-        return (
-            f"Thanks for sharing that. To create the most effective learning objective, "
-            f"we should make sure it's SMART (Specific, Measurable, Achievable, Relevant, Time-bound). "
-            f"Would you like to refine the current objective, or should we create another one?"
-        )
+    Each chunk is a word with the whitespace that follows it, so the chunks
+    join back to exactly the original text.
+    """
+    for match in _STREAM_CHUNK_PATTERN.finditer(text):
+        yield match.group()
 
 
 def get_sample_objectives() -> Dict[str, List[str]]:
     """Return sample learning objectives by category.
     
+    The dictionary is built once at import time and shared, so callers
+    should not modify it.
+    
     Returns:
         Dictionary of sample objectives organized by category
     """
-    return {
-        "Knowledge/Remember": [
-            "Define the key terms related to photosynthesis.",
-            "List the main components of a computer system.",
-            "Identify the major periods of art history."
-        ],
-        "Comprehension/Understand": [
-            "Explain the process of cellular respiration.",
-            "Summarize the plot of Shakespeare's Hamlet.",
-            "Describe the functions of the three branches of government."
-        ],
-        "Application/Apply": [
-            "Calculate the area of irregular shapes using calculus.",
-            "Implement a sorting algorithm in Python.",
-            "Apply the principles of color theory in a digital composition."
-        ],
-        "Analysis/Analyze": [
-            "Compare and contrast classical and operant conditioning.",
-            "Analyze the causes and effects of climate change.",
-            "Differentiate between leadership and management strategies."
-        ],
-        "Evaluation/Evaluate": [
-            "Critique a peer's research paper using established criteria.",
-            "Evaluate the effectiveness of public health campaigns.",
-            "Assess the validity of historical sources."
-        ],
-        "Creation/Create": [
-            "Design an experiment to test the effect of light on plant growth.",
-            "Develop a marketing strategy for a new product.",
-            "Compose a musical piece that incorporates at least three different scales."
-        ]
-    }
+    return SAMPLE_OBJECTIVES
 
 
-def analyze_objective(objective: str) -> Dict[str, Any]:
+@metrics.timed("analyze_objective")
+def analyze_objective(
+    objective: str, taxonomy: Union[Taxonomy, str, None] = None
+) -> Dict[str, Any]:
     """Analyze a learning objective for quality and effectiveness.
     
     Args:
         objective: The learning objective to analyze
+        taxonomy: Taxonomy or taxonomy name to classify against (default:
+            ``LO_CHATBOT_TAXONOMY``, or Bloom's)
         
     Returns:
         Dictionary containing analysis results
@@ -160,17 +216,16 @@ def analyze_objective(objective: str) -> Dict[str, Any]:
         "suggestions": []
     }
     
-    # Check for action verbs to determine Bloom's level
-    for level, verbs in BLOOMS_TAXONOMY_VERBS.items():
-        for verb in verbs:
-            pattern = r'\b' + re.escape(verb) + r'\b'
-            if re.search(pattern, objective.lower()):
-                analysis["blooms_level"] = level
-                break
-    
-    # Check if it's measurable (contains a specific action verb)
-    all_verbs = [verb for verbs in BLOOMS_TAXONOMY_VERBS.values() for verb in verbs]
-    if any(re.search(r'\b' + re.escape(verb) + r'\b', objective.lower()) for verb in all_verbs):
+    # Scan once for every taxonomy verb; the highest level hit wins
+    verb_matcher = resolve_taxonomy(taxonomy).verb_matcher
+    verbs = verb_matcher.find_verbs(objective)
+    if verbs:
+        verb_levels = verb_matcher.verb_levels
+        analysis["blooms_level"] = max(
+            (level for verb in set(verbs) for level in verb_levels[verb]),
+            key=verb_matcher.level_order.__getitem__
+        )
+        # Measurable means it contains a specific action verb
         analysis["measurable"] = True
     
     # Calculate clarity score (simplified version)
@@ -183,7 +238,7 @@ def analyze_objective(objective: str) -> Dict[str, Any]:
         clarity += 1
     if "will be able to" in objective.lower():
         clarity += 1
-    if any(condition in objective.lower() for condition in ["using", "through", "by", "with"]):
+    if any(condition in objective.lower() for condition in CONDITION_WORDS):
         clarity += 1
     
     # Subtract points for negative attributes
@@ -198,11 +253,16 @@ def analyze_objective(objective: str) -> Dict[str, Any]:
     return analysis
 
 
-def suggest_improvements(analysis: Dict[str, Any]) -> List[str]:
+@metrics.timed("suggest_improvements")
+def suggest_improvements(
+    analysis: Dict[str, Any], taxonomy: Union[Taxonomy, str, None] = None
+) -> List[str]:
     """Generate suggestions for improving a learning objective based on analysis.
     
     Args:
         analysis: Dictionary containing analysis results
+        taxonomy: Taxonomy the analysis was made with (default as in
+            ``analyze_objective``)
         
     Returns:
         List of improvement suggestions
@@ -210,35 +270,37 @@ def suggest_improvements(analysis: Dict[str, Any]) -> List[str]:
     suggestions = []
     
     if not analysis["measurable"]:
-        suggestions.append(
-            "Use a specific, measurable action verb from Bloom's Taxonomy that matches your desired learning level."
-        )
+        suggestions.append(IMPROVEMENT_SUGGESTIONS["measurable"])
     
     if analysis["clarity_score"] < 6:
-        suggestions.append(
-            "Improve clarity by being more specific about what students will be able to do."
-        )
+        suggestions.append(IMPROVEMENT_SUGGESTIONS["clarity"])
         
     if analysis["blooms_level"] == "Unknown":
-        suggestions.append(
-            "Include a clear action verb that aligns with the intended learning level."
-        )
+        suggestions.append(IMPROVEMENT_SUGGESTIONS["blooms_level"])
     
-    if analysis["clarity_score"] < 8 and "Remember" in analysis["blooms_level"]:
-        suggestions.append(
-            "Consider using higher-order thinking skills beyond recall if appropriate for your learning context."
-        )
+    # The lowest level is recall, so suggest moving beyond it
+    lowest_level = resolve_taxonomy(taxonomy).levels[0]
+    if analysis["clarity_score"] < 8 and analysis["blooms_level"] == lowest_level:
+        suggestions.append(IMPROVEMENT_SUGGESTIONS["higher_order"])
     
     return suggestions
 
 
-def generate_sample_objective(subject: str, level: str, measurement: str) -> str:
+@metrics.timed("generate_sample_objective")
+def generate_sample_objective(
+    subject: str,
+    level: str,
+    measurement: str,
+    taxonomy: Union[Taxonomy, str, None] = None
+) -> str:
     """Generate a sample learning objective based on user inputs.
     
     Args:
         subject: The subject area
         level: The learning level
         measurement: How learning will be measured
+        taxonomy: Taxonomy to pick the level and verb from (default as in
+            ``analyze_objective``)
         
     Returns:
         A sample learning objective
@@ -248,116 +310,234 @@ def generate_sample_objective(subject: str, level: str, measurement: str) -> str
     level = level.strip().lower()
     
     # Determine Bloom's level and appropriate verb
-    blooms_level = get_blooms_level(level)
-    verb = extract_action_verb(measurement, blooms_level)
+    taxonomy = resolve_taxonomy(taxonomy)
+    blooms_level = get_blooms_level(level, taxonomy)
+    verb = extract_action_verb(measurement, blooms_level, taxonomy)
     
     # Generate contextual content based on subject
-    if "math" in subject or "statistic" in subject:
-        content = f"{verb} complex problems using appropriate formulas and techniques"
-    elif "literature" in subject or "english" in subject:
-        content = f"{verb} texts to identify themes and literary devices"
-    elif "science" in subject:
-        content = f"{verb} scientific principles to explain natural phenomena"
-    elif "history" in subject:
-        content = f"{verb} historical events and their impact on modern society"
-    elif "art" in subject:
-        content = f"{verb} artistic techniques and principles in original compositions"
-    elif "programming" in subject or "coding" in subject or "computer" in subject:
-        content = f"{verb} algorithms to solve computational problems efficiently"
-    else:
-        content = f"{verb} key concepts and principles related to {subject}"
+    content = f"{verb} {subject_content(subject)}"
     
     # Construct the full objective
-    objective = f"After completing this course, students will be able to {content}."
+    return OBJECTIVE_TEMPLATE.format(content)
+
+
+def subject_content(subject: str) -> str:
+    """Return what students will do with the verb, based on the subject area.
     
-    return objective
+    Args:
+        subject: The cleaned (stripped, lowercase) subject area
+        
+    Returns:
+        The rest of the objective after its action verb
+    """
+    for keywords, content in SUBJECT_CONTENT:
+        if any(keyword in subject for keyword in keywords):
+            return content
+    return DEFAULT_SUBJECT_CONTENT.format(subject)
 
 
-def extract_action_verb(text: str, blooms_level: str) -> str:
+@metrics.timed("extract_action_verb")
+def extract_action_verb(
+    text: str, blooms_level: str, taxonomy: Union[Taxonomy, str, None] = None
+) -> str:
     """Extract an appropriate action verb from text or suggest one based on Bloom's level.
     
     Args:
         text: Text to extract verb from
         blooms_level: Bloom's taxonomy level
+        taxonomy: Taxonomy the level belongs to (default as in
+            ``analyze_objective``)
         
     Returns:
         An appropriate action verb
     """
-    # Try to extract a verb from the user's text
-    for verb in BLOOMS_TAXONOMY_VERBS.get(blooms_level, []):
-        if verb in text.lower():
-            return verb
+    # Try to extract a verb from the user's text, preferring the level's own order
+    taxonomy = resolve_taxonomy(taxonomy)
+    verb_matcher = taxonomy.verb_matcher
+    # Inflected forms count as their base verb ("analyzing" -> "analyze")
+    verb_levels = verb_matcher.verb_levels
+    candidates = [
+        verb for verb in set(verb_matcher.find_verbs(text))
+        if blooms_level in verb_levels[verb]
+    ]
+    if candidates:
+        return min(candidates, key=lambda verb: verb_matcher.rank(blooms_level, verb))
     
     # If no matching verb found, return a default one for the appropriate level
-    default_verbs = {
-        "Remember": "identify",
-        "Understand": "explain",
-        "Apply": "apply",
-        "Analyze": "analyze",
-        "Evaluate": "evaluate",
-        "Create": "create"
-    }
-    
-    return default_verbs.get(blooms_level, "demonstrate")
+    return taxonomy.default_verbs.get(blooms_level, "demonstrate")
 
 
-def get_blooms_level(text: str) -> str:
+@metrics.timed("get_blooms_level")
+def get_blooms_level(text: str, taxonomy: Union[Taxonomy, str, None] = None) -> str:
     """Determine the Bloom's taxonomy level from text description.
     
     Args:
         text: Text describing a learning level
+        taxonomy: Taxonomy to pick the level from (default as in
+            ``analyze_objective``)
         
     Returns:
         Corresponding Bloom's taxonomy level
     """
-    text = text.lower()
+    taxonomy = resolve_taxonomy(taxonomy)
+    keyword_matcher = taxonomy.keyword_matcher
+    keywords = keyword_matcher.find_verbs(text)
+    if keywords:
+        # The lowest level mentioned takes precedence
+        verb_levels = keyword_matcher.verb_levels
+        return min(
+            (level for keyword in set(keywords) for level in verb_levels[keyword]),
+            key=keyword_matcher.level_order.__getitem__
+        )
     
-    if any(word in text for word in ["remember", "recall", "memorize", "identify", "list"]):
-        return "Remember"
-    elif any(word in text for word in ["understand", "explain", "describe", "summarize"]):
-        return "Understand"
-    elif any(word in text for word in ["apply", "use", "implement", "solve"]):
-        return "Apply"
-    elif any(word in text for word in ["analyze", "compare", "contrast", "examine"]):
-        return "Analyze"
-    elif any(word in text for word in ["evaluate", "assess", "judge", "critique"]):
-        return "Evaluate"
-    elif any(word in text for word in ["create", "design", "develop", "compose"]):
-        return "Create"
-    else:
-        # Default to middle level if unclear
-        return "Apply"
-
-
-# Bloom's Taxonomy Verbs
-BLOOMS_TAXONOMY_VERBS = {
-    "Remember": [
-        "define", "describe", "identify", "label", "list", "match", "name", "outline",
-        "recall", "recognize", "reproduce", "select", "state"
+    # Default to middle level if unclear
+    return taxonomy.default_level
+
+
+# Assistant responses, keyed by template and filled in with str.format
+RESPONSE_TEMPLATES = {
+    "greeting": (
+        "Hi! I'm your Learning Objectives Assistant. What subject or skill are you creating learning objectives for?"
+    ),
+    "ask_level": (
+        "Thanks for sharing about {0}! Learning objectives should focus on what "
+        "students will be able to do after the learning experience. "
+        "What level of learning are you targeting? For example:\n"
+        "- Remember/recall information\n"
+        "- Understand/explain concepts\n"
+        "- Apply knowledge to new situations\n"
+        "- Analyze information\n"
+        "- Evaluate ideas\n"
+        "- Create new content or perspectives"
+    ),
+    "ask_measurement": (
+        "Great! Now let's think about how you'll measure success. "
+        "What specific, observable actions will show that students have achieved this objective? "
+        "For example, will they be able to define, explain, solve, compare, design, etc.?"
+    ),
+    "framework": (
+        "Excellent! Based on our conversation, let me suggest a learning objective framework:\n\n"
+        "'After completing this [learning experience], students will be able to {0} [specific content] "
+        "[optional: condition] [optional: criteria].'\n\n"
+        "Would you like to fill in this template for your {1} objective? Or I can suggest one for you."
+    ),
+    "suggestion": (
+        "Here's a possible learning objective:\n\n{0}\n\n"
+        "What do you think? Would you like to refine this further, or would you prefer "
+        "to create another objective for a different aspect of {1}?"
+    ),
+    "refine": (
+        "Let's refine this objective. Is there anything specific you'd like to change? For example:\n"
+        "- Make it more specific\n"
+        "- Change the level of thinking\n"
+        "- Adjust how it will be measured\n"
+        "- Add conditions or criteria for success"
+    ),
+    "another": (
+        "Let's create another learning objective for {0}. "
+        "What specific skill or knowledge component would you like to address with this new objective?"
+    ),
+    "smart": (
+        "Thanks for sharing that. To create the most effective learning objective, "
+        "we should make sure it's SMART (Specific, Measurable, Achievable, Relevant, Time-bound). "
+        "Would you like to refine the current objective, or should we create another one?"
+    ),
+    # Reply text written by an external response backend
+    "generated": "{0}"
+}
+
+# Sample learning objectives by category, shown as examples in the app
+SAMPLE_OBJECTIVES = {
+    "Knowledge/Remember": [
+        "Define the key terms related to photosynthesis.",
+        "List the main components of a computer system.",
+        "Identify the major periods of art history."
     ],
-    "Understand": [
-        "classify", "compare", "contrast", "demonstrate", "discuss", "explain",
-        "extend", "illustrate", "infer", "interpret", "paraphrase", "predict",
-        "summarize", "translate"
+    "Comprehension/Understand": [
+        "Explain the process of cellular respiration.",
+        "Summarize the plot of Shakespeare's Hamlet.",
+        "Describe the functions of the three branches of government."
     ],
-    "Apply": [
-        "apply", "change", "compute", "construct", "demonstrate", "discover",
-        "manipulate", "modify", "operate", "predict", "prepare", "produce",
-        "relate", "show", "solve", "use"
+    "Application/Apply": [
+        "Calculate the area of irregular shapes using calculus.",
+        "Implement a sorting algorithm in Python.",
+        "Apply the principles of color theory in a digital composition."
     ],
-    "Analyze": [
-        "analyze", "break down", "categorize", "compare", "contrast", "differentiate",
-        "discriminate", "distinguish", "examine", "experiment", "identify", "illustrate",
-        "infer", "outline", "relate", "select", "separate"
+    "Analysis/Analyze": [
+        "Compare and contrast classical and operant conditioning.",
+        "Analyze the causes and effects of climate change.",
+        "Differentiate between leadership and management strategies."
     ],
-    "Evaluate": [
-        "appraise", "argue", "assess", "choose", "compare", "conclude", "contrast",
-        "criticize", "critique", "defend", "evaluate", "judge", "justify",
-        "prioritize", "rate", "select", "support", "value"
+    "Evaluation/Evaluate": [
+        "Critique a peer's research paper using established criteria.",
+        "Evaluate the effectiveness of public health campaigns.",
+        "Assess the validity of historical sources."
     ],
-    "Create": [
-        "assemble", "compose", "construct", "create", "design", "develop", "devise",
-        "formulate", "generate", "hypothesize", "invent", "make", "organize",
-        "plan", "produce", "write"
+    "Creation/Create": [
+        "Design an experiment to test the effect of light on plant growth.",
+        "Develop a marketing strategy for a new product.",
+        "Compose a musical piece that incorporates at least three different scales."
     ]
-}
\ No newline at end of file
+}
+
+# Words that signal a condition attached to the objective
+CONDITION_WORDS = ["using", "through", "by", "with"]
+
+# Improvement suggestions, keyed by the analysis check that triggers them
+IMPROVEMENT_SUGGESTIONS = {
+    "measurable": (
+        "Use a specific, measurable action verb from Bloom's Taxonomy that matches your desired learning level."
+    ),
+    "clarity": (
+        "Improve clarity by being more specific about what students will be able to do."
+    ),
+    "blooms_level": (
+        "Include a clear action verb that aligns with the intended learning level."
+    ),
+    "higher_order": (
+        "Consider using higher-order thinking skills beyond recall if appropriate for your learning context."
+    )
+}
+
+# Sentence that generated objectives are built from
+OBJECTIVE_TEMPLATE = "After completing this course, students will be able to {}."
+
+# Subject keywords (matched as substrings, first entry wins) and the content
+# that follows the action verb in generated objectives
+SUBJECT_CONTENT = [
+    (("math", "statistic"), "complex problems using appropriate formulas and techniques"),
+    (("literature", "english"), "texts to identify themes and literary devices"),
+    (("science",), "scientific principles to explain natural phenomena"),
+    (("history",), "historical events and their impact on modern society"),
+    (("art",), "artistic techniques and principles in original compositions"),
+    (("programming", "coding", "computer"), "algorithms to solve computational problems efficiently")
+]
+
+# Content for subjects that match no keyword, filled in with the subject
+DEFAULT_SUBJECT_CONTENT = "key concepts and principles related to {}"
+
+# A word and its trailing whitespace, or leading whitespace
+_STREAM_CHUNK_PATTERN = re.compile(r"\S+\s*|\s+")
+
+# Module attributes that read Bloom's taxonomy from the registry on every
+# access, so they follow hot reloads of taxonomies/blooms.json. Read them as
+# ``utils.BLOOMS_TAXONOMY_VERBS``: a name bound with ``from utils import``
+# keeps the value it had when it was imported.
+_BLOOMS_ATTRIBUTES = {
+    # Bloom's Taxonomy Verbs
+    "BLOOMS_TAXONOMY_VERBS": "verbs",
+    # Keywords used to recognise the learning level a user describes
+    "LEVEL_KEYWORDS": "level_keywords",
+    # Fallback action verb for each level
+    "DEFAULT_LEVEL_VERBS": "default_verbs",
+    # Matchers for Bloom's taxonomy, for code that works on its levels directly
+    "_VERB_MATCHER": "verb_matcher",
+    "_LEVEL_KEYWORD_MATCHER": "keyword_matcher"
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Return the current value of a Bloom's taxonomy attribute."""
+    if name in _BLOOMS_ATTRIBUTES:
+        return getattr(get_taxonomy("blooms"), _BLOOMS_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
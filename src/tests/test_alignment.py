@@ -0,0 +1,128 @@
+"""Test cases for course alignment analytics."""
+
+import pandas as pd
+
+from learning_objectives_chatbot import taxonomy as taxonomy_module
+from learning_objectives_chatbot.alignment import (
+    add_analysis,
+    alignment_report,
+    report_levels,
+)
+from learning_objectives_chatbot.cli import main
+
+COURSES = pd.DataFrame(
+    {
+        "course_id": ["BIO101"] * 4 + ["CS201"] * 3,
+        "module_id": [1, 1, 2, 2, 1, 1, 2],
+        "objective": [
+            "Define the key terms related to photosynthesis.",
+            "Explain the process of cellular respiration.",
+            "Design an experiment to test the effect of light on plant growth.",
+            "Appreciate the beauty of nature.",
+            "Explain how a hash table works.",
+            "Explain recursion with examples.",
+            "Explain the difference between a list and a tuple.",
+        ],
+    }
+)
+
+
+def test_summary_and_level_distribution():
+    """Test per-course counts, measurable share and level counts."""
+    report = alignment_report(COURSES)
+    assert report.summary.loc["BIO101", "objectives"] == 4
+    assert report.summary.loc["BIO101", "measurable_share"] == 0.75
+    assert report.summary.loc["CS201", "distinct_verbs"] == 1
+    assert list(report.levels.columns) == report_levels()
+    assert report.levels.loc["BIO101"].to_dict() == {
+        "Unknown": 1,
+        "Remember": 1,
+        "Understand": 1,
+        "Apply": 0,
+        "Analyze": 0,
+        "Evaluate": 0,
+        "Create": 1,
+    }
+
+
+def test_overused_verbs_and_gaps():
+    """Test verb overuse and missing levels per course."""
+    report = alignment_report(COURSES)
+    assert report.overused_verbs.to_dict("records") == [
+        {"course_id": "CS201", "verb": "explain", "count": 3, "share": 1.0}
+    ]
+    gaps = report.gaps.groupby("course_id")["missing_level"].apply(list).to_dict()
+    assert gaps["BIO101"] == ["Apply", "Analyze", "Evaluate"]
+    assert "Understand" not in gaps["CS201"]
+
+
+def test_leading_verb_uses_base_form():
+    """Test that inflected verbs are counted under their base form."""
+    frame = add_analysis(
+        pd.DataFrame(
+            {"objective": ["Explains osmosis.", "Explaining it", "Learn things"]},
+            index=[10, 11, 12],
+        )
+    )
+    assert frame["verb"].tolist()[:2] == ["explain", "explain"]
+    assert pd.isna(frame.loc[12, "verb"])
+
+
+def test_report_follows_the_default_taxonomy(monkeypatch):
+    """Test that levels come from LO_CHATBOT_TAXONOMY, not Bloom's."""
+    monkeypatch.setattr(taxonomy_module, "DEFAULT_TAXONOMY", "solo")
+    report = alignment_report(COURSES)
+    assert list(report.levels.columns) == report_levels("solo")
+    assert report.levels.loc["CS201", "Relational"] == 3
+    assert (
+        "Relational"
+        not in report.gaps["missing_level"][
+            report.gaps["course_id"] == "CS201"
+        ].tolist()
+    )
+
+
+def test_group_by_course_and_module_reuses_analysis():
+    """Test multi-key grouping and precomputed analysis columns."""
+    frame = COURSES.assign(blooms_level="Create", measurable=True, clarity_score=9)
+    report = alignment_report(frame, by=["course_id", "module_id"])
+    assert report.summary.index.tolist() == [
+        ("BIO101", 1),
+        ("BIO101", 2),
+        ("CS201", 1),
+        ("CS201", 2),
+    ]
+    assert (report.levels["Create"] == report.summary["objectives"]).all()
+    assert (report.summary["clarity_mean"] == 9).all()
+
+
+def test_align_command_writes_reports(tmp_path):
+    """Test that the command writes one CSV per report table."""
+    source = tmp_path / "courses.csv"
+    COURSES.to_csv(source, index=False)
+    output = tmp_path / "reports"
+    assert main(["align", str(source), "--by", "course_id", "-o", str(output)]) == 0
+    assert sorted(p.name for p in output.iterdir()) == [
+        "gaps.csv",
+        "levels.csv",
+        "overused_verbs.csv",
+        "summary.csv",
+    ]
+    assert pd.read_csv(output / "summary.csv")["objectives"].tolist() == [4, 3]
+
+
+def test_align_command_reports_bad_input(tmp_path, capsys):
+    """Test that unsupported formats and missing columns exit with an error."""
+    output = tmp_path / "reports"
+    text = tmp_path / "courses.txt"
+    text.write_text("Define terms.\n")
+    assert main(["align", str(text), "-o", str(output)]) == 1
+    assert "lo-chatbot align: error: alignment reports need CSV" in (
+        capsys.readouterr().err
+    )
+
+    source = tmp_path / "courses.csv"
+    COURSES.drop(columns="course_id").to_csv(source, index=False)
+    assert main(["align", str(source), "-o", str(output)]) == 1
+    assert "input has no 'course_id' column" in capsys.readouterr().err
+    assert not output.exists()
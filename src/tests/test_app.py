@@ -0,0 +1,36 @@
+"""Test cases for the Streamlit application."""
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from learning_objectives_chatbot.app import history_pages
+
+APP_PATH = Path(__file__).parents[1] / "learning_objectives_chatbot" / "app.py"
+
+
+def test_history_pages_newest_first():
+    """Test that older messages are split into pages ending at the window."""
+    assert history_pages(0) == []
+    assert history_pages(45, page_size=20) == [range(25, 45), range(5, 25), range(0, 5)]
+
+
+def test_chat_window_limits_rendered_messages():
+    """Test that only the configured window is rendered as chat bubbles."""
+    at = AppTest.from_file(str(APP_PATH), default_timeout=30).run()
+    at.sidebar.number_input(key="chat_window").set_value(4).run()
+    for text in ["Biology", "Understand", "explain"]:
+        at.text_input(key="user_input").input(text)
+        at.button[0].click().run()
+
+    # New messages are appended below the window during the submitting run;
+    # the window moves on the next run
+    at.run()
+    assert not at.exception
+    assert len(at.session_state.messages) == 7
+    assert at.selectbox(key="history_page").options == [
+        "Hidden",
+        "1 of 1 (messages 1-3)",
+    ]
+    assert at.session_state.last_render_ms > 0
+    assert at.session_state.last_first_token_ms > 0
@@ -0,0 +1,254 @@
+"""Test cases for the response backends, using a local stub model server."""
+
+from http import HTTPStatus
+import asyncio
+import json
+import threading
+
+import pytest
+
+from learning_objectives_chatbot.backends import (
+    HTTPBackend,
+    Reply,
+    ResponseBackend,
+    RuleBasedBackend,
+    run_sync,
+)
+from learning_objectives_chatbot.server import JSONHTTPServer
+from learning_objectives_chatbot.utils import ConversationState
+
+
+class StubModelServer:
+    """Model server that echoes the draft reply after an optional delay."""
+
+    def __init__(self, delay=0.0, status=HTTPStatus.OK):
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        self.http = JSONHTTPServer()
+        self.http.route("POST", "/generate", self.generate)
+
+    async def generate(self, request):
+        payload = request.json()
+        self.requests.append(payload)
+        await asyncio.sleep(self.delay)
+        return self.status, {"response": f"[model] {payload['draft']}"}
+
+
+def _run_with_stub(scenario, **stub_options):
+    async def main():
+        stub = StubModelServer(**stub_options)
+        server = await stub.http.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        backend = HTTPBackend(f"http://127.0.0.1:{port}/generate", timeout=0.5)
+        async with server:
+            try:
+                return await scenario(stub, backend)
+            finally:
+                await backend.close()
+
+    return asyncio.run(main())
+
+
+async def _read_raw_request(reader):
+    """Read one request from a raw socket and return (headers, body)."""
+    headers = {}
+    await reader.readline()
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    return headers, await reader.readexactly(int(headers["content-length"]))
+
+
+def _state_at_refinement():
+    state = ConversationState()
+    for message in ("Math", "apply", "solve"):
+        state.reply(message)
+    return state
+
+
+def test_rule_based_backend_matches_conversation():
+    """Test that the default backend is the built-in conversation."""
+    state, expected = _state_at_refinement(), _state_at_refinement()
+    reply = RuleBasedBackend().respond_sync(state, "suggest one")
+    assert reply[:2] == expected.reply("suggest one")
+    assert reply.objective == reply.args[0]
+    assert run_sync(RuleBasedBackend().respond(ConversationState(), "Math")) == Reply(
+        "ask_level", ("Math",)
+    )
+
+
+def test_incomplete_backend_fails_on_creation():
+    """Test that a backend without respond cannot be instantiated."""
+
+    class Incomplete(ResponseBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_stream_yields_reply_text_then_exposes_reply():
+    """Test that a reply stream joins to the reply text."""
+    stream = RuleBasedBackend().stream(ConversationState(), "Chemistry")
+    assert stream.reply is None
+    assert "".join(stream) == stream.reply.text
+    assert stream.reply.args == ("Chemistry",)
+
+
+def test_http_backend_uses_model_reply_and_cache():
+    """Test model replies, state advancement and the response cache."""
+
+    async def scenario(stub, backend):
+        state = _state_at_refinement()
+        reply = await backend.respond(state, "Please suggest one")
+        assert reply.template == "generated"
+        assert reply.text.startswith("[model] Here's a possible learning objective")
+        assert reply.objective.startswith("After completing this course")
+        assert stub.requests[0]["state"]["stage"] == "refinement"
+
+        again = await backend.respond(_state_at_refinement(), "  please SUGGEST one ")
+        assert again == reply
+        assert len(stub.requests) == 1
+
+    _run_with_stub(scenario)
+
+
+def test_http_backend_coalesces_identical_requests():
+    """Test that concurrent identical turns share one model request."""
+
+    async def scenario(stub, backend):
+        replies = await asyncio.gather(
+            *(backend.respond(ConversationState(), "History") for _ in range(5))
+        )
+        assert len(set(replies)) == 1
+        assert len(stub.requests) == 1
+
+    _run_with_stub(scenario, delay=0.05)
+
+
+def test_http_backend_falls_back_on_timeout_and_errors():
+    """Test that slow or failing servers produce the rule-based reply."""
+
+    async def slow(stub, backend):
+        state = ConversationState()
+        reply = await backend.respond(state, "History")
+        assert reply == Reply("ask_level", ("History",))
+        assert state.subject == "History"
+
+    _run_with_stub(slow, delay=1)
+
+    async def failing(stub, backend):
+        assert (await backend.respond(ConversationState(), "Art")).template == (
+            "ask_level"
+        )
+
+    _run_with_stub(failing, status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+
+def test_http_backend_respects_connection_limit():
+    """Test that requests beyond the pool size wait for a connection."""
+
+    async def scenario(stub, backend):
+        backend.max_connections = 2
+        await asyncio.gather(
+            *(backend.respond(ConversationState(), f"Subject {i}") for i in range(6))
+        )
+        assert len(stub.requests) == 6
+        assert len(backend._pool._idle) <= 2
+
+    _run_with_stub(scenario)
+
+
+def test_http_backend_reconnects_after_idle_close():
+    """Test that a pooled connection closed by the server is replaced."""
+    requests = []
+
+    async def handle(reader, writer):
+        # Answer one request, then drop the connection without saying so
+        _, body = await _read_raw_request(reader)
+        requests.append(body)
+        body = b'{"response": "model reply"}'
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        backend = HTTPBackend(f"http://127.0.0.1:{port}/generate", timeout=0.5)
+        async with server:
+            try:
+                await backend.respond(ConversationState(), "History")
+                await asyncio.sleep(0.05)
+                reply = await backend.respond(ConversationState(), "Art")
+            finally:
+                await backend.close()
+        assert reply.text == "model reply"
+        assert len(requests) == 2
+
+    asyncio.run(main())
+
+
+def _sse_chunk(data):
+    event = b"data: %s\n\n" % data
+    return b"%x\r\n%s\r\n" % (len(event), event)
+
+
+def test_http_backend_streams_server_sent_events():
+    """Test that streamed text is shown before the model server finishes."""
+    release = threading.Event()
+
+    async def handle(reader, writer):
+        headers, body = await _read_raw_request(reader)
+        assert json.loads(body)["stream"]
+        assert headers["accept"] == "text/event-stream"
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n" + _sse_chunk(b'{"delta": "Hello "}')
+        )
+        await writer.drain()
+        # Hold the rest of the reply until the first piece has been shown
+        await asyncio.to_thread(release.wait, 5)
+        writer.write(
+            _sse_chunk(b'{"delta": "world", "objective": "Explain it."}')
+            + _sse_chunk(b"[DONE]")
+            + b"0\r\n\r\n"
+        )
+        await writer.drain()
+
+    server = run_sync(asyncio.start_server(handle, "127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    backend = HTTPBackend(f"http://127.0.0.1:{port}/generate", timeout=5)
+    try:
+        stream = backend.stream(ConversationState(), "History")
+        chunks = iter(stream)
+        assert next(chunks) == "Hello "
+        assert stream.reply is None
+        release.set()
+        assert list(chunks) == ["world"]
+        assert stream.reply == Reply("generated", ("Hello world",), "Explain it.")
+        assert len(backend._pool._idle) == 1
+    finally:
+        release.set()
+        run_sync(backend.close())
+        server.get_loop().call_soon_threadsafe(server.close)
+
+
+def test_http_backend_stream_accepts_json_replies():
+    """Test streaming from a model server that answers with one JSON body."""
+    stub = StubModelServer()
+    server = run_sync(stub.http.start("127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    backend = HTTPBackend(f"http://127.0.0.1:{port}/generate", timeout=5)
+    try:
+        stream = backend.stream(ConversationState(), "History")
+        chunks = list(stream)
+        assert len(chunks) > 1 and "".join(chunks) == stream.reply.text
+        assert stream.reply.text.startswith("[model] Thanks for sharing about History")
+        assert stub.requests[0]["stream"] is True
+    finally:
+        run_sync(backend.close())
+        server.get_loop().call_soon_threadsafe(server.close)
@@ -0,0 +1,63 @@
+"""Test cases for vectorized batch analysis."""
+
+import pandas as pd
+
+from learning_objectives_chatbot.batch import (
+    ANALYSIS_COLUMNS,
+    analyze_objectives,
+    verb_hits,
+)
+from learning_objectives_chatbot.utils import (
+    _VERB_MATCHER,
+    analyze_objective,
+    get_sample_objectives,
+    suggest_improvements,
+)
+
+OBJECTIVES = [obj for group in get_sample_objectives().values() for obj in group] + [
+    "Students will be able to list, name, state, and recall the parts of a cell.",
+    "Learn about things",
+    "",
+    "After completing this course, students will be able to design and compare "
+    "experiments using appropriate controls " + "and more words " * 10,
+    "Summarises the reading and critiqued two arguments.",
+    "Breaking down a proof, then justifying each step",
+    "Because of this, students gain an appreciation",
+    "break",
+    # Unicode whitespace that RE2's \S treats differently from str.split()
+    "Define\xa0the\x0bkey\u2028terms\x1cof cell\u3000biology, ecology and genetics",
+]
+
+
+def test_analyze_objectives_matches_scalar_analysis():
+    """Test that every row agrees with analyze_objective/suggest_improvements."""
+    result = analyze_objectives(OBJECTIVES)
+    assert list(result.columns) == ANALYSIS_COLUMNS
+    for objective, row in zip(OBJECTIVES, result.itertuples()):
+        analysis = analyze_objective(objective)
+        assert row.blooms_level == analysis["blooms_level"]
+        assert row.measurable == analysis["measurable"]
+        assert row.clarity_score == analysis["clarity_score"]
+        assert row.word_count == len(objective.split())
+        assert row.comma_count == objective.count(",")
+        assert list(row.suggestions) == suggest_improvements(analysis)
+
+
+def test_analyze_objectives_accepts_series_and_iterators():
+    """Test that a Series keeps its index and iterators are consumed."""
+    series = pd.Series(OBJECTIVES[:3], index=["a", "b", "c"])
+    assert list(analyze_objectives(series).index) == ["a", "b", "c"]
+    assert len(analyze_objectives(iter(OBJECTIVES))) == len(OBJECTIVES)
+    assert analyze_objectives([]).empty
+
+
+def test_verb_hits_match_find_all():
+    """Test that the column-wide token pass finds the same verbs per row."""
+    lower = pd.Series(OBJECTIVES).str.lower()
+    rows, verbs = verb_hits(lower, _VERB_MATCHER)
+    expected = [
+        (row, hit.verb)
+        for row, objective in enumerate(OBJECTIVES)
+        for hit in _VERB_MATCHER.find_all(objective)
+    ]
+    assert list(zip(rows.tolist(), verbs)) == expected
@@ -0,0 +1,101 @@
+"""Test cases for the benchmark suite, import budget and rerun harness."""
+
+from pathlib import Path
+import copy
+import importlib.util
+import random
+
+SUITE_PATH = Path(__file__).parents[2] / "benchmarks" / "suite.py"
+spec = importlib.util.spec_from_file_location("benchmark_suite", SUITE_PATH)
+suite = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(suite)
+
+IMPORT_TIME_PATH = SUITE_PATH.with_name("import_time.py")
+spec = importlib.util.spec_from_file_location("import_time", IMPORT_TIME_PATH)
+import_time = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(import_time)
+
+HARNESS_PATH = SUITE_PATH.with_name("rerun_harness.py")
+spec = importlib.util.spec_from_file_location("rerun_harness", HARNESS_PATH)
+rerun_harness = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rerun_harness)
+
+
+def _document(**ops):
+    return {"results": {name: {"ops_per_sec": value} for name, value in ops.items()}}
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Test that only drops larger than the threshold fail."""
+    baseline = _document(fast=1000.0, slow=100.0, gone=5.0)
+    current = _document(fast=950.0, slow=80.0, new=1.0)
+    assert suite.compare(baseline, current, max_regression=10) == [
+        "slow: throughput -20.0% (limit -10%)"
+    ]
+    assert suite.compare(baseline, current, max_regression=25) == []
+
+
+def test_run_writes_results(tmp_path):
+    """Test that a filtered run produces a results document."""
+    output = tmp_path / "results.json"
+    args = ["run", "-k", "suggest_improvements", "--repeat", "1", "--min-time", "0.01"]
+    assert suite.main([*args, "-o", str(output)]) == 0
+    assert suite.main(["compare", str(output), str(output)]) == 0
+
+
+def test_parse_importtime_keeps_top_level_cumulative_times():
+    """Test that nested imports are recorded but not timed separately."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   re\n"
+        "import time:       500 |       2500 | learning_objectives_chatbot.utils\n"
+    )
+    top_level, imported = import_time.parse_importtime(stderr)
+    assert top_level == {"learning_objectives_chatbot.utils": 2.5}
+    assert imported == {"re", "learning_objectives_chatbot.utils"}
+
+
+def test_core_modules_import_without_heavy_dependencies():
+    """Test that the analysis path loads without pandas, NumPy or Streamlit."""
+    for module in ("utils", "cli"):
+        result = import_time.measure(f"learning_objectives_chatbot.{module}", 1)
+        assert result["heavy_imports"] == []
+    failures = import_time.check(
+        {
+            "learning_objectives_chatbot.utils": {
+                "import_ms": 150.0,
+                "heavy_imports": [],
+            }
+        },
+        import_time.BUDGETS_MS,
+    )
+    assert failures == ["learning_objectives_chatbot.utils: 150.0 ms (budget 100 ms)"]
+
+
+def test_make_script_is_reproducible_and_weighted():
+    """Test that scripts follow the stages, then only the weighted branches."""
+    branches = rerun_harness.parse_branches("suggest=1,another=0")
+    first = rerun_harness.make_script(8, branches, random.Random(3))
+    assert first == rerun_harness.make_script(8, branches, random.Random(3))
+    assert [branch for branch, _ in first] == [
+        "subject",
+        "level",
+        "measurement",
+    ] + ["suggest"] * 5
+
+
+def test_harness_replays_turns_and_compares_reports():
+    """Test a short replay end to end and the regression check."""
+    report = rerun_harness.run(1, 5, {"suggest": 1.0}, bucket=4)
+    assert report["summary"]["turns"] == 5
+    assert report["summary"]["script_runs"] == {"mean": 1.0, "max": 1}
+    assert [row["turns"] for row in report["by_turn"]] == ["1-4", "5-5"]
+    assert report["by_branch"]["suggest"]["state_bytes_mean"] > 0
+
+    slower = copy.deepcopy(report)
+    slower["summary"]["turn_ms"]["p95"] = report["summary"]["turn_ms"]["p95"] * 2
+    assert rerun_harness.compare(report, report, max_regression=20) == []
+    assert [
+        failure.split(":")[0]
+        for failure in rerun_harness.compare(report, slower, max_regression=20)
+    ] == ["turn_ms.p95"]
@@ -0,0 +1,48 @@
+"""Test cases for the analysis cache."""
+
+import pytest
+
+from learning_objectives_chatbot.cache import AnalysisCache
+from learning_objectives_chatbot.utils import analyze_objective, suggest_improvements
+
+OBJECTIVE = "Define the key terms related to photosynthesis."
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hits_on_normalized_text():
+    """Test that case and surrounding whitespace share one entry."""
+    cache = AnalysisCache()
+    analysis, suggestions = cache.get(OBJECTIVE)
+    assert analysis == analyze_objective(OBJECTIVE)
+    assert suggestions == suggest_improvements(analysis)
+
+    suggestions.append("mutated")
+    assert cache.get(f"  {OBJECTIVE.upper()} ") == (analysis, suggestions[:-1])
+    assert cache.stats() == (1, 1, 0, 1)
+
+
+def test_cache_evicts_least_recently_used_and_expired():
+    """Test LRU eviction and TTL expiry counters."""
+    clock = FakeClock()
+    cache = AnalysisCache(maxsize=2, ttl=10, clock=clock)
+    cache.get("one")
+    cache.get("two")
+    cache.get("one")
+    cache.get("three")  # evicts "two"
+    assert cache.stats() == (1, 3, 1, 2)
+
+    clock.now = 11
+    cache.get("one")  # expired, recomputed
+    assert cache.stats() == (1, 4, 2, 2)
+
+    with pytest.raises(ValueError):
+        AnalysisCache(maxsize=0)
@@ -0,0 +1,80 @@
+"""Test cases for the bulk-scoring command line interface."""
+
+import json
+
+import pytest
+
+from learning_objectives_chatbot.cli import main
+from learning_objectives_chatbot.utils import analyze_objective
+
+OBJECTIVES = [
+    "Define the key terms related to photosynthesis.",
+    "Design an experiment to test the effect of light on plant growth.",
+    "Learn about things",
+    "Evaluate the effectiveness of public health campaigns.",
+    "Summarize the plot of Shakespeare's Hamlet.",
+]
+
+
+def _read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_score_csv_in_process(tmp_path):
+    """Test that CSV input is scored in order without worker processes."""
+    source = tmp_path / "objectives.csv"
+    rows = "".join(f'{i},"{obj}"\n' for i, obj in enumerate(OBJECTIVES))
+    source.write_text("id,objective\n" + rows, encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+
+    assert main(["score", str(source), "-o", str(output), "--workers", "0"]) == 0
+
+    results = _read_results(output)
+    assert [r["objective"] for r in results] == OBJECTIVES
+    assert [r["blooms_level"] for r in results] == [
+        analyze_objective(obj)["blooms_level"] for obj in OBJECTIVES
+    ]
+
+
+def test_score_jsonl_with_worker_pool(tmp_path):
+    """Test that pooled scoring keeps order, and unordered mode keeps every row."""
+    source = tmp_path / "objectives.jsonl"
+    source.write_text(
+        "".join(json.dumps({"text": obj}) + "\n" for obj in OBJECTIVES * 3),
+        encoding="utf-8",
+    )
+    common = [str(source), "--field", "text", "--workers", "2", "--chunk-size", "2"]
+
+    ordered = tmp_path / "ordered.jsonl"
+    main(["score", *common, "-o", str(ordered)])
+    assert [r["row"] for r in _read_results(ordered)] == list(range(15))
+
+    unordered = tmp_path / "unordered.jsonl"
+    main(["score", *common, "--unordered", "-o", str(unordered)])
+    assert sorted(r["row"] for r in _read_results(unordered)) == list(range(15))
+
+
+def test_score_reports_rows_without_an_objective(tmp_path, capsys):
+    """Test that a row missing the field stops scoring with its line number."""
+    source = tmp_path / "objectives.jsonl"
+    source.write_text('{"objective": "List the planets."}\n{"text": "x"}\n')
+    output = tmp_path / "out.jsonl"
+    assert main(["score", str(source), "-o", str(output), "--workers", "0"]) == 1
+    assert "Line 2: no 'objective' string" in capsys.readouterr().err
+
+    source = tmp_path / "objectives.csv"
+    source.write_text("id,objective\n1,List the planets.\n2\n")
+    assert main(["score", str(source), "-o", str(output), "--workers", "0"]) == 1
+    assert "Line 3: no 'objective' value" in capsys.readouterr().err
+
+
+def test_score_rejects_unknown_taxonomy(tmp_path, capsys):
+    """Test that an unknown taxonomy is a usage error before scoring starts."""
+    source = tmp_path / "objectives.txt"
+    source.write_text("List the planets.\n")
+    with pytest.raises(SystemExit) as exit_info:
+        main(["score", str(source), "--taxonomy", "nope", "--workers", "2"])
+    assert exit_info.value.code == 2
+    err = capsys.readouterr().err
+    assert "unknown taxonomy 'nope'" in err and "blooms" in err
@@ -0,0 +1,52 @@
+"""Test cases for the conversation state machine."""
+
+from learning_objectives_chatbot.utils import (
+    ConversationStage,
+    ConversationState,
+    generate_response,
+    generate_response_stream,
+)
+
+SCRIPT = [
+    "Introductory statistics",
+    "I want them to analyze data",
+    "They will compare two samples",
+    "Please suggest one",
+    "Can we refine it?",
+    "Let's do another",
+    "Thanks",
+]
+
+
+def test_state_advances_through_stages():
+    """Test that each turn moves the state forward and records the answers."""
+    state = ConversationState()
+    state.advance(SCRIPT[0])
+    assert state.stage == ConversationStage.LEVEL
+    state.advance(SCRIPT[1])
+    assert state.blooms_level == "Analyze"
+    response = state.advance(SCRIPT[2])
+    assert "students will be able to compare" in response
+    assert state.stage == ConversationStage.REFINEMENT
+    assert "Here's a possible learning objective:" in state.advance(SCRIPT[3])
+    assert state.measurement == SCRIPT[2]
+
+
+def test_generate_response_matches_incremental_state():
+    """Test that the stateless wrapper agrees with the incremental state."""
+    state = ConversationState()
+    history = [{"role": "assistant", "content": "Hi!"}]
+    for user_input in SCRIPT:
+        history.append({"role": "user", "content": user_input})
+        response = generate_response(user_input, history)
+        assert response == state.advance(user_input)
+        history.append({"role": "assistant", "content": response})
+    assert ConversationState.from_history(history) == state
+
+
+def test_streamed_response_joins_to_full_response():
+    """Test that streaming yields word chunks of the same response."""
+    history = [{"role": "assistant", "content": "Hi!"}]
+    chunks = list(generate_response_stream(SCRIPT[0], history))
+    assert len(chunks) > 1
+    assert "".join(chunks) == generate_response(SCRIPT[0], history)
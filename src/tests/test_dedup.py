@@ -0,0 +1,138 @@
+"""Test cases for duplicate detection."""
+
+import json
+import random
+
+import numpy as np
+
+from learning_objectives_chatbot.cli import main
+from learning_objectives_chatbot.dedup import (
+    DedupIndex,
+    MinHasher,
+    find_duplicates,
+    lsh_params,
+    shingles,
+)
+from learning_objectives_chatbot.utils import generate_sample_objective
+
+OBJECTIVE = "Define the key terms related to photosynthesis."
+CATALOG = [
+    OBJECTIVE,
+    "Explain the process of cellular respiration.",
+    "  DEFINE the key terms   related to photosynthesis. ",
+    "Define key terms related to photosynthesis.",
+    "Explain the process of cellular respiration!",
+    "Write a Python function to sort a list.",
+]
+
+
+def test_index_detects_exact_and_near_duplicates():
+    """Test that case, whitespace and small edits are duplicates."""
+    index = DedupIndex(threshold=0.8)
+    assert index.add(OBJECTIVE) is None
+    assert index.add("Explain the process of cellular respiration.") is None
+    assert index.add(f"  {OBJECTIVE.upper()}") == 0
+    assert index.find("Define key terms related to photosynthesis.") == 0
+    assert index.find("Write a Python function to sort a list.") is None
+    assert len(index) == 2
+
+
+def test_threshold_one_is_exact_only():
+    """Test that a threshold of 1 only merges normalized duplicates."""
+    index = DedupIndex(threshold=1.0)
+    index.add(OBJECTIVE)
+    assert index.find(OBJECTIVE.lower()) == 0
+    assert index.find("Define key terms related to photosynthesis.") is None
+
+
+def test_exact_index_keeps_generated_level_variants():
+    """Test that the history index keeps objectives generated for each level."""
+    levels = ["remember", "understand", "apply", "analyze", "evaluate", "create"]
+    generated = [generate_sample_objective("History", level, "") for level in levels]
+    generated.append(generate_sample_objective("Chemistry", "remember", ""))
+    assert len(set(generated)) == len(generated)
+    index = DedupIndex(threshold=1.0)
+    assert [index.add(objective) for objective in generated] == [None] * 7
+    assert index.add(generated[0].upper()) == 0
+
+
+def test_bulk_signatures_match_single():
+    """Test that block-wise signatures equal per-objective signatures."""
+    hasher = MinHasher()
+    signatures = hasher.signatures(CATALOG + ["", "ab"])
+    for row, objective in enumerate(CATALOG + ["", "ab"]):
+        assert np.array_equal(signatures[row], hasher.signature(objective))
+
+
+def test_lsh_params_cover_signature():
+    """Test that bands times rows uses every permutation."""
+    for threshold in (0.5, 0.8, 0.95):
+        bands, rows = lsh_params(threshold)
+        assert bands * rows == 128
+
+
+def near_duplicate_pairs(count, threshold=0.8):
+    """Return pairs of objectives whose true shingle Jaccard is >= threshold."""
+    rng = random.Random(3)
+    words = (
+        "analyze the effect of temperature on enzyme activity in plant cells "
+        "using controlled experiments and statistical methods to compare results"
+    ).split()
+    pairs = []
+    while len(pairs) < count:
+        base = rng.sample(words, 14)
+        edited = list(base)
+        edited[rng.randrange(len(edited))] = rng.choice(["measure", "soil", "rate"])
+        left, right = " ".join(base), " ".join(edited)
+        a, b = set(shingles(left).tolist()), set(shingles(right).tolist())
+        if len(a & b) / len(a | b) >= threshold:
+            pairs.append((left, right))
+    return pairs
+
+
+def test_near_duplicates_at_threshold_are_found():
+    """Test that most pairs at or above the threshold are reported."""
+    pairs = near_duplicate_pairs(100)
+    found = 0
+    for left, right in pairs:
+        index = DedupIndex(threshold=0.8)
+        index.add(left)
+        found += index.find(right) == 0
+    assert found >= 0.7 * len(pairs)
+
+    clusters = find_duplicates([objective for pair in pairs for objective in pair])
+    paired = sum(clusters[2 * i + 1] == clusters[2 * i] for i in range(len(pairs)))
+    assert paired == found
+
+
+def test_lsh_midpoint_is_below_threshold():
+    """Test that the band split makes pairs at the threshold candidates."""
+    assert lsh_params(0.8) == (16, 8)
+    for threshold in (0.5, 0.8, 0.95):
+        bands, rows = lsh_params(threshold)
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_find_duplicates_clusters_catalog():
+    """Test that each objective maps to the first member of its cluster."""
+    assert find_duplicates(CATALOG).tolist() == [0, 1, 0, 0, 1, 5]
+    assert find_duplicates(CATALOG, threshold=1.0).tolist() == [0, 1, 0, 3, 4, 5]
+    assert find_duplicates([]).tolist() == []
+
+
+def test_dedup_command(tmp_path, capsys):
+    """Test that the command lists duplicates with their first occurrence."""
+    source = tmp_path / "catalog.txt"
+    source.write_text("\n".join(CATALOG) + "\n")
+    assert main(["dedup", str(source), "--threshold", "1"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records == [
+        {"row": 2, "objective": CATALOG[2].strip(), "duplicate_of": 0},
+    ]
+
+    source = tmp_path / "catalog.csv"
+    source.write_text("id,text\n1,Define terms.\n")
+    assert main(["dedup", str(source)]) == 1
+    assert "lo-chatbot dedup: error: CSV input has no 'objective' column" in (
+        capsys.readouterr().err
+    )
@@ -0,0 +1,105 @@
+"""Test cases for the indexed example corpus."""
+
+import pytest
+
+from learning_objectives_chatbot import examples
+from learning_objectives_chatbot import taxonomy as taxonomy_module
+from learning_objectives_chatbot.cli import main
+from learning_objectives_chatbot.examples import ExampleCorpus, nearest_examples
+
+OBJECTIVES = [
+    "Define the key terms related to photosynthesis.",
+    "Explain the process of cellular respiration.",
+    "Design an experiment to test the effect of light on plant growth.",
+    "Write a Python function to sort a list.",
+    "Appreciate good music.",
+]
+
+
+@pytest.fixture
+def corpus():
+    return ExampleCorpus.build(OBJECTIVES, ["bio", "bio", "bio", "cs", "art"])
+
+
+def test_entries_carry_precomputed_analysis(corpus):
+    """Test that entries decode with their analysis."""
+    assert len(corpus) == 5
+    assert corpus.entry(2) == {
+        "objective": OBJECTIVES[2],
+        "category": "bio",
+        "blooms_level": "Create",
+        "verb": "design",
+        "measurable": True,
+        "clarity_score": 8,
+    }
+    assert corpus.entry(4)["verb"] is None
+    assert corpus.entry(4)["blooms_level"] == "Unknown"
+
+
+def test_indexes(corpus):
+    """Test lookups by level, verb and keyword."""
+    assert corpus.by_level("Understand").tolist() == [1]
+    assert corpus.by_level("Nonexistent").tolist() == []
+    assert corpus.by_verb("Write").tolist() == [3]
+    assert corpus.by_keyword("photosynthesis").tolist() == [0]
+    assert corpus.by_keyword("the").tolist() == [0, 1, 2]
+
+
+def test_by_keyword_ignores_hash_collisions(corpus, monkeypatch):
+    """Test that a word hashing like an indexed word finds no rows."""
+    collision = examples._keyword_feature("photosynthesis")
+    monkeypatch.setattr(examples, "_keyword_feature", lambda word: collision)
+    assert corpus.by_keyword("chlorophyll").tolist() == []
+    assert corpus.by_keyword("Photosynthesis").tolist() == [0]
+
+
+def test_nearest_ranks_by_similarity(corpus):
+    """Test that the closest example comes first and unrelated text matches nothing."""
+    results = corpus.nearest("explain how cellular respiration works", k=2)
+    assert [r["objective"] for r in results][0] == OBJECTIVES[1]
+    assert results[0]["score"] > results[1]["score"] > 0
+    assert corpus.nearest("zzzz qqqq") == []
+
+
+def test_save_and_load_roundtrip(corpus, tmp_path):
+    """Test that a saved corpus answers queries the same way."""
+    path = tmp_path / "corpus.npz"
+    corpus.save(str(path))
+    loaded = ExampleCorpus.load(str(path))
+    query = "write a python program"
+    assert loaded.nearest(query) == corpus.nearest(query)
+    assert loaded.entry(3) == corpus.entry(3)
+
+
+def test_build_examples_command(tmp_path):
+    """Test packing a text file from the command line."""
+    source = tmp_path / "vetted.txt"
+    source.write_text("\n".join(OBJECTIVES) + "\n")
+    output = tmp_path / "vetted.npz"
+    assert main(["build-examples", str(source), "-o", str(output)]) == 0
+    assert len(ExampleCorpus.load(str(output))) == len(OBJECTIVES)
+
+
+def test_build_examples_command_reports_bad_input(tmp_path, capsys):
+    """Test that a missing column is reported without a traceback."""
+    source = tmp_path / "vetted.jsonl"
+    source.write_text('{"objective": "List the planets."}\n{"text": "x"}\n')
+    output = tmp_path / "vetted.npz"
+    assert main(["build-examples", str(source), "-o", str(output)]) == 1
+    assert "lo-chatbot build-examples: error: Line 2" in capsys.readouterr().err
+    assert not output.exists()
+
+
+def test_nearest_examples_uses_default_corpus():
+    """Test the module-level lookup over the built-in samples."""
+    results = nearest_examples("Explain the process of cellular respiration.", k=1)
+    assert results[0]["objective"] == "Explain the process of cellular respiration."
+
+
+def test_examples_follow_the_default_taxonomy(monkeypatch):
+    """Test that the corpus is analyzed against LO_CHATBOT_TAXONOMY."""
+    monkeypatch.setattr(taxonomy_module, "DEFAULT_TAXONOMY", "solo")
+    results = nearest_examples("Explain the process of cellular respiration.", k=1)
+    assert results[0]["blooms_level"] == "Relational"
+    corpus = ExampleCorpus.build(OBJECTIVES)
+    assert corpus.by_level("Relational").tolist() == [1]
@@ -0,0 +1,64 @@
+"""Test cases for batch objective generation."""
+
+import pandas as pd
+import pytest
+
+from learning_objectives_chatbot.generation import (
+    GENERATED_COLUMNS,
+    generate_grid,
+    generate_objectives,
+    stream_objectives,
+)
+from learning_objectives_chatbot.utils import generate_sample_objective
+
+SUBJECTS = [
+    "Math",
+    "English Literature",
+    "Computer Science",
+    "Art",
+    "Startups",
+    "Biology",
+]
+LEVELS = ["remember facts", "apply", "create something new", "unsure"]
+MEASUREMENTS = ["write an essay", "design a project", "quiz"]
+
+
+def test_grid_matches_single_generation():
+    """Test that every grid row equals the one-at-a-time result."""
+    grid = generate_grid(SUBJECTS, LEVELS, MEASUREMENTS)
+    assert list(grid.columns) == GENERATED_COLUMNS
+    assert len(grid) == len(SUBJECTS) * len(LEVELS) * len(MEASUREMENTS)
+    for row in grid.itertuples():
+        assert row.objective == generate_sample_objective(
+            row.subject, row.level, row.measurement
+        )
+
+
+def test_dataframe_columns_keep_index():
+    """Test generation from DataFrame columns."""
+    frame = pd.DataFrame(
+        {
+            "subject": ["History", "coding"],
+            "level": ["analyze", "evaluate"],
+            "measurement": ["compare sources", "critique code"],
+        },
+        index=[10, 20],
+    )
+    result = generate_objectives(frame["subject"], frame["level"], frame["measurement"])
+    assert result.index.tolist() == [10, 20]
+    assert result["verb"].tolist() == ["compare", "critique"]
+    assert result["blooms_level"].tolist() == ["Analyze", "Evaluate"]
+
+
+def test_stream_objectives_in_chunks():
+    """Test that streaming yields one objective per row in order."""
+    rows = [(s, "apply", "solve problems") for s in SUBJECTS]
+    assert list(stream_objectives(iter(rows), chunk_size=4)) == [
+        generate_sample_objective(*row) for row in rows
+    ]
+
+
+def test_mismatched_lengths_raise():
+    """Test that unaligned inputs are rejected."""
+    with pytest.raises(ValueError):
+        generate_objectives(["Math"], [], ["quiz"])
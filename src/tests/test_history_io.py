@@ -0,0 +1,73 @@
+"""Test cases for objective history export and import."""
+
+import io
+
+import pytest
+
+from learning_objectives_chatbot.batch import analyze_objectives
+from learning_objectives_chatbot.history_io import (
+    HISTORY_COLUMNS,
+    PARQUET_AVAILABLE,
+    HistoryWriter,
+    export_history,
+    export_history_bytes,
+    read_history,
+)
+
+OBJECTIVES = [
+    "Define the key terms related to photosynthesis.",
+    "Explain the process of cellular respiration.",
+    "Design an experiment to test the effect of light on plant growth.",
+    "Know, understand, and, like, stuff",
+]
+
+FORMATS = [
+    "csv",
+    pytest.param(
+        "parquet",
+        marks=pytest.mark.skipif(not PARQUET_AVAILABLE, reason="needs pyarrow"),
+    ),
+]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_roundtrip_keeps_analysis(fmt, tmp_path):
+    """Test that reading returns the analysis computed at export."""
+    path = tmp_path / f"history.{fmt}"
+    assert export_history(OBJECTIVES, path, row_group_size=3) == len(OBJECTIVES)
+    history = read_history(path)
+    expected = analyze_objectives(OBJECTIVES)
+    assert list(history.columns) == HISTORY_COLUMNS
+    for column in HISTORY_COLUMNS:
+        assert history[column].tolist() == expected[column].tolist()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_read_selects_columns_and_levels(fmt):
+    """Test column selection and Bloom's level filtering."""
+    data = export_history_bytes(OBJECTIVES, fmt)
+    history = read_history(
+        io.BytesIO(data), columns=["objective"], levels=["Create", "Unknown"], fmt=fmt
+    )
+    assert history.to_dict("list") == {"objective": [OBJECTIVES[2], OBJECTIVES[3]]}
+    assert read_history(io.BytesIO(data), levels=[], fmt=fmt).empty
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="needs pyarrow")
+def test_writer_streams_row_groups(tmp_path):
+    """Test that each full buffer becomes one Parquet row group."""
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "history.parquet"
+    with HistoryWriter(path, row_group_size=2) as writer:
+        writer.write(OBJECTIVES[:3])
+        writer.write(OBJECTIVES[3:])
+    assert pq.ParquetFile(path).metadata.num_row_groups == 2
+
+
+def test_unknown_columns_and_formats_raise(tmp_path):
+    """Test that bad arguments are reported."""
+    with pytest.raises(ValueError):
+        read_history(tmp_path / "history.csv", columns=["nope"])
+    with pytest.raises(ValueError):
+        export_history(OBJECTIVES, io.BytesIO(), fmt="xlsx")
@@ -0,0 +1,107 @@
+"""Test cases for the compiled verb matcher."""
+
+from learning_objectives_chatbot import matcher as matcher_module
+from learning_objectives_chatbot.matcher import TOKEN_PATTERN, VerbMatcher, tokenize
+from learning_objectives_chatbot.utils import (
+    analyze_objective,
+    extract_action_verb,
+    get_blooms_level,
+)
+
+TAXONOMY = {
+    "Remember": ["define", "list"],
+    "Analyze": ["break down", "compare"],
+    "Evaluate": ["compare", "judge"],
+}
+
+
+def test_find_all_returns_positions_and_levels():
+    """Test that every hit carries its position and all of its levels."""
+    matcher = VerbMatcher(TAXONOMY)
+    hits = matcher.find_all("Define and Break Down, then compare.")
+    assert [(hit.verb, hit.start, hit.end) for hit in hits] == [
+        ("define", 0, 6),
+        ("break down", 11, 21),
+        ("compare", 28, 35),
+    ]
+    assert hits[2].levels == ("Analyze", "Evaluate")
+
+
+def test_find_all_respects_word_boundaries():
+    """Test that whole-word mode ignores verbs embedded in other words."""
+    assert VerbMatcher(TAXONOMY).find_all("undefined lister") == []
+    prefix_hits = VerbMatcher(TAXONOMY, whole_words=False).find_all("listing")
+    assert [hit.verb for hit in prefix_hits] == ["list"]
+
+
+def test_prefix_matches_need_a_known_suffix():
+    """Test that prefix mode only accepts a verb followed by a word ending."""
+    matcher = VerbMatcher(
+        {"Apply": ["use", "implement"], "Remember": ["list"]}, whole_words=False
+    )
+    assert matcher.find_verbs("listening users") == []
+    assert matcher.find_verbs("implementation listings") == ["implement", "list"]
+
+
+def test_learned_tokens_are_bounded(monkeypatch):
+    """Test that the fallback memo forgets its oldest tokens when full."""
+    monkeypatch.setattr(matcher_module, "MAX_LEARNED_TOKENS", 3)
+    matcher = VerbMatcher(TAXONOMY)
+    matcher.find_verbs("alpha beta gamma delta defined")
+    assert "alpha" not in matcher._lookup and "delta" in matcher._lookup
+    matcher.find_verbs("epsilon")
+    assert "epsilon" in matcher._lookup and "beta" not in matcher._lookup
+
+
+def test_find_all_resolves_inflections():
+    """Test that inflected and British forms resolve to the base verb."""
+    matcher = VerbMatcher({"Analyze": ["analyze", "break down"], "Create": ["label"]})
+    hits = matcher.find_all("Analyses, broke down and labelled; analyzing.")
+    assert [(hit.verb, hit.start, hit.end) for hit in hits] == [
+        ("analyze", 0, 8),
+        ("break down", 10, 20),
+        ("label", 25, 33),
+        ("analyze", 35, 44),
+    ]
+    assert matcher.lemmatize("labels") == "label"
+    assert matcher.lemmatize("analysing") == "analyze"
+    assert matcher.lemmatize("because") is None
+
+
+def test_inflected_objectives_are_measurable():
+    """Test that objectives phrased with inflected verbs are classified."""
+    assert analyze_objective("Analyzes survey data.")["blooms_level"] == "Analyze"
+    assert analyze_objective("Designing a circuit.")["blooms_level"] == "Create"
+    assert analyze_objective("Evaluated two designs.")["measurable"] is True
+    assert analyze_objective("Terms related to cells")["measurable"] is False
+    assert extract_action_verb("because it matters", "Apply") == "apply"
+    assert extract_action_verb("they used a formula", "Apply") == "use"
+
+
+def test_tokenize_matches_token_pattern():
+    """Test that the fast ASCII path splits like the regular expression."""
+    for text in ["re-evaluate, then (design)!", "naïve café analysis", "", "x2y"]:
+        assert tokenize(text) == TOKEN_PATTERN.findall(text)
+
+
+def test_analyze_objective_uses_highest_level():
+    """Test that the highest matched level is reported."""
+    analysis = analyze_objective("Define terms and design an experiment.")
+    assert analysis["blooms_level"] == "Create"
+    assert analysis["measurable"] is True
+    assert analyze_objective("Learn about things.")["blooms_level"] == "Unknown"
+
+
+def test_extract_action_verb_prefers_level_order():
+    """Test that the level's own verb order breaks ties and defaults apply."""
+    assert (
+        extract_action_verb("they will select and identify", "Remember") == "identify"
+    )
+    assert extract_action_verb("they will talk", "Create") == "create"
+
+
+def test_get_blooms_level_keywords():
+    """Test that level keywords match as word prefixes, lowest level first."""
+    assert get_blooms_level("Understanding concepts") == "Understand"
+    assert get_blooms_level("evaluate and recall") == "Remember"
+    assert get_blooms_level("something vague") == "Apply"
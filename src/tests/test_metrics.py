@@ -0,0 +1,59 @@
+"""Test cases for the opt-in instrumentation module."""
+
+from learning_objectives_chatbot import metrics
+
+
+def test_timed_is_a_no_op_when_disabled(monkeypatch):
+    """Test that disabled metrics leave functions untouched."""
+    monkeypatch.setattr(metrics, "ENABLED", False)
+
+    def func():
+        return 42
+
+    assert metrics.timed("func")(func) is func
+
+
+def test_timed_records_histogram_when_enabled(monkeypatch):
+    """Test that enabled metrics time calls into the shared registry."""
+    registry = metrics.Registry()
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "registry", registry)
+
+    @metrics.timed("answer")
+    def answer():
+        return 42
+
+    assert answer() == 42
+    metrics.inc("lo_chatbot_turns_total", 2)
+    metrics.set_gauge("lo_chatbot_queue_depth", 5, queue='a"b')
+    metrics.observe("lo_chatbot_session_messages", 4, metrics.MESSAGE_BUCKETS)
+
+    text = registry.render()
+    assert "# TYPE lo_chatbot_function_duration_seconds histogram" in text
+    assert 'lo_chatbot_function_duration_seconds_count{function="answer"} 1' in text
+    assert (
+        'lo_chatbot_function_duration_seconds_bucket{function="answer",le="+Inf"} 1'
+        in text
+    )
+    assert "lo_chatbot_turns_total 2" in text
+    assert 'lo_chatbot_queue_depth{queue="a\\"b"} 5' in text
+    assert 'lo_chatbot_session_messages_bucket{le="5.0"} 1' in text
+
+
+def test_registry_bounds_label_sets_and_writes_file(tmp_path, monkeypatch):
+    """Test that old gauge label sets are dropped and files are written whole."""
+    registry = metrics.Registry(max_series=2)
+    for queue in "abc":
+        registry.set("lo_chatbot_queue_depth", 1, queue=queue)
+        registry.inc("lo_chatbot_backend_requests_total", outcome=queue)
+    text = registry.render()
+    assert 'queue="a"' not in text and 'queue="c"' in text
+    assert registry.value("lo_chatbot_queue_depth", queue="c") == 1
+    assert registry.value("lo_chatbot_queue_depth", queue="a") == 0
+    # Counters keep every label set
+    assert registry.value("lo_chatbot_backend_requests_total", outcome="a") == 1
+
+    monkeypatch.setattr(metrics, "registry", registry)
+    path = tmp_path / "metrics.prom"
+    metrics.write_prometheus(str(path))
+    assert path.read_text() == text
@@ -0,0 +1,87 @@
+"""Test cases for the headless HTTP API."""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+
+from learning_objectives_chatbot.server import ChatAPI
+from learning_objectives_chatbot.utils import analyze_objective
+
+
+async def _call(port, method, path, payload=None, raw=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = raw if raw is not None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+def _run_with_server(scenario):
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            api = ChatAPI(executor)
+            server = await api.http.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await scenario(api, port)
+
+    return asyncio.run(main())
+
+
+def test_chat_keeps_server_side_sessions():
+    """Test that /chat creates a session and advances it turn by turn."""
+
+    async def scenario(api, port):
+        status, first = await _call(port, "POST", "/chat", {"message": "History"})
+        assert status == 200
+        session_id = first["session_id"]
+        assert "Thanks for sharing about History" in first["response"]
+        _, second = await _call(
+            port, "POST", "/chat", {"session_id": session_id, "message": "Evaluate"}
+        )
+        assert "measure success" in second["response"]
+        assert api.sessions.get(session_id).state.blooms_level == "Evaluate"
+        status, error = await _call(
+            port, "POST", "/chat", {"session_id": "x" * 65, "message": "Hi"}
+        )
+        assert status == 400 and "session_id" in error["error"]
+
+    _run_with_server(scenario)
+
+
+def test_analyze_endpoints_and_errors():
+    """Test single and batch analysis, examples and error responses."""
+    objective = "Design an experiment to test plant growth."
+
+    async def scenario(api, port):
+        status, single = await _call(port, "POST", "/analyze", {"objective": objective})
+        assert single["analysis"] == analyze_objective(objective)
+
+        _, batch = await _call(
+            port, "POST", "/analyze/batch", {"objectives": [objective] * 3}
+        )
+        assert [r["row"] for r in batch["results"]] == [0, 1, 2]
+
+        status, examples = await _call(port, "GET", "/examples", raw=b"")
+        assert status == 200 and "Creation/Create" in examples
+
+        assert (await _call(port, "POST", "/analyze", raw=b"{nope"))[0] == 400
+        assert (await _call(port, "POST", "/analyze", {"text": "x"}))[0] == 400
+        assert (await _call(port, "GET", "/analyze", raw=b""))[0] == 405
+        assert (await _call(port, "GET", "/missing", raw=b""))[0] == 404
+
+        for taxonomy, expected in (("solo", 200), ("nope", 400), ("../blooms", 400)):
+            status, _ = await _call(
+                port,
+                "POST",
+                "/analyze",
+                {"objective": objective, "taxonomy": taxonomy},
+            )
+            assert status == expected
+
+    _run_with_server(scenario)
@@ -0,0 +1,141 @@
+"""Test cases for the session store."""
+
+import asyncio
+
+from learning_objectives_chatbot.backends import Reply, ResponseBackend
+from learning_objectives_chatbot.sessions import (
+    Role,
+    SessionStore,
+    assistant_message,
+    user_message,
+)
+from learning_objectives_chatbot.utils import RESPONSE_TEMPLATES
+
+
+def chat(store, session_id, text):
+    """Run one turn of the async store from synchronous test code."""
+    return asyncio.run(store.chat(session_id, text))
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_messages_reference_templates_until_expanded():
+    """Test that assistant messages keep a template key, not the full text."""
+    msg = assistant_message("ask_level", ("Chemistry",))
+    assert msg.role == Role.ASSISTANT and msg.args == ("Chemistry",)
+    assert msg.expand() == {
+        "role": "assistant",
+        "content": RESPONSE_TEMPLATES["ask_level"].format("Chemistry"),
+    }
+    assert user_message("hi").expand() == {"role": "user", "content": "hi"}
+
+
+def test_chat_creates_sessions_and_tracks_stats():
+    """Test that sessions start with a greeting and accumulate messages."""
+    store = SessionStore()
+    session_id, response = chat(store, None, "Chemistry")
+    assert "Thanks for sharing about Chemistry" in response
+    chat(store, session_id, "Apply it")
+    messages = store.messages(session_id)
+    assert [m["role"] for m in messages] == [
+        "assistant",
+        "user",
+        "assistant",
+        "user",
+        "assistant",
+    ]
+    stats = store.stats()
+    assert stats.sessions == 1 and stats.bytes > 0 and stats.evictions == 0
+
+
+def test_eviction_by_memory_budget_and_idle_time():
+    """Test that least recently used and idle sessions are evicted."""
+    clock = FakeClock()
+    store = SessionStore(max_bytes=10**9, idle_timeout=60, clock=clock)
+    first, _ = chat(store, None, "Art")
+    clock.now = 30
+    second, _ = chat(store, None, "Music")
+    clock.now = 70
+    chat(store, second, "Create")
+    assert first not in store and second in store
+    assert store.stats().evictions == 1
+
+    store.max_bytes = store.stats().bytes
+    third, _ = chat(store, None, "Drama")
+    assert second not in store and third in store
+    assert store.stats() == (1, store.get(third).nbytes, 2)
+
+
+def test_session_size_counts_key_and_state():
+    """Test that a session's estimate covers its ID and conversation state."""
+    store = SessionStore()
+    short, _ = chat(store, "a", "Art")
+    long, _ = chat(store, "b" * 1000, "Art")
+    assert store.get(long).nbytes - store.get(short).nbytes >= 999
+    before = store.get(short).overhead
+    chat(store, short, "Apply")
+    assert store.get(short).overhead > before
+    assert store.stats().bytes == sum(store.get(k).nbytes for k in (short, long))
+
+
+class EchoBackend(ResponseBackend):
+    """Backend that answers with the message it was sent."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def respond(self, state, user_input):
+        self.calls += 1
+        state.reply(user_input)
+        return Reply("generated", (f"echo: {user_input}",))
+
+
+def test_chat_uses_the_configured_backend():
+    """Test that replies come from the store's backend and are stored compactly."""
+    backend = EchoBackend()
+    store = SessionStore(backend=backend)
+    session_id, response = chat(store, None, "Chemistry")
+    assert response == "echo: Chemistry" and backend.calls == 1
+    assert store.messages(session_id)[-1]["content"] == "echo: Chemistry"
+    assert store.get(session_id).state.subject == "Chemistry"
+
+
+class SlowBackend(EchoBackend):
+    """Echo backend that records how many replies are in progress at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = self.peak = 0
+
+    async def respond(self, state, user_input):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return await super().respond(state, user_input)
+
+
+def test_chat_awaits_the_backend_concurrently():
+    """Test that sessions wait on the backend together, one turn per session."""
+
+    async def turns(store, session_ids):
+        return await asyncio.gather(
+            *(store.chat(session_id, "History") for session_id in session_ids)
+        )
+
+    backend = SlowBackend()
+    asyncio.run(turns(SessionStore(backend=backend), [str(i) for i in range(64)]))
+    assert backend.peak == 64
+
+    backend = SlowBackend()
+    store = SessionStore(backend=backend)
+    asyncio.run(turns(store, ["same"] * 4))
+    assert backend.peak == 1 and len(store.messages("same")) == 9
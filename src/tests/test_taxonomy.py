@@ -0,0 +1,177 @@
+"""Test cases for taxonomy loading, artifacts and hot reload."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from learning_objectives_chatbot import taxonomy as taxonomy_module
+from learning_objectives_chatbot import utils
+from learning_objectives_chatbot.batch import analyze_objectives
+from learning_objectives_chatbot.cache import AnalysisCache
+from learning_objectives_chatbot.taxonomy import (
+    BUILTIN_DIR,
+    TaxonomyRegistry,
+    available_taxonomies,
+    load_taxonomy,
+)
+from learning_objectives_chatbot.utils import (
+    BLOOMS_TAXONOMY_VERBS,
+    analyze_objective,
+    extract_action_verb,
+    get_blooms_level,
+    suggest_improvements,
+)
+
+TINY = {
+    "title": "Tiny",
+    "levels": {"Low": ["list"], "High": ["design"]},
+    "level_keywords": {"Low": ["low"], "High": ["high"]},
+    "default_verbs": {"Low": "list", "High": "design"},
+    "default_level": "Low",
+}
+
+
+@pytest.fixture
+def taxonomy_dir(tmp_path, monkeypatch):
+    """Fixture providing a taxonomy directory and an empty artifact cache."""
+    source_dir = tmp_path / "taxonomies"
+    source_dir.mkdir()
+    (source_dir / "tiny.json").write_text(json.dumps(TINY))
+    monkeypatch.setenv("LO_CHATBOT_TAXONOMY_PATH", str(source_dir))
+    monkeypatch.setenv("LO_CHATBOT_TAXONOMY_CACHE", str(tmp_path / "cache"))
+    return source_dir
+
+
+def test_builtin_taxonomies_are_available():
+    """Test that the shipped taxonomies are found."""
+    assert {"blooms", "solo"} <= set(available_taxonomies())
+
+
+def test_default_taxonomy_matches_blooms_file():
+    """Test that the module-level tables come from the Bloom's taxonomy file."""
+    with open(os.path.join(BUILTIN_DIR, "blooms.json"), encoding="utf-8") as f:
+        assert BLOOMS_TAXONOMY_VERBS == json.load(f)["levels"]
+
+
+def test_artifact_is_written_and_reused(taxonomy_dir, tmp_path, monkeypatch):
+    """Test that a compiled artifact is cached and loaded instead of compiling."""
+    first = load_taxonomy(str(taxonomy_dir / "tiny.json"))
+    artifacts = os.listdir(tmp_path / "cache")
+    assert artifacts == [
+        f"tiny-{first.source_hash[:16]}-v{taxonomy_module.ARTIFACT_VERSION}.json"
+    ]
+
+    def fail(*args):
+        raise AssertionError("taxonomy was recompiled")
+
+    monkeypatch.setattr(taxonomy_module, "compile_taxonomy", fail)
+    second = load_taxonomy(str(taxonomy_dir / "tiny.json"))
+    assert second.verb_matcher.lemmas == first.verb_matcher.lemmas
+    assert analyze_objective("Design a bridge.", second)["blooms_level"] == "High"
+
+
+def test_changed_source_gets_a_new_artifact(taxonomy_dir, tmp_path):
+    """Test that editing the source invalidates the cached artifact."""
+    first = load_taxonomy(str(taxonomy_dir / "tiny.json"))
+    changed = dict(TINY, default_level="High")
+    (taxonomy_dir / "tiny.json").write_text(json.dumps(changed))
+    second = load_taxonomy(str(taxonomy_dir / "tiny.json"))
+    assert second.source_hash != first.source_hash
+    assert second.default_level == "High"
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+
+def test_unwritable_cache_still_loads(taxonomy_dir, tmp_path, monkeypatch):
+    """Test that a cache directory that cannot be created is skipped."""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setenv("LO_CHATBOT_TAXONOMY_CACHE", str(blocker / "cache"))
+    assert load_taxonomy(str(taxonomy_dir / "tiny.json")).levels == ("Low", "High")
+
+
+def test_registry_reloads_changed_files(taxonomy_dir):
+    """Test that the registry picks up edits after the reload interval."""
+    registry = TaxonomyRegistry(reload_interval=0)
+    first = registry.get("tiny")
+    assert registry.get("tiny") is first
+
+    changed = dict(TINY, levels={"Low": ["list", "name"], "High": ["design"]})
+    path = taxonomy_dir / "tiny.json"
+    path.write_text(json.dumps(changed))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    second = registry.get("tiny")
+    assert second is not first
+    assert analyze_objective("Name the parts.", second)["blooms_level"] == "Low"
+
+
+def test_registry_keeps_last_good_version(taxonomy_dir, caplog):
+    """Test that a broken or deleted file keeps the loaded taxonomy in service."""
+    registry = TaxonomyRegistry(reload_interval=0)
+    first = registry.get("tiny")
+    path = taxonomy_dir / "tiny.json"
+    path.write_text('{"levels": ')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert registry.get("tiny") is first
+    assert "Could not reload taxonomy tiny" in caplog.text
+
+    path.unlink()
+    assert registry.get("tiny") is first
+
+    path.write_text(json.dumps(TINY))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2_000_000_000))
+    assert registry.get("tiny") is first
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_utils_attributes_follow_reloads(taxonomy_dir, monkeypatch):
+    """Test that the Bloom's attributes of utils are read from the registry."""
+    monkeypatch.setattr(taxonomy_module, "registry", TaxonomyRegistry(0))
+    path = taxonomy_dir / "blooms.json"
+    shutil.copy(os.path.join(BUILTIN_DIR, "blooms.json"), path)
+    assert "recite" not in utils.BLOOMS_TAXONOMY_VERBS["Remember"]
+
+    source = json.loads(path.read_text())
+    source["levels"]["Remember"].append("recite")
+    path.write_text(json.dumps(source))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert "recite" in utils.BLOOMS_TAXONOMY_VERBS["Remember"]
+    assert "recite" in utils._VERB_MATCHER.verb_levels
+
+
+def test_unknown_taxonomy_raises():
+    """Test that asking for a missing taxonomy fails clearly."""
+    with pytest.raises(KeyError):
+        TaxonomyRegistry().get("no-such-taxonomy")
+
+
+def test_solo_taxonomy_per_call():
+    """Test that functions classify against a taxonomy chosen per call."""
+    objective = "Students will be able to theorize about market behaviour."
+    assert analyze_objective(objective)["blooms_level"] == "Unknown"
+    analysis = analyze_objective(objective, "solo")
+    assert analysis["blooms_level"] == "Extended Abstract"
+    assert get_blooms_level("something vague", "solo") == "Relational"
+    assert extract_action_verb("they will do things", "Multistructural", "solo") == (
+        "describe"
+    )
+    low = {"blooms_level": "Unistructural", "measurable": True, "clarity_score": 7}
+    assert len(suggest_improvements(low, "solo")) == 1
+
+
+def test_batch_and_cache_accept_a_taxonomy():
+    """Test that vectorized analysis and the cache honour the taxonomy."""
+    objectives = ["Recite the alphabet.", "Theorize about a poem."]
+    frame = analyze_objectives(objectives, taxonomy="solo")
+    assert frame["blooms_level"].tolist() == ["Unistructural", "Extended Abstract"]
+    for objective, row in zip(objectives, frame.itertuples()):
+        analysis = analyze_objective(objective, "solo")
+        assert analysis["clarity_score"] == row.clarity_score
+        assert list(row.suggestions) == suggest_improvements(analysis, "solo")
+
+    cache = AnalysisCache()
+    assert cache.get(objectives[1])[0]["blooms_level"] == "Unknown"
+    assert cache.get(objectives[1], "solo")[0]["blooms_level"] == "Extended Abstract"
+    assert cache.stats().misses == 2